@@ -2,11 +2,10 @@ import streamlit as st
 import json
 import time
 import pandas as pd
-import boto3
 from dateutil import parser
 # import asyncio
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Optional
 
 # 커스텀 그래프 임포트
 from graphs.workflow_state import WorkflowState
@@ -22,6 +21,7 @@ from utils.display_utils import DisplayManager
 from utils.monitoring import PerformanceMonitor
 from utils.data_generator import DataGenerator
 from utils.style_loader import StyleLoader
+from utils.aws_clients import get_bedrock_runtime_client
 
 # LangChain 관련 임포트
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
@@ -41,10 +41,10 @@ DEFAULT_TOP_K = 5
 def init_shared_resources():
     if 'shared_resources' not in st.session_state:
         st.session_state.shared_resources = {
-            'bedrock_client': boto3.client('bedrock-runtime', region_name=AWS_REGION),
+            'bedrock_client': get_bedrock_runtime_client(AWS_REGION),
             'bedrock_llm': BedrockLLM(
                 model_id=BEDROCK_MODELS['cross_claude'],
-                client=boto3.client('bedrock-runtime', region_name=AWS_REGION)
+                client=get_bedrock_runtime_client(AWS_REGION)
             ),
             'opensearch_manager': OpenSearchManager()
         }
@@ -463,10 +463,19 @@ def render_clear_indices_page():
         except Exception as e:
             st.error(f"Error during clear operation: {str(e)}")
 
-def process_query(user_query: str, search_flow, performance_monitor) -> Dict[str, Any]:
-    """동기적으로 쿼리 처리"""
+def process_query(user_query: str, search_flow, performance_monitor,
+                  on_event: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """동기적으로 쿼리 처리 (on_event 지정 시 노드 진행 이벤트를 받는 대로 전달)"""
     workflow_op_id = performance_monitor.start_operation("complete_workflow")
-    result = search_flow.execute(query=user_query)
+    if on_event is None:
+        result = search_flow.execute(query=user_query)
+    else:
+        result = {}
+        for event in search_flow.stream_events(query=user_query):
+            if event["type"] == "result":
+                result = event["result"]
+            else:
+                on_event(event)
     performance_monitor.end_operation(workflow_op_id, result)
 
     if "error" in result:
@@ -476,6 +485,41 @@ def process_query(user_query: str, search_flow, performance_monitor) -> Dict[str
         }
     return result
 
+NODE_LABELS = {
+    "check_answer_cache": "답변 캐시 확인",
+    "analyze_intent": "질문 의도 분석",
+    "search_schema": "스키마 검색",
+    "search_schema_fused": "스키마 검색",
+    "validate_search": "검색 결과 확인",
+    "generate_sql": "SQL 생성",
+    "generate_sql_with_intent": "의도 분석 및 SQL 생성",
+    "validate_intent": "의도 검증",
+    "validate_sql": "SQL 검증",
+    "execute_sql": "SQL 실행",
+    "handle_feedback": "피드백 처리",
+    "complete": "응답 정리"
+}
+
+def render_stream_event(event: Dict[str, Any], status) -> None:
+    """워크플로우 진행 이벤트를 상태 영역에 출력"""
+    event_type = event.get("type")
+    label = NODE_LABELS.get(event.get("node"), event.get("node"))
+
+    if event_type == "node_start":
+        status.update(label=f"{label} 중...")
+    elif event_type == "node_end":
+        st.write(f"✅ {label} ({event.get('duration', 0):.2f}초)")
+    elif event_type == "node_skipped":
+        st.write(f"⏱️ {label} 생략 (요청 시간 초과)")
+    elif event_type == "search_results":
+        tables = ", ".join(name for name in event.get("tables", []) if name) or "없음"
+        st.write(f"🔍 검색된 테이블: {tables} / 샘플 쿼리 {event.get('sample_queries', 0)}건")
+    elif event_type == "sql":
+        st.code(event.get("sql", ""), language="sql")
+    elif event_type == "rows":
+        st.write(f"📊 결과 {event.get('total', 0)}행 중 처음 {len(event.get('rows', []))}행")
+        st.dataframe(pd.DataFrame(event.get("rows", [])), use_container_width=True)
+
 def process_feedback(user_query: str, sql: str, feedback: str, feedback_flow) -> Dict[str, Any]:
 
     result = {}
@@ -515,14 +559,17 @@ def render_query_page():
             # 새로운 입력 필드를 위해 키 증가
             st.session_state.input_key += 1
 
-            # 메시지 처리 중임을 표시
+            # 메시지 처리 중임을 표시하고 노드 진행 상황을 받는 대로 출력
             with main_container:
-                with st.spinner("처리 중..."):
+                with st.status("처리 중...", expanded=True) as status:
                     result = process_query(
                         user_input,
                         st.session_state.search_flow,
-                        st.session_state.performance_monitor
+                        st.session_state.performance_monitor,
+                        on_event=lambda event: render_stream_event(event, status)
                     )
+                    status.update(label="처리 완료", state="complete" if result.get("success") else "error",
+                                  expanded=False)
 
                     assistant_message = {
                         "role": "assistant",
@@ -3,6 +3,7 @@ import os
 import json
 from datetime import datetime
 from utils.indice_opensearch import OpenSearchManager
+from utils.embedding_profile import apply_embedding_profile
 
 class FeedbackHandler:
     def __init__(self, opensearch_manager: OpenSearchManager):
@@ -14,7 +15,7 @@ class FeedbackHandler:
         try:
             mapping_path = os.path.join('utils', 'opensearch_mappings', 'user_feedback_queries.json')
             with open(mapping_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+                return apply_embedding_profile(json.load(f))
         except Exception as e:
             print(f"매핑 파일 로드 중 오류 발생: {str(e)}")
             return {}
@@ -2,20 +2,27 @@
 from typing import Dict, Any, List, Optional
 import json
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage, BaseMessage
-from config import AWS_REGION, BEDROCK_MODELS
+from config import AWS_REGION
 from langchain_aws import BedrockLLM
-import boto3
 import streamlit as st
 from prompts import load_prompt, format_prompt
+from utils.aws_clients import get_bedrock_runtime_client
+from utils.deadline import DeadlineExceeded, check_deadline, ensure_retry_fits
+from utils.llm_cache import invoke_model_cached
+from utils.model_router import get_model_router
+from utils.rate_limiter import PRIORITY_INTERACTIVE
 import time
 
 class IntentAnalyzer:
     def __init__(self, llm):
         self.llm = llm
-        self.client = boto3.client('bedrock-runtime', region_name=AWS_REGION)
+        self.client = get_bedrock_runtime_client(AWS_REGION)
+        # 의도 분석은 빠른 등급 모델로 처리하고 파싱/검증 실패 시 상위 등급으로 재호출
+        self.router = get_model_router()
         # 프롬프트 템플릿 로드
         self.prompts = load_prompt('sql', 'analyzer')
         self.max_retries = 4
+        self.base_delay = 2  # 기본 대기 시간 (초)
         if not self.prompts:
             raise ValueError("의도 분석기 프롬프트를 로드할 수 없습니다.")
 
@@ -24,6 +31,8 @@ class IntentAnalyzer:
 
         for attempt in range(self.max_retries):
             try:
+                check_deadline("의도 분석 모델 호출")
+
                 # 메시지 구성
                 messages = [
                     {
@@ -32,46 +41,17 @@ class IntentAnalyzer:
                     }
                 ]
 
-                # Bedrock API 호출
-                response = self.client.invoke_model(
-                    modelId=BEDROCK_MODELS['cross_claude'],
-                    contentType="application/json",
-                    accept="application/json",
-                    body=json.dumps({
-                        "anthropic_version": "bedrock-2023-05-31",
-                        "max_tokens": 2000,
-                        "messages": messages,
-                        "temperature": 0,
-                        "top_p": 0.9
-                    })
-                )
-
-                response_body = json.loads(response.get('body').read())
-                content = response_body.get('content', [{}])[0].get('text', '')
-
-                # JSON 추출 및 파싱
+                # 모델 등급 라우팅 (응답 파싱 또는 의도 검증 실패 시 상위 등급 모델로 재호출)
                 try:
-                    start_idx = content.find('{')
-                    end_idx = content.rfind('}') + 1
-                    if start_idx != -1 and end_idx != -1:
-                        json_str = content[start_idx:end_idx]
-                        intent_data = json.loads(json_str)
-                    else:
-                        raise ValueError("JSON 형식의 응답을 찾을 수 없습니다.")
-
-                    # 기본값 설정으로 필수 필드 보장
-                    intent_data.setdefault('objective', 'unknown')
-                    intent_data.setdefault('target_entities', [])
-                    intent_data.setdefault('conditions', [])
-                    intent_data.setdefault('time_context', '')
-                    intent_data.setdefault('aggregation', False)
-                    intent_data.setdefault('analysis', '')
-
-                    return intent_data
-
-                except json.JSONDecodeError as e:
+                    return self.router.invoke(
+                        'intent_analysis',
+                        lambda model_id: self._request_intent(messages, model_id),
+                        validate=lambda intent: self.validate_intent(intent)["is_valid"]
+                    )
+
+                except ValueError as e:
+                    # json.JSONDecodeError 포함 (최상위 등급도 파싱 실패)
                     st.error(f"JSON 파싱 오류: {str(e)}")
-                    st.write("Raw response:", content)
                     return {
                         "objective": "unknown",
                         "target_entities": [],
@@ -83,8 +63,9 @@ class IntentAnalyzer:
 
             except Exception as e:
                 if "ThrottlingException" in str(e):
-                    if attempt < self.max_retries - 1:
-                        wait_time = self.base_delay * (1.2 ** attempt)
+                    wait_time = self.base_delay * (1.2 ** attempt)
+                    # 요청 마감 시간 안에 끝날 수 없는 재시도는 건너뜀
+                    if attempt < self.max_retries - 1 and self._retry_fits(wait_time):
                         st.warning(f"API 호출 제한으로 인해 대기 중... {wait_time:.1f}초 후 재시도 ({attempt + 1}/{self.max_retries})")
                         time.sleep(wait_time)
                         continue
@@ -99,6 +80,52 @@ class IntentAnalyzer:
                     "analysis": f"오류 발생: {str(e)}"
                 }
 
+    @staticmethod
+    def _retry_fits(wait_time: float) -> bool:
+        """대기 후 재시도해도 요청 마감 시간 안에 끝날 수 있는지 확인"""
+        try:
+            ensure_retry_fits(wait_time, "의도 분석 모델 호출")
+            return True
+        except DeadlineExceeded:
+            return False
+
+    def _request_intent(self, messages: List[Dict], model_id: str) -> Dict[str, Any]:
+        """지정한 모델로 의도 분석 요청 후 JSON 응답 파싱 (파싱 실패 시 ValueError)"""
+        # Bedrock API 호출 (응답 캐시 및 공용 제한기 경유)
+        response_body = invoke_model_cached(
+            self.client,
+            model_id,
+            {
+                "anthropic_version": "bedrock-2023-05-31",
+                "max_tokens": 2000,
+                "messages": messages,
+                "temperature": 0,
+                "top_p": 0.9
+            },
+            call_type='intent_analysis',
+            priority=PRIORITY_INTERACTIVE
+        )
+        content = response_body.get('content', [{}])[0].get('text', '')
+
+        # JSON 추출 및 파싱
+        start_idx = content.find('{')
+        end_idx = content.rfind('}') + 1
+        if start_idx == -1 or end_idx == 0:
+            raise ValueError("JSON 형식의 응답을 찾을 수 없습니다.")
+        intent_data = json.loads(content[start_idx:end_idx])
+        if not isinstance(intent_data, dict):
+            raise ValueError("의도 분석 응답이 JSON 객체가 아닙니다.")
+
+        # 기본값 설정으로 필수 필드 보장
+        intent_data.setdefault('objective', 'unknown')
+        intent_data.setdefault('target_entities', [])
+        intent_data.setdefault('conditions', [])
+        intent_data.setdefault('time_context', '')
+        intent_data.setdefault('aggregation', False)
+        intent_data.setdefault('analysis', '')
+
+        return intent_data
+
     def validate_intent(self, intent: Dict[str, Any]) -> Dict[str, Any]:
         """분석된 의도의 유효성 검증"""
         try:
@@ -1,7 +1,10 @@
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Tuple, Callable, Optional
+from collections import deque
+from contextlib import nullcontext
 import json
+import threading
 import time
-from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 import streamlit as st
 from langchain.chains.question_answering.map_reduce_prompt import messages
 from langchain_core.prompts import ChatPromptTemplate
@@ -10,73 +13,221 @@ from langchain_core.runnables import RunnablePassthrough
 from langchain.callbacks import StreamingStdOutCallbackHandler
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_aws import BedrockLLM
-import boto3
 from pyarrow.jvm import schema
 from prompts import load_prompt, format_prompt
+from utils.aws_clients import get_bedrock_runtime_client
+from utils.conversation_context import ContextBudgetExceeded, ConversationContext
+from utils.deadline import DeadlineExceeded, check_deadline, ensure_retry_fits, remaining_time
+from utils.llm_cache import get_llm_cache, has_content, invoke_model_cached, is_cacheable_request
+from utils.model_router import get_model_router
+from utils.rate_limiter import PRIORITY_INTERACTIVE, bedrock_call
+from utils.prompt_builder import SQLPromptBuilder
+from utils.streaming_json import IncrementalJSONParser
+from utils.token_counter import estimate_message_tokens
 
-from config import AWS_REGION, BEDROCK_MODELS
+from config import AWS_REGION, BEDROCK_MODELS, CONVERSATION_CONFIG, SQL_GENERATION_CONFIG, WORKFLOW_CONFIG
 
 
 class SQLGenerator:
     def __init__(self):
         """SQL 생성기 초기화"""
-        self.client = boto3.client(
-            'bedrock-runtime',
-            region_name=AWS_REGION
+        self.client = get_bedrock_runtime_client(AWS_REGION)
+        # 의도 분석/SQL 검증은 빠른 등급 모델로 처리하고 실패 시 상위 등급으로 재호출
+        self.router = get_model_router()
+
+        # 상태 비저장 모드: 시스템 프롬프트는 system 필드로, 대화 기록은 직전 followup_turns 쌍만 유지
+        self.stateless = SQL_GENERATION_CONFIG['stateless']
+        self.followup_turns = SQL_GENERATION_CONFIG['followup_turns']
+        self.prompt_cache = SQL_GENERATION_CONFIG['prompt_cache']
+        self.prompt_cache_models = SQL_GENERATION_CONFIG['prompt_cache_models']
+
+        # 대화 기록 저장 (메시지별 토큰 수 증분 관리, 매 호출 전 예산 적용)
+        self.context = ConversationContext(
+            max_tokens=CONVERSATION_CONFIG['max_context_tokens'],
+            preserved_messages=0 if self.stateless else CONVERSATION_CONFIG['preserved_messages']
         )
-        self.conversation_history = []  # 대화 기록 저장
         self.max_retries = 4
         self.base_delay = 10  # 기본 대기 시간 (초)
-        self.last_trim_time = datetime.now()  # 마지막 trim 시간 기록
         self.system_prompt_initialized = False  # 시스템 프롬프트 초기화 상태
+
+        # 스트리밍 설정 (대화 기록을 이어가는 경우 나머지 응답은 단일 백그라운드 스레드에서 순서대로 수신)
+        self.max_tokens = SQL_GENERATION_CONFIG['max_tokens']
+        self.streaming = SQL_GENERATION_CONFIG['streaming']
+        self.return_on_sql = SQL_GENERATION_CONFIG['return_on_sql']
+        # 후속 대화 없는 상태 비저장 모드는 공유 대화 기록 없이 호출마다 새 메시지 목록을 보내므로 동시 질문을 병렬로 수신
+        self.ordered_history = not self.stateless or self.followup_turns > 0
+        self._stream_executor = ThreadPoolExecutor(
+            max_workers=1 if self.ordered_history else WORKFLOW_CONFIG['async_max_workers'],
+            thread_name_prefix='sql-stream'
+        )
+        self._pending_stream: Optional[Future] = None
+        # 대화 기록을 이어가는 경우 기록 구성부터 응답 저장까지 동시 호출을 직렬화
+        self._history_lock = threading.RLock()
+
+        # 토큰 예산 기반 프롬프트 구성
+        self.prompt_builder = SQLPromptBuilder()
+
+        # 호출별 토큰 사용량 및 지연 시간 기록 (질문별 값은 각 호출 결과의 llm_usage로 반환)
+        self.usage_history = deque(maxlen=100)
         
         # 프롬프트 로드
         self.prompts = load_prompt('sql', 'generator')
-        if not self.prompts:
+        self.fused_prompts = load_prompt('sql', 'fused')
+        if not self.prompts or not self.fused_prompts:
             raise ValueError("SQL 생성기 프롬프트를 로드할 수 없습니다.")
         
-        # 초기 시스템 프롬프트 설정
-        self._initialize_system_prompt()
+        # 초기 시스템 프롬프트 설정 (상태 비저장 모드는 매 요청의 system 필드로 전달하므로 생략)
+        if not self.stateless:
+            self._initialize_system_prompt()
+
+    @property
+    def conversation_history(self) -> list:
+        """대화 기록 메시지 목록"""
+        return self.context.messages
+
+    def _history_guard(self):
+        """대화 기록 구성~저장 구간 잠금 (공유 대화 기록을 쓰지 않으면 잠금 없음)"""
+        return self._history_lock if self.ordered_history else nullcontext()
+
+    def _build_messages(self, new_message: str) -> list:
+        """토큰 예산을 적용한 뒤 대화 기록에 새 메시지를 더한 요청 메시지 목록 생성"""
+        user_message = {
+            "role": "user",
+            "content": new_message
+        }
+        # 후속 대화를 유지하지 않으면 다른 질문의 기록이 섞이지 않도록 호출마다 새 목록 사용
+        if not self.ordered_history:
+            return [user_message]
+
+        # 이전 메시지가 user 메시지인 경우, assistant 응답이 필요
+        if self.conversation_history and self.conversation_history[-1]["role"] == "user":
+            self.context.enforce_budget()
+            return list(self.conversation_history)
+
+        # 새 메시지 추가
+        self.context.enforce_budget(reserved_tokens=estimate_message_tokens(user_message))
+        return self.conversation_history + [user_message]
+
+    def _get_system_prompt(self, system_prompt: Optional[str] = None) -> Optional[str]:
+        """상태 비저장 모드에서 사용할 시스템 프롬프트 (기본값: SQL 생성 지시사항)"""
+        if not self.stateless:
+            return None
+        return system_prompt or self.prompts['sql_generation']['system']
+
+    def _supports_prompt_cache(self, model_id: str) -> bool:
+        """프롬프트 캐시 지원 모델 여부 (교차 리전 추론 프로필의 리전 접두사는 무시)"""
+        return any(model_id == model or model_id.endswith('.' + model) for model in self.prompt_cache_models)
+
+    def _build_request_body(self, messages_to_send: list, system_prompt: Optional[str] = None,
+                            model_id: Optional[str] = None) -> Dict[str, Any]:
+        """Bedrock 요청 본문 생성"""
+        body = {
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": self.max_tokens,
+            "messages": messages_to_send,
+            "temperature": 0,
+            "top_p": 0.9
+        }
+        if system_prompt:
+            system_block = {"type": "text", "text": system_prompt}
+            if self.prompt_cache and self._supports_prompt_cache(model_id or BEDROCK_MODELS['cross_claude']):
+                # 매 요청 동일한 시스템 프롬프트를 Bedrock 프롬프트 캐시 체크포인트로 지정
+                system_block["cache_control"] = {"type": "ephemeral"}
+            body["system"] = [system_block]
+        return body
+
+    def _record_usage(self, usage: Dict[str, Any], latency: float, call_metrics: Optional[Dict] = None,
+                      **extra) -> Dict[str, Any]:
+        """호출별 토큰 사용량과 지연 시간 기록 (call_metrics: 호출한 쪽에 돌려줄 호출별 지표)"""
+        record = {
+            "input_tokens": usage.get("input_tokens", 0),
+            "output_tokens": usage.get("output_tokens", 0),
+            "cache_read_input_tokens": usage.get("cache_read_input_tokens", 0),
+            "cache_creation_input_tokens": usage.get("cache_creation_input_tokens", 0),
+            "latency": latency,
+            **extra
+        }
+        self.usage_history.append(record)
+        if call_metrics is not None:
+            call_metrics.update(record)
+        return record
+
+    def _record_history(self, messages_to_send: list, assistant_message: str) -> None:
+        """요청 메시지와 assistant 응답을 대화 기록에 저장 (후속 대화를 유지하지 않으면 저장하지 않음)"""
+        if not self.ordered_history:
+            return
+        for message in messages_to_send[len(self.context):]:
+            self.context.append(message)
+        self.context.append({
+            "role": "assistant",
+            "content": assistant_message
+        })
+        if self.stateless:
+            # 후속 질문용으로 직전 대화 쌍만 유지
+            self.context.retain_recent(2 * self.followup_turns)
+
+    def _backoff_or_raise(self, error: Exception, attempt: int) -> None:
+        """재시도 가능한 경우 대기하고, 그렇지 않으면 예외를 다시 발생"""
+        if isinstance(error, (ContextBudgetExceeded, DeadlineExceeded)):
+            raise error
+
+        if "ThrottlingException" in str(error):
+            if attempt < self.max_retries - 1:
+                wait_time = self.base_delay * (1.2 ** attempt)
+                # 요청 마감 시간 안에 끝날 수 없는 재시도는 건너뜀
+                ensure_retry_fits(wait_time, "SQL 생성 모델 호출")
+                st.warning(f"API 호출 제한으로 인해 대기 중... {wait_time:.1f}초 후 재시도 ({attempt + 1}/{self.max_retries})")
+                time.sleep(wait_time)
+                return
+
+        st.error(f"Bedrock API 호출 중 오류 발생: {str(error)}")
+        if attempt < self.max_retries - 1:
+            wait_time = self.base_delay * (2 ** attempt)
+            ensure_retry_fits(wait_time, "SQL 생성 모델 호출")
+            st.warning(f"재시도 중... ({attempt + 1}/{self.max_retries})")
+            time.sleep(wait_time)
+            return
+        raise error
+
+    def _wait_for_pending_stream(self) -> None:
+        """백그라운드에서 수신 중인 이전 스트리밍 응답이 대화 기록에 반영될 때까지 대기"""
+        if not self.ordered_history:
+            return
+        pending, self._pending_stream = self._pending_stream, None
+        if pending is not None:
+            try:
+                pending.result()
+            except Exception as e:
+                st.warning(f"이전 SQL 응답 수신 중 오류 발생: {str(e)}")
 
-    def _invoke_bedrock(self, new_message: str, keep_history: bool = True) -> str:
-        """Bedrock API 호출 (대화 기록 유지 및 재시도 로직 포함)"""
+    def _invoke_bedrock(self, new_message: str, keep_history: bool = True,
+                        system_prompt: Optional[str] = None, call_type: str = 'sql_generation',
+                        model_id: Optional[str] = None, call_metrics: Optional[Dict] = None) -> str:
+        """Bedrock API 호출 (대화 기록 유지 및 재시도 로직 포함, call_metrics에 호출별 사용량 기록)"""
+        model_id = model_id or BEDROCK_MODELS['cross_claude']
         for attempt in range(self.max_retries):
             try:
-                # 이전 메시지가 user 메시지인 경우, assistant 응답이 필요
-                if self.conversation_history and self.conversation_history[-1]["role"] == "user":
-                    messages_to_send = self.conversation_history
-                else:
-                    # 새 메시지 추가
-                    messages_to_send = self.conversation_history + [{
-                        "role": "user",
-                        "content": new_message
-                    }]
-
-                # API 요청
-                response = self.client.invoke_model(
-                    modelId=BEDROCK_MODELS['cross_claude'],
-                    contentType="application/json",
-                    accept="application/json",
-                    body=json.dumps({
-                        "anthropic_version": "bedrock-2023-05-31",
-                        "max_tokens": 20000,
-                        "messages": messages_to_send,
-                        "temperature": 0,
-                        "top_p": 0.9
-                    })
-                )
-
-                response_body = json.loads(response.get('body').read())
-                assistant_message = response_body.get('content', [{}])[0].get('text', '')
-
-                # 응답 저장
-                if keep_history:
-                    if messages_to_send != self.conversation_history:
-                        self.conversation_history = messages_to_send
-                    self.conversation_history.append({
-                        "role": "assistant",
-                        "content": assistant_message
-                    })
+                check_deadline("Bedrock 호출")
+                with self._history_guard():
+                    self._wait_for_pending_stream()
+                    messages_to_send = self._build_messages(new_message)
+
+                    # API 요청 (응답 캐시 및 공용 제한기 경유)
+                    started_at = time.monotonic()
+                    response_body = invoke_model_cached(
+                        self.client,
+                        model_id,
+                        self._build_request_body(messages_to_send, self._get_system_prompt(system_prompt), model_id),
+                        call_type=call_type,
+                        priority=PRIORITY_INTERACTIVE
+                    )
+                    self._record_usage(response_body.get('usage', {}), time.monotonic() - started_at, call_metrics,
+                                       call_type=call_type, model_id=model_id)
+                    assistant_message = response_body.get('content', [{}])[0].get('text', '')
+
+                    # 응답 저장
+                    if keep_history:
+                        self._record_history(messages_to_send, assistant_message)
 
                 # 응답이 제대로 되었는지 확인
                 if assistant_message.strip():
@@ -85,40 +236,229 @@ class SQLGenerator:
                     raise ValueError("Bedrock API에서 유효한 응답을 받지 못했습니다.")
 
             except Exception as e:
-                if "ThrottlingException" in str(e):
-                    if attempt < self.max_retries - 1:
-                        wait_time = self.base_delay * (1.2 ** attempt)
-                        st.warning(f"API 호출 제한으로 인해 대기 중... {wait_time:.1f}초 후 재시도 ({attempt + 1}/{self.max_retries})")
-                        time.sleep(wait_time)
-                        continue
-
-                st.error(f"Bedrock API 호출 중 오류 발생: {str(e)}")
-                if attempt < self.max_retries - 1:
-                    wait_time = self.base_delay * (2 ** attempt)
-                    st.warning(f"재시도 중... ({attempt + 1}/{self.max_retries})")
-                    time.sleep(wait_time)
-                    continue
-                raise
+                self._backoff_or_raise(e, attempt)
 
         raise Exception("최대 재시도 횟수를 초과했습니다.")
 
-    def analyze_intent(self, question: str) -> Dict[str, Any]:
-        """자연어 질문을 분석하여 의도 파악"""
+    def _invoke_routed(self, call_type: str, new_message: str, parse: Callable[[str], Any],
+                       validate: Optional[Callable[[Any], bool]] = None, keep_history: bool = True,
+                       system_prompt: Optional[str] = None) -> Any:
+        """
+        모델 등급 라우팅을 적용한 Bedrock 호출
+        파싱/검증에 실패한 응답은 대화 기록에 남기지 않고 상위 등급 모델로 재호출합니다.
+
+        Args:
+            call_type (str): 호출 유형 (MODEL_ROUTING_CONFIG['call_types'] 키)
+            new_message (str): 전송할 메시지
+            parse: 응답 텍스트 파싱 함수 (실패 시 ValueError)
+            validate: 파싱 결과 유효성 검사 함수
+            keep_history (bool): 채택된 응답의 대화 기록 저장 여부
+            system_prompt (str): 상태 비저장 모드에서 사용할 시스템 프롬프트
+        """
+        accepted = {}
+
+        def _call(model_id: str) -> Any:
+            response_text = self._invoke_bedrock(new_message, keep_history=False, system_prompt=system_prompt,
+                                                 call_type=call_type, model_id=model_id)
+            accepted['text'] = response_text
+            return parse(response_text)
+
+        # 대화 기록을 이어가는 경우 등급별 호출과 채택된 응답 저장 사이에 다른 호출이 끼어들지 않도록 잠금 유지
+        with self._history_guard() if keep_history else nullcontext():
+            result = self.router.invoke(call_type, _call, validate=validate)
+            # 라우터가 결과를 반환한 경우에만 마지막 등급의 응답을 기록 (상위 등급 호출 실패 시 거부된 응답은 남기지 않음)
+            if keep_history:
+                self._record_history(self._build_messages(new_message), accepted['text'])
+        return result
+
+    def _invoke_bedrock_stream(self, new_message: str, keep_history: bool = True,
+                               on_sql: Optional[Callable[[str], None]] = None,
+                               system_prompt: Optional[str] = None,
+                               watch_fields: Tuple[str, ...] = ('sql',),
+                               call_metrics: Optional[Dict] = None) -> Tuple[Dict[str, Any], Future]:
+        """
+        Bedrock 스트리밍 API 호출 - 응답 JSON의 sql 필드가 완성되는 즉시 반환
+
+        Args:
+            new_message (str): 전송할 메시지
+            keep_history (bool): 대화 기록 저장 여부
+            on_sql: sql 필드 완성 시 호출할 콜백
+            system_prompt (str): 상태 비저장 모드에서 사용할 시스템 프롬프트
+            watch_fields: 점진적으로 추출할 최상위 필드 ('sql' 포함)
+            call_metrics: 호출별 지표를 기록할 dict (time_to_sql은 sql 완성 시, 토큰 사용량은 수신 완료 시 기록)
+
+        Returns:
+            Tuple[Dict, Future]: (sql 완성 시점까지 추출된 필드, 전체 응답 텍스트를 반환하는 Future)
+        """
+        call_metrics = call_metrics if call_metrics is not None else {}
+        for attempt in range(self.max_retries):
+            try:
+                check_deadline("Bedrock 호출")
+                # 응답 저장은 단일 백그라운드 스레드에서 수행하며, 다음 호출은 잠금 안에서 그 완료를 기다린 뒤 기록을 구성
+                with self._history_guard():
+                    self._wait_for_pending_stream()
+                    messages_to_send = self._build_messages(new_message)
+                    request_body = self._build_request_body(messages_to_send, self._get_system_prompt(system_prompt))
+                    started_at = time.monotonic()
+
+                    # 캐시된 응답이 있으면 스트리밍 없이 바로 사용
+                    cache = get_llm_cache() if is_cacheable_request(request_body) else None
+                    if cache is not None:
+                        cached = cache.get(BEDROCK_MODELS['cross_claude'], request_body, 'sql_generation')
+                        if cached is not None:
+                            return self._use_cached_stream_response(cached, messages_to_send, keep_history, on_sql,
+                                                                    watch_fields)
+
+                    # API 요청 (공용 제한기 경유)
+                    with bedrock_call(BEDROCK_MODELS['cross_claude'], PRIORITY_INTERACTIVE):
+                        response = self.client.invoke_model_with_response_stream(
+                            modelId=BEDROCK_MODELS['cross_claude'],
+                            contentType="application/json",
+                            accept="application/json",
+                            body=json.dumps(request_body)
+                        )
+
+                    sql_ready = Future()
+                    completion = self._stream_executor.submit(
+                        self._consume_stream, response.get('body'), messages_to_send, keep_history, sql_ready,
+                        started_at, request_body if cache is not None else None, watch_fields, call_metrics
+                    )
+                    if self.ordered_history:
+                        self._pending_stream = completion
+
+                try:
+                    # sql 필드는 요청 마감 시간까지만 대기 (나머지 응답은 백그라운드에서 계속 수신)
+                    fields = sql_ready.result(timeout=remaining_time())
+                except FutureTimeoutError:
+                    raise DeadlineExceeded("요청 마감 시간 안에 SQL 응답을 받지 못했습니다.")
+                if fields.get('sql') is None:
+                    # sql 필드 없이 끝난 응답은 전체 수신 결과로 오류 여부 확인
+                    completion.result()
+                elif on_sql:
+                    on_sql(fields['sql'])
+                return fields, completion
+
+            except Exception as e:
+                self._backoff_or_raise(e, attempt)
+
+        raise Exception("최대 재시도 횟수를 초과했습니다.")
+
+    def _use_cached_stream_response(self, response_body: Dict, messages_to_send: list, keep_history: bool,
+                                    on_sql: Optional[Callable[[str], None]],
+                                    watch_fields: Tuple[str, ...] = ('sql',)) -> Tuple[Dict[str, Any], Future]:
+        """캐시된 응답 본문을 스트리밍 결과와 같은 형태로 반환"""
+        assistant_message = response_body.get('content', [{}])[0].get('text', '')
+        if keep_history:
+            self._record_history(messages_to_send, assistant_message)
+
+        parser = IncrementalJSONParser(watch_fields=watch_fields)
+        parser.feed(assistant_message)
+        if parser.fields.get('sql') is not None and on_sql:
+            on_sql(parser.fields['sql'])
+
+        completion = Future()
+        completion.set_result(assistant_message)
+        return dict(parser.fields), completion
+
+    def _consume_stream(self, stream, messages_to_send: list, keep_history: bool,
+                        sql_ready: Future, started_at: float, cache_request_body: Optional[Dict] = None,
+                        watch_fields: Tuple[str, ...] = ('sql',), call_metrics: Optional[Dict] = None) -> str:
+        """스트리밍 응답을 점진적으로 파싱하고 JSON 객체가 닫힌 뒤에는 사용량 이벤트만 확인 (call_metrics에 호출별 지표 기록)"""
+        call_metrics = call_metrics if call_metrics is not None else {}
+        parser = IncrementalJSONParser(watch_fields=watch_fields)
+        usage = {}
         try:
-            # 초기화가 필요한 경우
-            if not self.conversation_history:
-                # 초기 지시사항 전송
-                self._invoke_bedrock(
-                    self.prompts['intent_analysis']['system'],
-                    keep_history=True
-                )
+            for event in stream:
+                chunk = event.get('chunk')
+                if not chunk:
+                    continue
 
-            # 질문 분석 요청
-            response_text = self._invoke_bedrock(question, keep_history=True)
+                payload = json.loads(chunk.get('bytes'))
+                event_type = payload.get('type')
+                if event_type == 'message_start':
+                    # 입력 토큰 사용량은 스트림 시작 시 전달됨 (이 시점의 출력 토큰 수는 임시값)
+                    usage.update({key: value for key, value in payload.get('message', {}).get('usage', {}).items()
+                                  if key != 'output_tokens'})
+                elif event_type == 'message_delta':
+                    # 출력 토큰 사용량은 응답 종료 시 전달됨
+                    usage.update(payload.get('usage', {}))
+                elif event_type == 'message_stop':
+                    invocation_metrics = payload.get('amazon-bedrock-invocationMetrics', {})
+                    if 'outputTokenCount' in invocation_metrics:
+                        usage['output_tokens'] = invocation_metrics['outputTokenCount']
+                elif event_type == 'content_block_delta' and not parser.complete:
+                    # JSON 객체가 닫힌 뒤의 텍스트는 파싱하지 않음
+                    for field, _ in parser.feed(payload.get('delta', {}).get('text', '')):
+                        if field == 'sql' and not sql_ready.done():
+                            call_metrics['time_to_sql'] = time.monotonic() - started_at
+                            sql_ready.set_result(dict(parser.fields))
+        except Exception as e:
+            if not sql_ready.done():
+                sql_ready.set_exception(e)
+            raise
+        finally:
+            stream.close()
+
+        # 출력 토큰 사용량을 받지 못한 경우 0이 아닌 알 수 없음(None)으로 기록
+        usage.setdefault('output_tokens', None)
+        self._record_usage(usage, time.monotonic() - started_at, call_metrics,
+                           time_to_sql=call_metrics.get('time_to_sql'))
+        if not sql_ready.done():
+            sql_ready.set_result(dict(parser.fields))
+
+        assistant_message = parser.json_text or parser.text
+        if not assistant_message.strip():
+            raise ValueError("Bedrock API에서 유효한 응답을 받지 못했습니다.")
+
+        if keep_history:
+            self._record_history(messages_to_send, assistant_message)
+
+        # 완성된 응답은 비스트리밍 호출과 같은 형식으로 캐시에 저장
+        response_body = {"content": [{"type": "text", "text": assistant_message}]}
+        cache = get_llm_cache()
+        if cache_request_body is not None and cache is not None and has_content(response_body):
+            cache.put(BEDROCK_MODELS['cross_claude'], cache_request_body, response_body)
+        return assistant_message
+
+    def analyze_intent(self, question: str) -> Dict[str, Any]:
+        """자연어 질문을 분석하여 의도 파악"""
+        def _is_valid_intent(intent: Any) -> bool:
+            return isinstance(intent, dict) and intent.get("objective") not in (None, "", "unknown") \
+                and bool(intent.get("target_entities"))
 
+        try:
             try:
-                # JSON 응답 파싱
-                parsed_response = json.loads(response_text)
+                if self.stateless:
+                    # 지시사항은 system 필드로 전달하고 SQL 생성용 후속 대화에는 포함하지 않음
+                    parsed_response = self._invoke_routed(
+                        'intent_analysis',
+                        question,
+                        parse=json.loads,
+                        validate=_is_valid_intent,
+                        keep_history=False,
+                        system_prompt=self.prompts['intent_analysis']['system']
+                    )
+                else:
+                    with self._history_guard():
+                        # 초기화가 필요한 경우
+                        if not self.conversation_history:
+                            # 초기 지시사항 전송
+                            self._invoke_bedrock(
+                                self.prompts['intent_analysis']['system'],
+                                keep_history=True,
+                                call_type='intent_analysis',
+                                model_id=self.router.model_for('intent_analysis')
+                            )
+
+                        # 질문 분석 요청
+                        parsed_response = self._invoke_routed(
+                            'intent_analysis',
+                            question,
+                            parse=json.loads,
+                            validate=_is_valid_intent,
+                            keep_history=True
+                        )
+
                 parsed_response["original_question"] = question
                 return parsed_response
 
@@ -153,28 +493,96 @@ class SQLGenerator:
             )
             self.system_prompt_initialized = True
 
-    def generate_sql(self, question: str, database_schema: Dict) -> Dict[str, Any]:
-        """자연어 질문을 SQL로 변환"""
+    def generate_sql(self, question: str, database_schema: Dict,
+                     on_sql: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """
+        자연어 질문을 SQL로 변환
+
+        스트리밍 모드에서 return_on_sql이 켜져 있으면 sql 필드가 완성되는 즉시 반환하며,
+        설명 등 나머지 응답은 'response_future'(전체 응답 텍스트)로 전달됩니다.
+        """
+        return self._generate_from_prompt(self.prompts['sql_generation'], question, database_schema, on_sql)
+
+    def generate_sql_with_intent(self, question: str, database_schema: Dict,
+                                 on_sql: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """
+        의도 분석과 SQL 생성을 한 번의 호출로 수행 (fused.yaml)
+
+        Returns:
+            Dict: generate_sql 응답에 'intent'(IntentAnalyzer와 같은 형식)가 추가된 결과
+        """
+        sql_response = self._generate_from_prompt(
+            self.fused_prompts['fused_generation'],
+            question,
+            database_schema,
+            on_sql,
+            system_prompt=self.fused_prompts['fused_generation']['system'],
+            watch_fields=('intent', 'sql')
+        )
+
+        intent = sql_response.get('intent')
+        if not isinstance(intent, dict):
+            intent = {}
+        # 기본값 설정으로 필수 필드 보장
+        intent.setdefault('objective', 'unknown')
+        intent.setdefault('target_entities', [])
+        intent.setdefault('conditions', [])
+        intent.setdefault('time_context', '')
+        intent.setdefault('aggregation', False)
+        intent.setdefault('analysis', '')
+        sql_response['intent'] = intent
+        return sql_response
+
+    def _generate_from_prompt(self, prompt_set: Dict, question: str, database_schema: Dict,
+                              on_sql: Optional[Callable[[str], None]] = None, system_prompt: Optional[str] = None,
+                              watch_fields: Tuple[str, ...] = ('sql',)) -> Dict[str, Any]:
+        """프롬프트 구성 후 SQL 생성 호출 (스트리밍/비스트리밍 공통)"""
+        # 이 호출의 토큰 사용량/지연 시간 (동시 질문과 공유하지 않도록 호출마다 생성)
+        llm_usage = {}
         try:
-            sql_generate_prompt = format_prompt(
-                self.prompts['sql_generation']['prompt'],
+            # 관련도가 낮은 테이블/컬럼/예시부터 줄여 토큰 예산에 맞춤
+            sql_generate_prompt, prompt_report = self.prompt_builder.build(
+                prompt_set['prompt'],
                 question=question,
-                tables=database_schema['database_schema']['tables'],
-                related_tables=database_schema['database_schema']['related_tables'],
-                sample_queries=database_schema['sample_queries']
+                database_schema=database_schema
             )
 
-            # 주기적으로만 토큰 제한 관리 수행 (10분 간격)
-            current_time = datetime.now()
-            if (current_time - self.last_trim_time).total_seconds() > 600:
-                self.trim_conversation_history()
-                self.last_trim_time = current_time
+            # 대화형 모드에서는 초기화된 SQL 생성 지시사항 외의 지시사항을 메시지 앞에 포함
+            if system_prompt and not self.stateless:
+                sql_generate_prompt = system_prompt + "\n\n" + sql_generate_prompt
 
             # 스키마 정보와 질문 전송
-            response_text = self._invoke_bedrock(sql_generate_prompt, keep_history=True)
+            if self.streaming:
+                fields, completion = self._invoke_bedrock_stream(
+                    sql_generate_prompt,
+                    keep_history=True,
+                    on_sql=on_sql,
+                    system_prompt=system_prompt,
+                    watch_fields=watch_fields,
+                    call_metrics=llm_usage
+                )
+                if fields.get('sql') is not None and self.return_on_sql:
+                    # llm_usage의 토큰 사용량은 나머지 응답 수신이 끝나면 채워짐
+                    return {
+                        **fields,
+                        "explanation": {},
+                        "performance_considerations": {},
+                        "response_future": completion,
+                        "prompt_report": prompt_report,
+                        "llm_usage": llm_usage
+                    }
+                response_text = completion.result()
+            else:
+                response_text = self._invoke_bedrock(sql_generate_prompt, keep_history=True, system_prompt=system_prompt,
+                                                     call_metrics=llm_usage)
 
             try:
-                return json.loads(response_text, strict=False)
+                sql_response = json.loads(response_text, strict=False)
+                sql_response["prompt_report"] = prompt_report
+                sql_response["llm_usage"] = llm_usage
+                if on_sql and not self.streaming and sql_response.get("sql"):
+                    on_sql(sql_response["sql"])
+                return sql_response
             except json.JSONDecodeError:
                 return {
                     "error": "Failed to parse SQL generation response",
@@ -199,9 +607,6 @@ class SQLGenerator:
     def refine_sql(self, sql: str, feedback: str) -> Dict[str, Any]:
         """SQL 쿼리 개선"""
         try:
-            # 토큰 제한 관리
-            self.trim_conversation_history()
-
             prompt = format_prompt(
                 self.prompts['sql_refinement']['prompt'],
                 sql=sql,
@@ -241,10 +646,15 @@ class SQLGenerator:
                 sql=sql
             )
 
-            response_text = self._invoke_bedrock(prompt, keep_history=True)
-
             try:
-                return json.loads(response_text)
+                # 검증 결과 형식이 맞지 않으면 상위 등급 모델로 재호출
+                return self._invoke_routed(
+                    'sql_validation',
+                    prompt,
+                    parse=json.loads,
+                    validate=lambda result: isinstance(result, dict) and "is_valid" in result,
+                    keep_history=True
+                )
             except json.JSONDecodeError:
                 return {
                     "is_valid": False,
@@ -267,18 +677,40 @@ class SQLGenerator:
 
     def get_conversation_history(self) -> list:
         """현재 대화 기록 반환"""
-        return self.conversation_history
+        with self._history_guard():
+            self._wait_for_pending_stream()
+            return list(self.conversation_history)
 
     def get_token_count(self) -> int:
-        """현재 대화 기록의 대략적인 토큰 수 계산"""
-        # 간단한 휴리스틱: 단어 수 * 1.3
-        total_text = " ".join([msg["content"] for msg in self.conversation_history])
-        return int(len(total_text.split()) * 1.3)
-
-    def trim_conversation_history(self, max_tokens: int = 8000):
-        """대화 기록을 최대 토큰 수에 맞게 조정"""
-        while self.get_token_count() > max_tokens and len(self.conversation_history) > 2:
-            # 시스템 메시지는 유지하고 가장 오래된 대화 쌍 제거
-            self.conversation_history.pop(1)  # user message
-            if len(self.conversation_history) > 1:
-                self.conversation_history.pop(1)  # assistant message
+        """현재 대화 기록의 토큰 수 (메시지 추가 시 증분 계산된 값)"""
+        return self.context.total_tokens
+
+    def get_context_metrics(self) -> Dict[str, int]:
+        """현재 대화 컨텍스트 크기 지표 반환"""
+        return self.context.get_metrics()
+
+    def get_usage_metrics(self) -> Dict[str, Any]:
+        """최근 호출들의 입력 토큰/프롬프트 캐시 적중/지연 시간 지표 반환"""
+        records = list(self.usage_history)
+        if not records:
+            return {"calls": 0}
+
+        input_tokens = sum(record["input_tokens"] for record in records)
+        cache_read_tokens = sum(record["cache_read_input_tokens"] for record in records)
+        total_input = input_tokens + cache_read_tokens + sum(record["cache_creation_input_tokens"] for record in records)
+        return {
+            "calls": len(records),
+            "last": records[-1],
+            "avg_input_tokens": input_tokens / len(records),
+            "avg_latency": sum(record["latency"] for record in records) / len(records),
+            "prompt_cache_read_ratio": cache_read_tokens / total_input if total_input else 0.0
+        }
+
+    def trim_conversation_history(self, max_tokens: Optional[int] = None) -> int:
+        """대화 기록을 최대 토큰 수에 맞게 조정 (시스템 지시사항 쌍은 유지하고 오래된 대화 쌍부터 제거)"""
+        with self._history_guard():
+            self._wait_for_pending_stream()
+            try:
+                return self.context.enforce_budget(max_tokens=max_tokens)
+            except ContextBudgetExceeded:
+                return 0
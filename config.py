@@ -11,7 +11,29 @@ AWS_REGION = 'ap-northeast-2'
 BEDROCK_MODELS = {
     'claude': "anthropic.claude-3-5-sonnet-20240620-v1:0",
     'titan_embedding': "amazon.titan-embed-text-v2:0",
-    'cross_claude' : "apac.anthropic.claude-3-5-sonnet-20240620-v1:0"
+    'cross_claude' : "apac.anthropic.claude-3-5-sonnet-20240620-v1:0",
+    'cross_claude_haiku': "apac.anthropic.claude-3-haiku-20240307-v1:0"
+}
+
+# 호출 유형별 모델 등급 설정 (빠른 등급 응답의 파싱/검증 실패 시 상위 등급으로 재호출)
+MODEL_ROUTING_CONFIG = {
+    'enabled': os.getenv('MODEL_ROUTING_ENABLED', 'true').lower() == 'true',
+    'tiers': {
+        'fast': os.getenv('MODEL_TIER_FAST', BEDROCK_MODELS['cross_claude_haiku']),
+        'standard': os.getenv('MODEL_TIER_STANDARD', BEDROCK_MODELS['cross_claude'])
+    },
+    # 등급별 상위 등급 (없으면 더 이상 재호출하지 않음)
+    'escalation': {
+        'fast': 'standard'
+    },
+    'call_types': {
+        'intent_analysis': os.getenv('MODEL_TIER_INTENT_ANALYSIS', 'fast'),
+        'sql_validation': os.getenv('MODEL_TIER_SQL_VALIDATION', 'fast'),
+        'sql_generation': 'standard',
+        'schema_augmentation': 'standard',
+        'ddl_generation': 'standard'
+    },
+    'default_tier': 'standard'
 }
 
 # OpenSearch 설정
@@ -20,7 +42,26 @@ OPENSEARCH_CONFIG = {
     'port': int(os.getenv('OPENSEARCH_PORT', 443)),
     'username': os.getenv('OPENSEARCH_USERNAME'),
     'password': os.getenv('OPENSEARCH_PASSWORD'),
-    'domain': os.getenv('OPENSEARCH_DOMAIN')
+    'domain': os.getenv('OPENSEARCH_DOMAIN'),
+    # 검색 요청 타임아웃 (초, 요청 마감 시간이 더 짧으면 남은 시간 사용)
+    'request_timeout': float(os.getenv('OPENSEARCH_REQUEST_TIMEOUT', 10)),
+    # 전체 테이블 카탈로그를 스키마 세대별로 메모리에 보관 (세대 확인 주기는 ANSWER_CACHE_CONFIG['schema_version_ttl'])
+    'schema_catalog_cache': os.getenv('SCHEMA_CATALOG_CACHE_ENABLED', 'true').lower() == 'true',
+    # 검색 응답에서 응답 처리에 필요한 _source 필드만 요청 (임베딩 벡터 제외)
+    'source_filtering': os.getenv('OPENSEARCH_SOURCE_FILTERING', 'true').lower() == 'true',
+    # 통합 검색 실행 방식 (msearch: 한 번의 _msearch 요청, parallel: 검색별 요청 병렬 실행)
+    'search_mode': os.getenv('OPENSEARCH_SEARCH_MODE', 'msearch'),
+    # lexical/kNN 점수 결합 위치 (client: Python 정규화, pipeline: normalization-processor 검색 파이프라인과 hybrid 쿼리)
+    # pipeline은 neural-search 플러그인이 있는 OpenSearch 2.10 이상 필요 (지원하지 않으면 client로 자동 전환)
+    'hybrid_search': os.getenv('OPENSEARCH_HYBRID_SEARCH', 'client')
+}
+
+# 검색 백엔드 설정
+RETRIEVAL_CONFIG = {
+    # opensearch: OpenSearch 클러스터, local: 내보낸 인덱스를 메모리에 올린 프로세스 내 벡터/BM25 엔진
+    'backend': os.getenv('RETRIEVAL_BACKEND', 'opensearch'),
+    # 로컬 엔진 인덱스 디렉터리 (OpenSearchManager.export_local_index로 생성)
+    'local_path': os.getenv('RETRIEVAL_LOCAL_PATH', os.path.join('.cache', 'retrieval'))
 }
 
 # Redshift 설정
@@ -30,4 +71,133 @@ REDSHIFT_CONFIG = {
     'database': os.getenv('REDSHIFT_DATABASE'),
     'user': os.getenv('REDSHIFT_USERNAME'),
     'password': os.getenv('REDSHIFT_PASSWORD')
-}
\ No newline at end of file
+}
+# 임베딩 캐시 설정
+EMBEDDING_CACHE_CONFIG = {
+    'enabled': os.getenv('EMBEDDING_CACHE_ENABLED', 'true').lower() == 'true',
+    'path': os.getenv('EMBEDDING_CACHE_PATH', os.path.join('.cache', 'embeddings.sqlite3')),
+    'max_entries': int(os.getenv('EMBEDDING_CACHE_MAX_ENTRIES', 100000))
+}
+
+# 임베딩 배치 생성 설정
+EMBEDDING_CONFIG = {
+    'max_workers': int(os.getenv('EMBEDDING_MAX_WORKERS', 8)),
+    'requests_per_second': float(os.getenv('EMBEDDING_REQUESTS_PER_SECOND', 10)),
+    'progress_batch_size': int(os.getenv('EMBEDDING_PROGRESS_BATCH_SIZE', 20))
+}
+
+# 임베딩 프로필 설정 (Titan v2: 256 / 512 / 1024 차원 지원)
+EMBEDDING_PROFILE = {
+    'dimension': int(os.getenv('EMBEDDING_DIMENSION', 1024)),
+    'normalize': os.getenv('EMBEDDING_NORMALIZE', 'true').lower() == 'true'
+}
+
+# Bedrock 공용 호출 제한 설정 (모델 ID별 AIMD 토큰 버킷)
+BEDROCK_RATE_LIMIT_CONFIG = {
+    'default': {
+        'initial_rate': float(os.getenv('BEDROCK_INITIAL_RPS', 2)),
+        'min_rate': float(os.getenv('BEDROCK_MIN_RPS', 0.2)),
+        'max_rate': float(os.getenv('BEDROCK_MAX_RPS', 10)),
+        'increase_step': 0.1,
+        'decrease_factor': 0.5,
+        'burst': 2
+    },
+    'models': {
+        BEDROCK_MODELS['titan_embedding']: {
+            'initial_rate': EMBEDDING_CONFIG['requests_per_second'],
+            'max_rate': EMBEDDING_CONFIG['requests_per_second'],
+            'burst': EMBEDDING_CONFIG['max_workers']
+        }
+    },
+    'metrics_publish_interval': int(os.getenv('BEDROCK_METRICS_PUBLISH_INTERVAL', 60))
+}
+
+# Bedrock 런타임 클라이언트 설정 (프로세스 공용 커넥션 풀)
+BEDROCK_CLIENT_CONFIG = {
+    'max_pool_connections': int(os.getenv('BEDROCK_MAX_POOL_CONNECTIONS', 50)),
+    'tcp_keepalive': os.getenv('BEDROCK_TCP_KEEPALIVE', 'true').lower() == 'true',
+    'connect_timeout': float(os.getenv('BEDROCK_CONNECT_TIMEOUT', 5)),
+    'read_timeout': float(os.getenv('BEDROCK_READ_TIMEOUT', 120)),
+    'retry_mode': os.getenv('BEDROCK_RETRY_MODE', 'standard'),
+    'max_attempts': int(os.getenv('BEDROCK_MAX_ATTEMPTS', 2))
+}
+
+# SQL 생성 설정
+SQL_GENERATION_CONFIG = {
+    'max_tokens': int(os.getenv('SQL_MAX_TOKENS', 20000)),
+    # invoke_model_with_response_stream 사용 여부
+    'streaming': os.getenv('SQL_STREAMING', 'true').lower() == 'true',
+    # sql 필드 완성 즉시 반환하고 설명 등 나머지 응답은 백그라운드에서 수신
+    'return_on_sql': os.getenv('SQL_RETURN_ON_SQL', 'true').lower() == 'true',
+    # 상태 비저장 모드: 시스템 프롬프트를 system 필드로 보내고 질문을 단독(또는 제한된 후속 대화와 함께) 전송
+    'stateless': os.getenv('SQL_STATELESS', 'true').lower() == 'true',
+    # 상태 비저장 모드에서 후속 질문 컨텍스트로 함께 보낼 직전 대화 쌍 수
+    'followup_turns': int(os.getenv('SQL_FOLLOWUP_TURNS', 0)),
+    # 시스템 프롬프트에 Bedrock 프롬프트 캐시 체크포인트 지정
+    'prompt_cache': os.getenv('SQL_PROMPT_CACHE', 'true').lower() == 'true',
+    # 프롬프트 캐시를 지원하는 모델 (리전 접두사 제외, 쉼표 구분) - 목록에 없는 모델에는 체크포인트를 보내지 않음
+    'prompt_cache_models': [
+        model.strip() for model in os.getenv(
+            'SQL_PROMPT_CACHE_MODELS',
+            'anthropic.claude-3-5-haiku-20241022-v1:0,'
+            'anthropic.claude-3-7-sonnet-20250219-v1:0,'
+            'anthropic.claude-sonnet-4-20250514-v1:0,'
+            'anthropic.claude-opus-4-20250514-v1:0'
+        ).split(',') if model.strip()
+    ]
+}
+
+# LLM 응답 캐시 설정 (temperature 0 호출 대상)
+LLM_CACHE_CONFIG = {
+    'enabled': os.getenv('LLM_CACHE_ENABLED', 'true').lower() == 'true',
+    'backend': os.getenv('LLM_CACHE_BACKEND', 'sqlite'),  # 'sqlite' 또는 'memory'
+    'path': os.getenv('LLM_CACHE_PATH', '.cache/llm_responses.sqlite3'),
+    'max_entries': int(os.getenv('LLM_CACHE_MAX_ENTRIES', 5000)),
+    'ttl_seconds': int(os.getenv('LLM_CACHE_TTL_SECONDS', 86400)),
+    'prompt_check_interval': int(os.getenv('LLM_CACHE_PROMPT_CHECK_INTERVAL', 5))
+}
+
+# 시맨틱 답변 캐시 설정 (유사 질문의 검증된 SQL 재사용)
+ANSWER_CACHE_CONFIG = {
+    'enabled': os.getenv('ANSWER_CACHE_ENABLED', 'true').lower() == 'true',
+    'path': os.getenv('ANSWER_CACHE_PATH', '.cache/answer_cache.sqlite3'),
+    'similarity_threshold': float(os.getenv('ANSWER_CACHE_SIMILARITY_THRESHOLD', 0.92)),
+    'max_entries': int(os.getenv('ANSWER_CACHE_MAX_ENTRIES', 10000)),
+    # 현재 스키마 버전 조회 결과 재사용 시간 (초)
+    'schema_version_ttl': int(os.getenv('ANSWER_CACHE_SCHEMA_VERSION_TTL', 30))
+}
+
+# SQL 생성 프롬프트 토큰 예산 설정
+PROMPT_BUDGET_CONFIG = {
+    'max_prompt_tokens': int(os.getenv('SQL_PROMPT_MAX_TOKENS', 30000)),
+    'min_related_tables': int(os.getenv('SQL_PROMPT_MIN_RELATED_TABLES', 3)),
+    'min_sample_queries': int(os.getenv('SQL_PROMPT_MIN_SAMPLE_QUERIES', 5))
+}
+
+# SQL 생성기 대화 컨텍스트 설정
+CONVERSATION_CONFIG = {
+    # 대화 기록 + 새 메시지의 최대 토큰 수 (매 호출 전에 적용)
+    'max_context_tokens': int(os.getenv('SQL_MAX_CONTEXT_TOKENS', 100000)),
+    # 정리 대상에서 제외할 앞쪽 메시지 수 (시스템 지시사항 user/assistant 쌍)
+    'preserved_messages': 2
+}
+
+# 워크플로우 구성 설정
+WORKFLOW_CONFIG = {
+    # sequential: 의도 분석과 SQL 생성을 별도 호출, fused: 스키마 검색 후 의도+SQL을 한 번에 생성
+    'topology': os.getenv('WORKFLOW_TOPOLOGY', 'sequential'),
+    # 비동기 실행(aexecute) 시 블로킹 노드(boto3/OpenSearch/Redshift)를 실행할 스레드 수
+    'async_max_workers': int(os.getenv('WORKFLOW_ASYNC_MAX_WORKERS', 32)),
+    # execute_many 기본 동시 실행 질문 수
+    'batch_concurrency': int(os.getenv('WORKFLOW_BATCH_CONCURRENCY', 8)),
+    # 요청 전체 마감 시간 (초, 0 이하이면 제한 없음) - 각 노드와 외부 호출의 타임아웃으로 전달
+    'request_timeout': float(os.getenv('WORKFLOW_REQUEST_TIMEOUT', 90)),
+    # 외부 호출 한 번에 필요한 최소 시간 (남은 시간이 이보다 짧으면 재시도하지 않음)
+    'min_call_seconds': float(os.getenv('WORKFLOW_MIN_CALL_SECONDS', 2)),
+    # Redshift 쿼리 기본 statement_timeout (초, 요청 마감 시간이 더 짧으면 남은 시간 사용)
+    'sql_statement_timeout': float(os.getenv('REDSHIFT_STATEMENT_TIMEOUT', 60)),
+    # stream_events로 먼저 보여줄 실행 결과 행 수
+    'stream_preview_rows': int(os.getenv('WORKFLOW_STREAM_PREVIEW_ROWS', 10)),
+    # 상태 밖에 보관하는 SQL 실행 결과 최대 개수 (완료 시 꺼내지 못한 결과는 오래된 순으로 제거)
+    'result_store_max_entries': int(os.getenv('WORKFLOW_RESULT_STORE_MAX_ENTRIES', 256))
+}
@@ -1,15 +1,32 @@
-from typing import Dict, Any
+import asyncio
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from typing import Callable, Dict, Any, Iterator, List, Optional
 from datetime import datetime
 from uuid import uuid4
+from langgraph.config import get_stream_writer
 from langgraph.graph import StateGraph
 from .workflow_state import WorkflowState
-from langchain_core.messages import HumanMessage, AIMessage
+from langchain_core.messages import HumanMessage
+from langchain_core.runnables import RunnableLambda
 from chains.intent_analyzer import IntentAnalyzer
 from chains.search_validator import SearchValidator
 from chains.sql_validator import SQLValidator
 from utils.response_handler import ResponseHandler
 from typing import Dict, Any
 from chains.feedback_handler import FeedbackHandler
+from utils.answer_cache import get_answer_cache
+from utils.search_context import CancelToken
+from utils.model_router import get_model_router
+from utils.deadline import DeadlineExceeded, deadline_scope, make_deadline
+from utils.monitoring import PerformanceMonitor, current_monitor, monitor_scope
+from utils.embedding_cache import normalize_text
+from utils.workflow_benchmark import summarize_latencies
+from utils.result_store import ResultStore
+from config import WORKFLOW_CONFIG
 
 class TextToSQLFlow:
     def __init__(
@@ -19,7 +36,8 @@ class TextToSQLFlow:
             redshift_manager,
             performance_monitor,
             package_manager,
-            llm
+            llm,
+            topology=None
     ):
         self.opensearch_manager = opensearch_manager
         self.package_manager = package_manager
@@ -32,187 +50,550 @@ class TextToSQLFlow:
         self.sql_validator = SQLValidator(llm, redshift_manager)
         self.response_handler = ResponseHandler()
         self.feedback_handler = FeedbackHandler(opensearch_manager)
+        # SQL 실행 결과 행 저장소 (상태에는 참조 ID만 보관)
+        self.result_store = ResultStore()
+        self.answer_cache = get_answer_cache()
+        # 모델 등급별 지연 시간/재호출 비율은 노드 실행 중 지정한 워크플로우의 PerformanceMonitor로 기록
+        self.model_router = get_model_router()
+        # 실행 중인 질의별 스키마 검색 취소 토큰 (의도 검증 실패 시 병렬 검색 중단)
+        self._cancel_tokens: Dict[str, CancelToken] = {}
+        self._cancel_tokens_lock = threading.Lock()
+        # 비동기 실행 시 블로킹 노드(boto3/OpenSearch/Redshift)를 실행할 제한된 스레드 풀
+        self._io_executor = ThreadPoolExecutor(
+            max_workers=WORKFLOW_CONFIG['async_max_workers'],
+            thread_name_prefix='workflow-io'
+        )
+        # sequential: 의도 분석 → 스키마 검색 → SQL 생성 (LLM 2회 호출)
+        # fused: 스키마 검색 → 의도+SQL 동시 생성 → 의도 검증 (LLM 1회 호출)
+        self.topology = topology or WORKFLOW_CONFIG['topology']
+        if self.topology not in ("sequential", "fused"):
+            raise ValueError(f"지원하지 않는 워크플로우 구성입니다: {self.topology}")
         self.graph = self._create_workflow()
 
-    def execute(self, query: str) -> Dict[str, Any]:
-        """워크플로우 실행"""
+    def execute(self, query: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """워크플로우 실행 (timeout: 요청 마감 시간(초), 미지정 시 WORKFLOW_CONFIG['request_timeout'])"""
         try:
             # 성능 모니터링 시작
-            operation_id = self.performance_monitor.start_operation("complete_workflow")
+            operation_id = self._monitor().start_operation("complete_workflow")
 
             # 초기 상태 설정
-            initial_state = WorkflowState(
-                messages=[HumanMessage(content=query)],
-                current_step="analyze_intent",
-                query=query,
-                intent={},
-                search_results={},
-                validation_results={},
-                sql="",
-                query_results=[],
-                metadata={
-                    "query_id": str(uuid4()),
-                    "start_time": datetime.now().isoformat()
-                }
-            )
+            initial_state = self._create_initial_state(query, timeout)
 
             # 워크플로우 실행
-            final_state = self.graph.invoke(initial_state)
+            try:
+                final_state = self.graph.invoke(initial_state)
+            finally:
+                self._release_run(initial_state)
+
+            return self._finish_run(operation_id, final_state)
+
+        except Exception as e:
+            return self._error_response(locals().get('operation_id'), e)
+
+    async def aexecute(self, query: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        워크플로우 비동기 실행 (graph.ainvoke)
+        블로킹 I/O 노드는 제한된 크기의 공용 스레드 풀에서 실행되므로 한 프로세스에서 여러 질문을 동시에 처리할 수 있습니다.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            # 성능 모니터링 시작
+            operation_id = self._monitor().start_operation("complete_workflow")
 
-            # 결과 처리
-            result = self.response_handler.format_response(final_state)
+            # 초기 상태 설정
+            initial_state = self._create_initial_state(query, timeout)
 
-            # 성능 모니터링 종료
-            self.performance_monitor.end_operation(operation_id, result)
+            # 워크플로우 실행
+            try:
+                final_state = await self.graph.ainvoke(initial_state)
+            finally:
+                self._release_run(initial_state)
 
-            return result
+            # 결과 처리 및 지표 전송(CloudWatch)도 이벤트 루프 밖에서 실행 (실행별 모니터가 담긴 컨텍스트 전달)
+            return await loop.run_in_executor(
+                self._io_executor, copy_context().run, functools.partial(self._finish_run, operation_id, final_state)
+            )
 
         except Exception as e:
-            # 오류 발생 시 성능 모니터링에 기록
-            if 'operation_id' in locals():
-                self.performance_monitor.log_error(operation_id, e)
+            return self._error_response(locals().get('operation_id'), e)
+
+    def execute_many(self, questions: List[str], concurrency: Optional[int] = None,
+                     on_result: Optional[Callable[[int, str, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        여러 질문 일괄 실행 (회귀 검사 및 캐시 예열용)
+        질문별 단계가 겹쳐 실행되도록 aexecute를 동시에 concurrency개까지 실행하고,
+        중복 질문은 한 번만 실행하여 임베딩/검색/LLM 결과를 공유합니다.
+
+        Args:
+            questions (List[str]): 실행할 질문 목록
+            concurrency (int): 동시 실행 질문 수 (미지정 시 WORKFLOW_CONFIG['batch_concurrency'])
+            on_result: 질문별 결과가 나오는 즉시 호출할 콜백 (입력 순번, 질문, 결과)
+
+        Returns:
+            Dict: {"results": 입력 순서의 결과 목록, "stats": 처리량/지연 시간 통계}
+
+        Raises:
+            ValueError: SQL 생성기가 대화 기록을 이어가는 설정인 경우 (SQL_STATELESS=false 또는 SQL_FOLLOWUP_TURNS > 0)
+        """
+        return asyncio.run(self.aexecute_many(questions, concurrency, on_result))
+
+    async def aexecute_many(self, questions: List[str], concurrency: Optional[int] = None,
+                            on_result: Optional[Callable[[int, str, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """execute_many의 비동기 버전 (실행 중인 이벤트 루프에서 사용)"""
+        # 서로 관련 없는 질문이 이전 질문을 대화 기록으로 함께 보내지 않도록 후속 대화 없는 상태 비저장 생성만 허용
+        if self.sql_generator.ordered_history:
+            raise ValueError(
+                "일괄 실행은 대화 기록을 유지하지 않는 SQL 생성 설정에서만 지원합니다 "
+                "(SQL_STATELESS=true, SQL_FOLLOWUP_TURNS=0)."
+            )
+        concurrency = max(1, concurrency or WORKFLOW_CONFIG['batch_concurrency'])
+        started_at = time.monotonic()
+
+        # 정규화한 질문 기준으로 중복 제거 (첫 등장 순서 유지)
+        groups: Dict[str, List[int]] = {}
+        for index, question in enumerate(questions):
+            groups.setdefault(normalize_text(question), []).append(index)
+        unique = [(indices[0], indices) for indices in groups.values()]
+
+        # 질문 임베딩을 병렬로 미리 생성하여 캐시에 저장 (이후 노드는 캐시 적중)
+        loop = asyncio.get_running_loop()
+        embedder = getattr(self.opensearch_manager, 'embedder', None)
+        if embedder is not None and getattr(embedder, 'cache', None) is not None and unique:
+            try:
+                await loop.run_in_executor(
+                    self._io_executor, embedder.embed_documents, [questions[first] for first, _ in unique]
+                )
+            except Exception as e:
+                print(f"질문 임베딩 사전 생성 중 오류 발생: {str(e)}")
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(questions)
+        latencies: List[float] = []
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _run(first: int, indices: List[int]) -> None:
+            async with semaphore:
+                question_started_at = time.monotonic()
+                # 동시에 실행되는 질문의 노드 실행 시간이 섞이지 않도록 질문별 모니터 사용 (CloudWatch 전송 없음)
+                with monitor_scope(PerformanceMonitor(publish=False)):
+                    result = await self.aexecute(questions[first])
+                latencies.append(time.monotonic() - question_started_at)
+
+            for index in indices:
+                if index == first:
+                    results[index] = result
+                else:
+                    # 중복 질문은 같은 결과를 공유하되 메타데이터에 원본 순번 표시
+                    results[index] = {**result, "metadata": {**result.get("metadata", {}), "duplicate_of": first}}
+                if on_result:
+                    on_result(index, questions[index], results[index])
+
+        await asyncio.gather(*(_run(first, indices) for first, indices in unique))
+
+        elapsed = time.monotonic() - started_at
+        succeeded = sum(1 for result in results if result.get("success"))
+        return {
+            "results": results,
+            "stats": {
+                "questions": len(questions),
+                "unique_questions": len(unique),
+                "duplicates": len(questions) - len(unique),
+                "succeeded": succeeded,
+                "failed": len(questions) - succeeded,
+                "concurrency": concurrency,
+                "wall_time": elapsed,
+                "throughput": len(questions) / elapsed if elapsed else 0.0,
+                **summarize_latencies(latencies)
+            }
+        }
+
+    def stream_events(self, query: str, timeout: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """
+        워크플로우를 실행하면서 진행 이벤트를 순서대로 반환 (graph.stream)
+
+        이벤트 종류 ("type"):
+            node_start / node_end / node_skipped: 노드 시작/종료(소요 시간)/마감 초과로 생략
+            search_results: 검색된 테이블과 샘플 쿼리 수
+            sql: 생성된 SQL (스트리밍 생성 시 sql 필드가 완성되는 즉시)
+            rows: 실행 결과 앞부분 행과 전체 행 수
+            result: execute와 같은 형식의 최종 응답 (항상 마지막 이벤트)
+        """
+        try:
+            # 성능 모니터링 시작
+            operation_id = self._monitor().start_operation("complete_workflow")
 
-            return {
-                "success": False,
-                "error": str(e),
-                "feedback": "죄송합니다. 예상치 못한 오류가 발생했습니다.",
-                "suggested_actions": ["retry_question"],
-                "metadata": {
-                    "query_id": str(uuid4()),
-                    "error_time": datetime.now().isoformat()
-                }
+            # 초기 상태 설정
+            initial_state = self._create_initial_state(query, timeout)
+
+            final_state = initial_state
+            emitted_sql = None
+            try:
+                for mode, chunk in self.graph.stream(initial_state, stream_mode=["custom", "updates", "values"]):
+                    if mode == "values":
+                        final_state = chunk
+                        continue
+                    if mode == "custom":
+                        if chunk.get("type") == "sql":
+                            emitted_sql = chunk.get("sql")
+                        yield chunk
+                        continue
+
+                    # 노드별 상태 변경에서 검색 결과/SQL/실행 결과 이벤트 추출
+                    for node, update in chunk.items():
+                        for event in self._events_from_update(node, update or {}, emitted_sql):
+                            if event["type"] == "sql":
+                                emitted_sql = event["sql"]
+                            yield event
+            finally:
+                self._release_run(initial_state)
+
+            result = self._finish_run(operation_id, final_state)
+
+        except Exception as e:
+            result = self._error_response(locals().get('operation_id'), e)
+
+        yield {"type": "result", "result": result}
+
+    def _events_from_update(self, node: str, update: Dict[str, Any], emitted_sql: Optional[str]) -> List[Dict[str, Any]]:
+        """노드 상태 변경에서 UI에 보여줄 진행 이벤트 생성"""
+        events = []
+        search_results = update.get("search_results")
+        if node in ("search_schema", "search_schema_fused") and search_results:
+            schema = search_results.get("database_schema") or {}
+            events.append({
+                "type": "search_results",
+                "tables": [table.get("table_name") for table in schema.get("tables", []) or []],
+                "related_tables": [table.get("table_name") for table in schema.get("related_tables", []) or []],
+                "sample_queries": len(search_results.get("sample_queries") or [])
+            })
+
+        sql = update.get("sql")
+        if node in ("generate_sql", "generate_sql_with_intent", "check_answer_cache") and sql and sql != emitted_sql:
+            events.append({"type": "sql", "sql": sql, "node": node})
+
+        if node == "execute_sql" and update.get("result_count"):
+            events.append({
+                "type": "rows",
+                "rows": self.result_store.get(update.get("result_ref"))[:WORKFLOW_CONFIG['stream_preview_rows']],
+                "total": update["result_count"]
+            })
+        return events
+
+    def _create_initial_state(self, query: str, timeout: Optional[float] = None) -> WorkflowState:
+        """질의별 초기 상태 생성 (요청 마감 시각 포함) 및 스키마 검색 취소 토큰 등록"""
+        query_id = str(uuid4())
+        with self._cancel_tokens_lock:
+            self._cancel_tokens[query_id] = CancelToken()
+
+        return WorkflowState(
+            messages=[HumanMessage(content=query)],
+            current_step="check_answer_cache",
+            query=query,
+            intent={},
+            search_results={},
+            validation_results={},
+            sql="",
+            result_ref=None,
+            result_count=0,
+            metadata={
+                "query_id": query_id,
+                "start_time": datetime.now().isoformat()
+            },
+            deadline=make_deadline(timeout),
+            timed_out=False
+        )
+
+    def _release_run(self, state: WorkflowState) -> None:
+        """질의 실행 종료 시 취소 토큰 정리"""
+        with self._cancel_tokens_lock:
+            self._cancel_tokens.pop(state["metadata"]["query_id"], None)
+
+    def _finish_run(self, operation_id: str, final_state: WorkflowState) -> Dict[str, Any]:
+        """최종 상태를 응답 형식으로 변환하고 성능 모니터링 종료"""
+        # 결과 처리 (상태 밖 저장소의 실행 결과 행을 꺼내 응답에 포함)
+        result = self.response_handler.format_response({
+            **final_state,
+            "query_results": self.result_store.pop(final_state.get("result_ref"))
+        })
+
+        # 성능 모니터링 종료
+        self._monitor().end_operation(operation_id, result)
+
+        return result
+
+    def _error_response(self, operation_id: Optional[str], error: Exception) -> Dict[str, Any]:
+        """예상치 못한 오류 응답 생성"""
+        # 오류 발생 시 성능 모니터링에 기록
+        if operation_id is not None:
+            self._monitor().log_error(operation_id, error)
+
+        return {
+            "success": False,
+            "error": str(error),
+            "feedback": "죄송합니다. 예상치 못한 오류가 발생했습니다.",
+            "suggested_actions": ["retry_question"],
+            "metadata": {
+                "query_id": str(uuid4()),
+                "error_time": datetime.now().isoformat()
             }
+        }
+
+    def _as_node(self, name: str, func: Callable[[WorkflowState], Dict[str, Any]]) -> RunnableLambda:
+        """
+        동기 노드 함수를 동기/비동기 겸용 노드로 변환
+        invoke에서는 그대로 실행하고, ainvoke에서는 블로킹 I/O를 공용 스레드 풀로 넘깁니다.
+        """
+        def _func(state: WorkflowState) -> Dict[str, Any]:
+            return self._run_with_deadline(name, func, state)
+
+        async def _afunc(state: WorkflowState) -> Dict[str, Any]:
+            loop = asyncio.get_running_loop()
+            # 실행 설정(스트림 이벤트 전송 등)이 담긴 컨텍스트를 스레드에도 전달
+            return await loop.run_in_executor(self._io_executor, copy_context().run, functools.partial(_func, state))
+
+        return RunnableLambda(_func, afunc=_afunc, name=name)
+
+    def _run_with_deadline(self, name: str, func: Callable[[WorkflowState], Dict[str, Any]],
+                           state: WorkflowState) -> Dict[str, Any]:
+        """
+        요청 마감 시간을 적용하여 노드 실행
+        노드 안의 외부 호출은 남은 시간을 타임아웃으로 사용하며, 마감 시간을 넘긴 요청은 남은 노드를 건너뛰고 완료 노드로 이동합니다.
+        """
+        # 병렬 분기 노드는 자신의 키만 갱신해야 하므로 current_step을 바꾸지 않음
+        timeout_update = {"timed_out": True}
+        if name not in ("analyze_intent", "search_schema"):
+            timeout_update["current_step"] = "complete"
+
+        with deadline_scope(state.get("deadline")) as deadline, monitor_scope(self._monitor()):
+            # 완료 노드는 마감 시간과 관계없이 실행하여 최종 상태 정리
+            if name != "complete":
+                remaining = deadline.remaining()
+                if state.get("timed_out") or (remaining is not None and remaining <= 0):
+                    self._emit({"type": "node_skipped", "node": name, "reason": "timeout"})
+                    return timeout_update
+
+            started_at = time.monotonic()
+            self._emit({"type": "node_start", "node": name})
+            try:
+                update = func(state)
+            except DeadlineExceeded:
+                # 시간 초과 여부는 node_end 이벤트와 timed_out 상태로 전달
+                update = timeout_update
+            else:
+                # 하위 호출에서 마감 초과를 처리한 경우에도 시간 초과로 표시
+                if deadline.exceeded and name != "complete":
+                    update = {**update, **timeout_update}
+            self._emit({
+                "type": "node_end",
+                "node": name,
+                "duration": time.monotonic() - started_at,
+                "timed_out": bool(update.get("timed_out"))
+            })
+        return update
+
+    @staticmethod
+    def _emit(event: Dict[str, Any]) -> None:
+        """진행 이벤트 전송 (stream_events로 실행 중이 아니면 무시)"""
+        try:
+            writer = get_stream_writer()
+        except RuntimeError:
+            return
+        writer(event)
+
+    def _monitor(self) -> PerformanceMonitor:
+        """현재 실행의 PerformanceMonitor (일괄 실행은 질문별 모니터, 그 외에는 워크플로우 모니터)"""
+        return current_monitor() or self.performance_monitor
+
+    def _get_cancel_token(self, state: WorkflowState):
+        """질의의 스키마 검색 취소 토큰 조회"""
+        with self._cancel_tokens_lock:
+            return self._cancel_tokens.get(state["metadata"].get("query_id"))
+
+    def _cancel_search(self, state: WorkflowState) -> None:
+        """진행 중인 스키마 검색 취소"""
+        cancel_token = self._get_cancel_token(state)
+        if cancel_token is not None:
+            cancel_token.cancel()
 
     def _create_workflow(self) -> StateGraph:
         """워크플로우 생성"""
         workflow = StateGraph(WorkflowState)
+        first_step = "search_schema_fused" if self.topology == "fused" else "analyze_intent"
+
+        # 0. 시맨틱 답변 캐시 노드
+        def check_answer_cache(state: WorkflowState) -> Dict[str, Any]:
+            """시맨틱 답변 캐시 노드 - 유사 질문의 검증된 SQL이 있으면 바로 실행 단계로 이동"""
+            if self.answer_cache is None:
+                return {"current_step": first_step}
+
+            # 노드 실행 시간 측정 시작
+            node_operation_id = self._monitor().start_operation("check_answer_cache")
+
+            schema_version = None
+            cached = None
+            try:
+                schema_version = self.opensearch_manager.get_schema_version()
+                # 임베딩 캐시를 거치므로 이후 스키마 검색에서도 같은 임베딩을 재사용
+                embedding = self.opensearch_manager._get_query_embedding(state["query"])
+                cached = self.answer_cache.lookup(embedding, schema_version)
+            except Exception as e:
+                print(f"답변 캐시 조회 중 오류 발생: {str(e)}")
+
+            # 노드 실행 시간 측정 종료
+            self._monitor().end_operation(node_operation_id)
+
+            metadata = {
+                "schema_version": schema_version,
+                "answer_cache": {"hit": cached is not None}
+            }
+            if cached is None:
+                return {"current_step": first_step, "metadata": metadata}
+
+            metadata["answer_cache"].update({
+                "matched_question": cached["question"],
+                "similarity": cached["similarity"],
+                "latency_saved": cached["latency_saved"]
+            })
+            return {
+                "current_step": "execute_sql",
+                "sql": cached["sql"],
+                "validation_results": {
+                    "is_valid": True,
+                    "feedback": "유사한 질문에 대해 검증된 SQL을 재사용합니다.",
+                    "suggested_actions": []
+                },
+                "metadata": metadata
+            }
 
-        # 1. 의도 분석 노드
-        def analyze_intent(state: WorkflowState) -> WorkflowState:
-            """의도 분석 노드"""
+        # 1. 의도 분석 노드 (스키마 검색과 병렬 실행)
+        def analyze_intent(state: WorkflowState) -> Dict[str, Any]:
+            """의도 분석 노드 - 병렬 분기이므로 intent/validation_results만 갱신"""
             try:
                 # 노드 실행 시간 측정 시작
-                node_operation_id = self.performance_monitor.start_operation("analyze_intent")
+                node_operation_id = self._monitor().start_operation("analyze_intent")
                 
                 analysis_result = self.intent_analyzer.analyze_and_validate(state["query"])
                 
                 # 노드 실행 시간 측정 종료
-                self.performance_monitor.end_operation(node_operation_id)
-
-                if not analysis_result["is_valid"]:
-                    return {
-                        **state,
-                        "current_step": "complete",
-                        "intent": analysis_result["intent"],
-                        "validation_results": {
-                            "is_valid": False,
-                            "feedback": analysis_result["feedback"],
-                            "suggested_actions": analysis_result["suggested_actions"]
-                        }
-                    }
+                self._monitor().end_operation(node_operation_id)
 
-                return {
-                    **state,
-                    "current_step": "search_schema",
-                    "intent": analysis_result["intent"],
-                    "validation_results": {
-                        "is_valid": True,
-                        "feedback": analysis_result["feedback"],
-                        "suggested_actions": []
-                    }
+                validation_results = {
+                    "is_valid": analysis_result["is_valid"],
+                    "feedback": analysis_result["feedback"],
+                    "suggested_actions": analysis_result["suggested_actions"] if not analysis_result["is_valid"] else []
                 }
 
             except Exception as e:
-                return {
-                    **state,
-                    "current_step": "complete",
-                    "intent": {},
-                    "validation_results": {
-                        "is_valid": False,
-                        "feedback": f"의도 분석 중 오류가 발생했습니다: {str(e)}",
-                        "suggested_actions": ["rephrase_question"]
-                    }
+                analysis_result = {"intent": {}}
+                validation_results = {
+                    "is_valid": False,
+                    "feedback": f"의도 분석 중 오류가 발생했습니다: {str(e)}",
+                    "suggested_actions": ["rephrase_question"]
                 }
 
-        # 2. 스키마 검색 노드
-        def search_schema(state: WorkflowState) -> WorkflowState:
-            """스키마 검색 노드"""
+            if not validation_results["is_valid"]:
+                # 결과를 사용하지 않을 스키마 검색 분기 중단
+                self._cancel_search(state)
+
+            return {
+                "intent": analysis_result["intent"],
+                "validation_results": validation_results
+            }
+
+        # 2. 스키마 검색 노드 (의도 분석과 병렬 실행)
+        def search_schema(state: WorkflowState) -> Dict[str, Any]:
+            """스키마 검색 노드 - 질문만으로 검색하며 검증은 합류 후 수행"""
+            # 노드 실행 시간 측정 시작
+            node_operation_id = self._monitor().start_operation("search_schema")
+
+            cancel_token = self._get_cancel_token(state)
             try:
-                # 노드 실행 시간 측정 시작
-                node_operation_id = self.performance_monitor.start_operation("search_schema")
-                
-                # OpenSearch 검색 수행
+                # OpenSearch 검색 수행 (의도 검증 실패 시 취소)
                 search_results = self.opensearch_manager.integrated_search(
                     query=state["query"],
-                    top_k=5
+                    top_k=5,
+                    cancel_token=cancel_token
                 ) or {}
-                
-                # 검색 결과가 비어있는 경우
-                if not search_results or not search_results.get('database_schema'):
-                    return {
-                        **state,
-                        "current_step": "complete",
-                        "search_results": search_results,
-                        "validation_results": {
-                            "is_valid": False,
-                            "feedback": "검색 결과가 없습니다.",
-                            "suggested_actions": ["rephrase_question"]
-                        },
-                        "sql": "",
-                        "query_results": []
-                    }
+                search_error = None
+            except Exception as e:
+                search_results = {}
+                search_error = str(e)
 
-                # 검색 결과 검증
-                validation = self.search_validator.validate_search_results(
-                    search_results,
-                    state["intent"]
-                )
+            # 노드 실행 시간 측정 종료
+            self._monitor().end_operation(node_operation_id)
 
-                # 검증 실패 시
-                if not validation["is_valid"]:
-                    return {
-                        **state,
-                        "current_step": "complete",
-                        "search_results": search_results,
-                        "validation_results": validation,
-                        "sql": "",
-                        "query_results": []
-                    }
+            return {
+                "search_results": search_results,
+                "metadata": {
+                    "search_cancelled": bool(cancel_token and cancel_token.cancelled),
+                    "search_error": search_error
+                }
+            }
 
-                # 노드 실행 시간 측정 종료
-                self.performance_monitor.end_operation(node_operation_id)
-                
+        # 2.5. 의도 분석/스키마 검색 합류 노드
+        def validate_search(state: WorkflowState) -> Dict[str, Any]:
+            """두 분기가 모두 끝난 뒤 의도 검증 결과 확인 및 검색 결과 검증"""
+            # 의도 검증 실패 시 검색 결과와 무관하게 종료
+            if not state["validation_results"].get("is_valid"):
                 return {
-                    **state,
-                    "current_step": "generate_sql",
-                    "search_results": search_results,
-                    "validation_results": validation,
-                    "schema_validated": True
+                    "current_step": "complete",
+                    "sql": ""
                 }
 
-            except Exception as e:
+            search_results = state.get("search_results") or {}
+            search_error = state["metadata"].get("search_error")
+            if search_error:
                 return {
-                    **state,
                     "current_step": "complete",
                     "search_results": {},
                     "validation_results": {
                         "is_valid": False,
-                        "feedback": f"스키마 검색 중 오류가 발생했습니다: {str(e)}",
+                        "feedback": f"스키마 검색 중 오류가 발생했습니다: {search_error}",
                         "suggested_actions": ["retry_search"],
                         "relevant_schemas": []
                     }
                 }
 
+            # 검색 결과가 비어있는 경우
+            if not search_results.get('database_schema'):
+                return {
+                    "current_step": "complete",
+                    "validation_results": {
+                        "is_valid": False,
+                        "feedback": "검색 결과가 없습니다.",
+                        "suggested_actions": ["rephrase_question"]
+                    },
+                    "sql": ""
+                }
+
+            # 검색 결과 검증
+            validation = self.search_validator.validate_search_results(
+                search_results,
+                state["intent"]
+            )
+
+            # 검증 실패 시
+            if not validation["is_valid"]:
+                return {
+                    "current_step": "complete",
+                    "validation_results": validation,
+                    "sql": ""
+                }
+
+            return {
+                "current_step": "generate_sql",
+                "validation_results": validation,
+                "schema_validated": True
+            }
+
         # 3. SQL 생성 노드
-        def generate_sql(state: WorkflowState) -> WorkflowState:
+        def generate_sql(state: WorkflowState) -> Dict[str, Any]:
             """SQL 생성 노드"""
             # 노드 실행 시간 측정 시작
-            node_operation_id = self.performance_monitor.start_operation("generate_sql")
+            node_operation_id = self._monitor().start_operation("generate_sql")
             
             # 검색 결과와 검증 확인
             if not state.get("search_results") or not state.get("validation_results", {}).get("is_valid"):
                 return {
-                    **state,
                     "current_step": "complete",
                     "sql": "",
                     "feedback": "유효한 스키마 정보가 없습니다."
@@ -220,35 +601,39 @@ class TextToSQLFlow:
 
             sql_response = self.sql_generator.generate_sql(
                 question=state["query"],
-                database_schema=state["search_results"]
+                database_schema=state["search_results"],
+                # sql 필드가 완성되는 즉시 진행 이벤트로 전달
+                on_sql=lambda sql: self._emit({"type": "sql", "sql": sql, "node": "generate_sql"})
             )
 
             if "error" in sql_response:
                 return {
-                    **state,
                     "current_step": "complete",
                     "sql": "",
                     "feedback": sql_response["error"]
                 }
 
             # 노드 실행 시간 측정 종료
-            self.performance_monitor.end_operation(node_operation_id)
+            self._monitor().end_operation(node_operation_id)
             
             return {
-                **state,
                 "current_step": "validate_sql",
-                "sql": sql_response["sql"]
+                "sql": sql_response["sql"],
+                "metadata": {
+                    "prompt_tokens": sql_response.get("prompt_report", {}),
+                    "context": self.sql_generator.get_context_metrics(),
+                    "llm_usage": sql_response.get("llm_usage", {})
+                }
             }
 
         # 3.5. SQL 검증 노드
-        def validate_sql(state: WorkflowState) -> WorkflowState:
+        def validate_sql(state: WorkflowState) -> Dict[str, Any]:
             """SQL 검증 노드"""
             # 노드 실행 시간 측정 시작
-            node_operation_id = self.performance_monitor.start_operation("validate_sql")
+            node_operation_id = self._monitor().start_operation("validate_sql")
             
             if not state.get("sql"):
                 return {
-                    **state,
                     "current_step": "complete",
                     "validation_results": {
                         "is_valid": False,
@@ -264,7 +649,6 @@ class TextToSQLFlow:
 
             if not validation_result["is_valid"]:
                 return {
-                    **state,
                     "current_step": "complete",
                     "validation_results": validation_result,
                     "feedback": "SQL 검증 실패: " + ", ".join(validation_result.get("errors", [])),
@@ -272,138 +656,328 @@ class TextToSQLFlow:
                 }
 
             # 노드 실행 시간 측정 종료
-            self.performance_monitor.end_operation(node_operation_id)
+            self._monitor().end_operation(node_operation_id)
             
             return {
-                **state,
                 "current_step": "execute_sql",
                 "validation_results": validation_result
             }
 
         # 4. SQL 실행 노드
-        def execute_sql(state: WorkflowState) -> WorkflowState:
+        def execute_sql(state: WorkflowState) -> Dict[str, Any]:
             """SQL 실행 노드"""
             # 노드 실행 시간 측정 시작
-            node_operation_id = self.performance_monitor.start_operation("execute_sql")
+            node_operation_id = self._monitor().start_operation("execute_sql")
             
             # SQL이 비어있는 경우 실행하지 않음
             if not state.get("sql"):
                 return {
-                    **state,
                     "current_step": "complete",
-                    "query_results": [],
                     "feedback": "SQL이 생성되지 않아 실행할 수 없습니다."
                 }
 
+            # 캐시 적중 시 생략되는 단계(의도 분석~SQL 검증)의 소요 시간
+            pipeline_seconds = (datetime.now() - datetime.fromisoformat(state["metadata"]["start_time"])).total_seconds()
+
             results = self.redshift_manager.execute_query(state["sql"])
 
             # 노드 실행 시간 측정 종료
-            self.performance_monitor.end_operation(node_operation_id)
+            self._monitor().end_operation(node_operation_id)
+
+            # 검증과 실행에 성공한 질문→SQL 쌍을 답변 캐시에 저장
+            answer_cache_state = state["metadata"].get("answer_cache")
+            if self.answer_cache is not None and results is not None and answer_cache_state \
+                    and not answer_cache_state["hit"] and state["validation_results"].get("is_valid"):
+                try:
+                    self.answer_cache.store(
+                        question=state["query"],
+                        sql=state["sql"],
+                        embedding=self.opensearch_manager._get_query_embedding(state["query"]),
+                        schema_version=state["metadata"].get("schema_version"),
+                        pipeline_seconds=pipeline_seconds
+                    )
+                except Exception as e:
+                    print(f"답변 캐시 저장 중 오류 발생: {str(e)}")
             
+            # 결과 행은 상태 밖 저장소에 두고 참조 ID만 전달
+            results = results or []
             return {
-                **state,
                 "current_step": "handle_feedback",
-                "query_results": results or []
+                "result_ref": self.result_store.put(results),
+                "result_count": len(results)
             }
 
         # 5. 피드백 처리 노드
-        def handle_feedback(state: WorkflowState) -> WorkflowState:
+        def handle_feedback(state: WorkflowState) -> Dict[str, Any]:
             """피드백 처리 노드"""
             # 노드 실행 시간 측정 시작
-            node_operation_id = self.performance_monitor.start_operation("handle_feedback")
+            node_operation_id = self._monitor().start_operation("handle_feedback")
             
             if state.get("feedback_requested", False):
-                feedback_result = self.feedback_handler.save_feedback(state)
-                return {
+                feedback_result = self.feedback_handler.save_feedback({
                     **state,
+                    "query_results": self.result_store.get(state.get("result_ref"))
+                })
+                return {
                     "current_step": "complete",
                     "feedback_result": feedback_result
                 }
             # 노드 실행 시간 측정 종료
-            self.performance_monitor.end_operation(node_operation_id)
+            self._monitor().end_operation(node_operation_id)
             
             return {
-                **state,
                 "current_step": "complete",
                 "feedback_result": {"success": False, "message": "피드백이 요청되지 않았습니다."}
             }
 
+        # fused 1. 스키마 검색 노드 (의도 분석 전이므로 검색 결과 검증은 의도 검증 노드에서 수행)
+        def search_schema_fused(state: WorkflowState) -> Dict[str, Any]:
+            """스키마 검색 노드 (fused 구성)"""
+            try:
+                # 노드 실행 시간 측정 시작
+                node_operation_id = self._monitor().start_operation("search_schema")
+
+                search_results = self.opensearch_manager.integrated_search(
+                    query=state["query"],
+                    top_k=5
+                ) or {}
+
+                # 노드 실행 시간 측정 종료
+                self._monitor().end_operation(node_operation_id)
+
+                if not search_results or not search_results.get('database_schema'):
+                    return {
+                        "current_step": "complete",
+                        "search_results": search_results,
+                        "validation_results": {
+                            "is_valid": False,
+                            "feedback": "검색 결과가 없습니다.",
+                            "suggested_actions": ["rephrase_question"]
+                        },
+                        "sql": ""
+                    }
+
+                return {
+                    "current_step": "generate_sql_with_intent",
+                    "search_results": search_results
+                }
+
+            except Exception as e:
+                return {
+                    "current_step": "complete",
+                    "search_results": {},
+                    "validation_results": {
+                        "is_valid": False,
+                        "feedback": f"스키마 검색 중 오류가 발생했습니다: {str(e)}",
+                        "suggested_actions": ["retry_search"],
+                        "relevant_schemas": []
+                    }
+                }
+
+        # fused 2. 의도 분석 + SQL 생성 노드 (LLM 1회 호출)
+        def generate_sql_with_intent(state: WorkflowState) -> Dict[str, Any]:
+            """의도 분석과 SQL 생성을 한 번의 LLM 호출로 수행하는 노드"""
+            # 노드 실행 시간 측정 시작
+            node_operation_id = self._monitor().start_operation("generate_sql")
+
+            sql_response = self.sql_generator.generate_sql_with_intent(
+                question=state["query"],
+                database_schema=state["search_results"],
+                on_sql=lambda sql: self._emit({"type": "sql", "sql": sql, "node": "generate_sql_with_intent"})
+            )
+
+            # 노드 실행 시간 측정 종료
+            self._monitor().end_operation(node_operation_id)
+
+            if "error" in sql_response:
+                return {
+                    "current_step": "complete",
+                    "sql": "",
+                    "validation_results": {
+                        "is_valid": False,
+                        "feedback": sql_response["error"],
+                        "suggested_actions": ["retry_question"]
+                    }
+                }
+
+            return {
+                "current_step": "validate_intent",
+                "intent": sql_response["intent"],
+                "sql": sql_response.get("sql", ""),
+                "metadata": {
+                    "prompt_tokens": sql_response.get("prompt_report", {}),
+                    "context": self.sql_generator.get_context_metrics(),
+                    "llm_usage": sql_response.get("llm_usage", {})
+                }
+            }
+
+        # fused 3. 의도 및 검색 결과 검증 노드
+        def validate_intent(state: WorkflowState) -> Dict[str, Any]:
+            """생성된 의도로 질문과 검색 결과를 사후 검증하는 노드"""
+            # 노드 실행 시간 측정 시작
+            node_operation_id = self._monitor().start_operation("analyze_intent")
+
+            intent_validation = self.intent_analyzer.validate_intent(state["intent"])
+            if intent_validation["is_valid"]:
+                validation = self.search_validator.validate_search_results(
+                    state["search_results"],
+                    state["intent"]
+                )
+            else:
+                validation = intent_validation
+
+            # 노드 실행 시간 측정 종료
+            self._monitor().end_operation(node_operation_id)
+
+            if not validation["is_valid"]:
+                return {
+                    "current_step": "complete",
+                    "validation_results": validation,
+                    "sql": ""
+                }
+
+            return {
+                "current_step": "validate_sql",
+                "validation_results": validation,
+                "schema_validated": True
+            }
+
         # 6. 완료 노드
-        def complete(state: WorkflowState) -> WorkflowState:
+        def complete(state: WorkflowState) -> Dict[str, Any]:
             """완료 노드 - 최종 상태 정리 및 후처리"""
             try:
                 # 실행 시간 기록
                 end_time = datetime.now()
                 execution_time = (end_time - datetime.fromisoformat(state["metadata"]["start_time"])).total_seconds()
 
-                # 메타데이터 업데이트
+                # SQL 실행 결과를 얻기 전에 마감 시간을 넘긴 경우 시간 초과 상태로 종료
+                timed_out = bool(state.get("timed_out")) and not state.get("result_count")
+                validation_results = state.get("validation_results", {})
+                if timed_out:
+                    validation_results = {
+                        "is_valid": False,
+                        "feedback": "요청 처리 시간이 초과되었습니다. 잠시 후 다시 시도해 주세요.",
+                        "suggested_actions": ["retry_question"]
+                    }
+
+                # 각 노드별 실행 시간 가져오기
+                node_metrics = self._monitor().get_operation_metrics()
+
+                # 메타데이터 업데이트 (변경할 키만 반환하면 리듀서가 기존 메타데이터에 병합)
                 updated_metadata = {
-                    **state["metadata"],
+                    "topology": self.topology,
+                    "status": "timeout" if timed_out else "completed",
+                    "timed_out": timed_out,
                     "end_time": end_time.isoformat(),
                     "execution_time": execution_time,
                     "final_step": state["current_step"],
-                    "success": bool(state.get("sql") and state.get("query_results")),
-                }
-
-                # 성능 메트릭 추가
-                if "performance_metrics" not in updated_metadata:
-                    updated_metadata["performance_metrics"] = {}
-
-                # 각 노드별 실행 시간 가져오기
-                node_metrics = self.performance_monitor.get_operation_metrics()
-                
-                updated_metadata["performance_metrics"].update({
-                    "total_execution_time": execution_time,
-                    "has_results": bool(state.get("query_results")),
-                    "result_count": len(state.get("query_results", [])),
-                    "has_error": bool(state.get("validation_results", {}).get("is_valid") is False),
-                    "node_execution_times": {
-                        "analyze_intent": node_metrics.get("analyze_intent", 0),
-                        "search_schema": node_metrics.get("search_schema", 0),
-                        "generate_sql": node_metrics.get("generate_sql", 0),
-                        "validate_sql": node_metrics.get("validate_sql", 0),
-                        "execute_sql": node_metrics.get("execute_sql", 0),
-                        "handle_feedback": node_metrics.get("handle_feedback", 0)
+                    "success": bool(state.get("sql") and state.get("result_count")),
+                    # 성능 메트릭 추가
+                    "performance_metrics": {
+                        "total_execution_time": execution_time,
+                        "has_results": bool(state.get("result_count")),
+                        "result_count": state.get("result_count", 0),
+                        "has_error": bool(validation_results.get("is_valid") is False),
+                        "answer_cache": self.answer_cache.stats() if self.answer_cache is not None else {},
+                        "model_tiers": self.model_router.get_stats(),
+                        "node_execution_times": {
+                            "check_answer_cache": node_metrics.get("check_answer_cache", 0),
+                            "analyze_intent": node_metrics.get("analyze_intent", 0),
+                            "search_schema": node_metrics.get("search_schema", 0),
+                            "generate_sql": node_metrics.get("generate_sql", 0),
+                            "validate_sql": node_metrics.get("validate_sql", 0),
+                            "execute_sql": node_metrics.get("execute_sql", 0),
+                            "handle_feedback": node_metrics.get("handle_feedback", 0)
+                        }
                     }
-                })
+                }
 
-                # 최종 상태 반환
-                return {
-                    **state,
+                # 최종 상태 반환 (변경된 키만)
+                update = {
                     "current_step": "completed",  # 상태를 'completed'로 변경
-                    "metadata": updated_metadata,
-                    # 선택적으로 불필요한 중간 데이터 정리
-                    "messages": [msg for msg in state.get("messages", []) if isinstance(msg, (HumanMessage, AIMessage))],
-                    # 필요한 경우 에러 정보 포함
-                    "error": state.get("validation_results", {}).get("feedback") if not state["validation_results"].get("is_valid", True) else None
+                    "metadata": updated_metadata
                 }
+                if timed_out:
+                    update["validation_results"] = validation_results
+                return update
 
             except Exception as e:
                 # 에러가 발생하더라도 기본 상태는 반환
                 return {
-                    **state,
                     "current_step": "completed",
                     "metadata": {
-                        **state.get("metadata", {}),
                         "error": str(e),
                         "end_time": datetime.now().isoformat()
                     }
                 }
 
-        # 노드 등록 및 엣지 설정
-        workflow.add_node("analyze_intent", analyze_intent)
-        workflow.add_node("search_schema", search_schema)
-        workflow.add_node("generate_sql", generate_sql)
-        workflow.add_node("validate_sql", validate_sql)
-        workflow.add_node("execute_sql", execute_sql)
-        workflow.add_node("handle_feedback", handle_feedback)
-        workflow.add_node("complete", complete)
-
-        workflow.set_entry_point("analyze_intent")
-        workflow.add_edge("analyze_intent", "search_schema")
-        workflow.add_edge("search_schema", "generate_sql")
-        workflow.add_edge("generate_sql", "validate_sql")
-        workflow.add_edge("validate_sql", "execute_sql")
+        # 노드 등록 및 엣지 설정 (동기 invoke/비동기 ainvoke 겸용 노드)
+        def add_node(name: str, func: Callable[[WorkflowState], Dict[str, Any]]) -> None:
+            workflow.add_node(name, self._as_node(name, func))
+
+        add_node("check_answer_cache", check_answer_cache)
+        add_node("validate_sql", validate_sql)
+        add_node("execute_sql", execute_sql)
+        add_node("handle_feedback", handle_feedback)
+        add_node("complete", complete)
+
+        workflow.set_entry_point("check_answer_cache")
+        # 캐시 적중 시 의도 분석~SQL 검증 단계를 건너뛰고 바로 실행
+        def route_after_answer_cache(state: WorkflowState):
+            if state["current_step"] in ("execute_sql", "complete") or self.topology == "fused":
+                return state["current_step"]
+            # 의도 분석(LLM)과 스키마 검색(OpenSearch)을 동시에 시작
+            return ["analyze_intent", "search_schema"]
+
+        workflow.add_conditional_edges(
+            "check_answer_cache",
+            route_after_answer_cache,
+            ["execute_sql", "complete", first_step] if self.topology == "fused"
+            else ["execute_sql", "complete", "analyze_intent", "search_schema"]
+        )
+
+        if self.topology == "fused":
+            add_node("search_schema_fused", search_schema_fused)
+            add_node("generate_sql_with_intent", generate_sql_with_intent)
+            add_node("validate_intent", validate_intent)
+
+            # 검색/생성/검증 실패 시 이후 단계를 건너뛰고 완료
+            workflow.add_conditional_edges(
+                "search_schema_fused",
+                lambda state: state["current_step"],
+                {"generate_sql_with_intent": "generate_sql_with_intent", "complete": "complete"}
+            )
+            workflow.add_conditional_edges(
+                "generate_sql_with_intent",
+                lambda state: state["current_step"],
+                {"validate_intent": "validate_intent", "complete": "complete"}
+            )
+            workflow.add_conditional_edges(
+                "validate_intent",
+                lambda state: state["current_step"],
+                {"validate_sql": "validate_sql", "complete": "complete"}
+            )
+        else:
+            add_node("analyze_intent", analyze_intent)
+            add_node("search_schema", search_schema)
+            add_node("validate_search", validate_search)
+            add_node("generate_sql", generate_sql)
+
+            # 두 분기가 모두 끝나야 검색 결과 검증 시작
+            workflow.add_edge(["analyze_intent", "search_schema"], "validate_search")
+            workflow.add_conditional_edges(
+                "validate_search",
+                lambda state: state["current_step"],
+                {"generate_sql": "generate_sql", "complete": "complete"}
+            )
+            workflow.add_edge("generate_sql", "validate_sql")
+
+        # 검증에 실패한 SQL은 실행하지 않고 완료
+        workflow.add_conditional_edges(
+            "validate_sql",
+            lambda state: state["current_step"],
+            {"execute_sql": "execute_sql", "complete": "complete"}
+        )
         workflow.add_edge("execute_sql", "handle_feedback")
         workflow.add_edge("handle_feedback", "complete")
 
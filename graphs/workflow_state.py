@@ -1,5 +1,7 @@
-from typing import TypedDict, List, Union, Dict
-from langchain_core.messages import HumanMessage, AIMessage
+import operator
+from typing import Annotated, Optional, TypedDict, List, Dict
+from langchain_core.messages import AnyMessage
+from langgraph.graph.message import add_messages
 
 class ValidationResult(TypedDict):
     """SQL 검증 결과"""
@@ -7,9 +9,17 @@ class ValidationResult(TypedDict):
     errors: List[str]
     suggestions: List[str]
 
+def merge_metadata(current: Optional[Dict], update: Optional[Dict]) -> Dict:
+    """메타데이터 리듀서 - 노드는 변경할 키만 반환하고 기존 값에 병합"""
+    return {**(current or {}), **(update or {})}
+
 class WorkflowState(TypedDict):
-    """워크플로우 상태 관리"""
-    messages: List[Union[HumanMessage, AIMessage]]
+    """
+    워크플로우 상태 관리
+    노드는 변경한 키만 반환합니다. messages/metadata는 리듀서로 병합하고,
+    SQL 실행 결과 행은 ResultStore에 두고 참조 ID(result_ref)만 보관합니다.
+    """
+    messages: Annotated[List[AnyMessage], add_messages]
     current_step: str
     query: str
     intent: Dict
@@ -17,7 +27,10 @@ class WorkflowState(TypedDict):
     validation_results: Dict
     sql: str
     sql_validation: ValidationResult
-    query_results: List[Dict]
-    metadata: Dict
+    result_ref: Optional[str]  # ResultStore에 저장한 실행 결과 참조 ID
+    result_count: int  # 실행 결과 행 수
+    metadata: Annotated[Dict, merge_metadata]
     feedback_requested: bool
-    feedback_result: Dict
\ No newline at end of file
+    feedback_result: Dict
+    deadline: Optional[float]  # 요청 마감 시각 (time.time() 기준, 없으면 제한 없음)
+    timed_out: Annotated[bool, operator.or_]  # 마감 시간 초과 여부 (병렬 분기에서 동시에 기록 가능)
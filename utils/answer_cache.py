@@ -0,0 +1,216 @@
+# answer_cache.py
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from config import ANSWER_CACHE_CONFIG
+from utils.embedding_cache import normalize_text
+
+
+class SemanticAnswerCache:
+    def __init__(self, path: str, similarity_threshold: float = 0.92, max_entries: int = 10000):
+        """
+        검증된 질문→SQL 쌍을 질문 임베딩으로 찾는 시맨틱 캐시
+        같은 스키마 버전 안에서 코사인 유사도가 임계값 이상인 질문이 있으면 해당 SQL을 재사용합니다.
+
+        Args:
+            path (str): 캐시 파일 경로
+            similarity_threshold (float): 캐시 적중으로 판단할 최소 코사인 유사도
+            max_entries (int): 최대 저장 항목 수 (초과 시 가장 오래 사용되지 않은 항목부터 삭제)
+        """
+        self.path = path
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self.lookups = 0
+        self.hits = 0
+        self.latency_saved = 0.0
+        self._lock = threading.Lock()
+        self._indices: Dict[str, Dict] = {}  # 스키마 버전별 메모리 인덱스
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS answers (
+                schema_version TEXT NOT NULL,
+                question_key TEXT NOT NULL,
+                question TEXT NOT NULL,
+                sql TEXT NOT NULL,
+                embedding BLOB NOT NULL,
+                pipeline_seconds REAL NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (schema_version, question_key)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_answers_last_access ON answers (last_access)")
+        self._conn.commit()
+        self._size = self._conn.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+
+    @staticmethod
+    def _to_unit_vector(embedding: List[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _load_index(self, schema_version: str) -> Dict:
+        """스키마 버전별 임베딩 행렬을 메모리에 적재 (최초 조회 시 1회)"""
+        index = self._indices.get(schema_version)
+        if index is not None:
+            return index
+
+        rows = self._conn.execute(
+            "SELECT question_key, question, sql, embedding, pipeline_seconds FROM answers WHERE schema_version = ?",
+            (schema_version,)
+        ).fetchall()
+        vectors = [np.frombuffer(row[3], dtype=np.float32) for row in rows]
+        dimension = len(vectors[0]) if vectors else 0
+        index = {
+            "entries": [
+                {"question_key": row[0], "question": row[1], "sql": row[2], "pipeline_seconds": row[4]}
+                for row in rows
+            ],
+            "matrix": np.vstack(vectors) if vectors else np.empty((0, dimension), dtype=np.float32)
+        }
+        self._indices[schema_version] = index
+        return index
+
+    def lookup(self, embedding: Optional[List[float]], schema_version: Optional[str]) -> Optional[Dict]:
+        """
+        가장 유사한 캐시 질문 조회
+
+        Args:
+            embedding: 질문 임베딩
+            schema_version: 현재 스키마 버전
+
+        Returns:
+            Optional[Dict]: 적중 시 {'question', 'sql', 'similarity', 'latency_saved'}, 미적중 시 None
+        """
+        started_at = time.monotonic()
+        with self._lock:
+            self.lookups += 1
+            if not embedding or not schema_version:
+                return None
+
+            index = self._load_index(schema_version)
+            query_vector = self._to_unit_vector(embedding)
+            if not index["entries"] or index["matrix"].shape[1] != len(query_vector):
+                return None
+
+            similarities = index["matrix"] @ query_vector
+            best = int(np.argmax(similarities))
+            similarity = float(similarities[best])
+            if similarity < self.similarity_threshold:
+                return None
+
+            entry = index["entries"][best]
+            self._conn.execute(
+                "UPDATE answers SET last_access = ? WHERE schema_version = ? AND question_key = ?",
+                (time.time(), schema_version, entry["question_key"])
+            )
+            self._conn.commit()
+
+            latency_saved = max(0.0, entry["pipeline_seconds"] - (time.monotonic() - started_at))
+            self.hits += 1
+            self.latency_saved += latency_saved
+
+        return {
+            "question": entry["question"],
+            "sql": entry["sql"],
+            "similarity": similarity,
+            "latency_saved": latency_saved
+        }
+
+    def store(self, question: str, sql: str, embedding: Optional[List[float]],
+              schema_version: Optional[str], pipeline_seconds: float) -> None:
+        """
+        검증 및 실행에 성공한 질문→SQL 쌍 저장
+
+        Args:
+            question (str): 사용자 질문
+            sql (str): 검증된 SQL
+            embedding: 질문 임베딩
+            schema_version: SQL 생성에 사용된 스키마 버전
+            pipeline_seconds (float): 캐시 적중 시 생략되는 단계(의도 분석~SQL 검증)의 소요 시간
+        """
+        if not embedding or not sql or not schema_version:
+            return
+
+        vector = self._to_unit_vector(embedding)
+        question_key = normalize_text(question).lower()
+        with self._lock:
+            exists = self._conn.execute(
+                "SELECT 1 FROM answers WHERE schema_version = ? AND question_key = ?",
+                (schema_version, question_key)
+            ).fetchone()
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO answers
+                    (schema_version, question_key, question, sql, embedding, pipeline_seconds, last_access)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (schema_version, question_key, question, sql, vector.tobytes(), pipeline_seconds, time.time())
+            )
+            if not exists:
+                self._size += 1
+
+            overflow = self._size - self.max_entries
+            if overflow > 0:
+                self._conn.execute("""
+                    DELETE FROM answers WHERE rowid IN (
+                        SELECT rowid FROM answers ORDER BY last_access ASC LIMIT ?
+                    )
+                """, (overflow,))
+                self._size -= overflow
+                self._indices.clear()
+            else:
+                # 해당 버전의 메모리 인덱스는 다음 조회 시 다시 적재
+                self._indices.pop(schema_version, None)
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """캐시 전체 삭제"""
+        with self._lock:
+            self._conn.execute("DELETE FROM answers")
+            self._conn.commit()
+            self._indices.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, float]:
+        """캐시 적중률 및 절약된 지연 시간 통계 반환"""
+        return {
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "hit_rate": self.hits / self.lookups if self.lookups else 0.0,
+            "latency_saved_total": self.latency_saved,
+            "latency_saved_avg": self.latency_saved / self.hits if self.hits else 0.0,
+            "size": self._size
+        }
+
+
+_shared_answer_cache: Optional[SemanticAnswerCache] = None
+_shared_answer_cache_lock = threading.Lock()
+
+
+def get_answer_cache() -> Optional[SemanticAnswerCache]:
+    """설정에 따른 프로세스 공용 시맨틱 답변 캐시 반환 (비활성화 시 None)"""
+    global _shared_answer_cache
+
+    if not ANSWER_CACHE_CONFIG['enabled']:
+        return None
+
+    with _shared_answer_cache_lock:
+        if _shared_answer_cache is None:
+            _shared_answer_cache = SemanticAnswerCache(
+                path=ANSWER_CACHE_CONFIG['path'],
+                similarity_threshold=ANSWER_CACHE_CONFIG['similarity_threshold'],
+                max_entries=ANSWER_CACHE_CONFIG['max_entries']
+            )
+        return _shared_answer_cache
@@ -2,7 +2,6 @@ import copy
 import os
 from random import sample
 
-import boto3
 import json
 import time
 import yaml
@@ -10,6 +9,9 @@ from typing import Dict, List, Optional
 from pathlib import Path
 import streamlit as st
 from config import AWS_REGION, BEDROCK_MODELS
+from utils.aws_clients import get_bedrock_runtime_client
+from utils.llm_cache import invoke_model_cached
+from utils.rate_limiter import PRIORITY_AUGMENTATION
 from langchain_aws import BedrockLLM
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
@@ -19,7 +21,7 @@ class SchemaAugmenter:
     def __init__(self, max_retries: int = 3, base_delay: int = 2):
         self.max_retries = max_retries
         self.base_delay = base_delay
-        self.client = boto3.client('bedrock-runtime', region_name=AWS_REGION)
+        self.client = get_bedrock_runtime_client(AWS_REGION)
         self.model_id = BEDROCK_MODELS['cross_claude']
         self.prompts = self._load_prompts()
 
@@ -93,14 +95,14 @@ class SchemaAugmenter:
                     "anthropic_version": "bedrock-2023-05-31"
                 }
 
-                # Bedrock 호출
-                response = self.client.invoke_model(
-                    modelId=self.model_id,
-                    body=bytes(json.dumps(request), 'utf-8')
+                # Bedrock 호출 (응답 캐시 및 공용 제한기 경유, 대화형 요청보다 낮은 우선순위)
+                response_body = invoke_model_cached(
+                    self.client,
+                    self.model_id,
+                    request,
+                    call_type='schema_augmentation',
+                    priority=PRIORITY_AUGMENTATION
                 )
-
-                # 응답 처리
-                response_body = json.loads(response['body'].read().decode('utf-8'))
                 
                 # content 필드에서 text 추출
                 if 'content' in response_body:
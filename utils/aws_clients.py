@@ -0,0 +1,39 @@
+# aws_clients.py
+
+import threading
+from typing import Dict
+
+import boto3
+from botocore.config import Config
+
+from config import AWS_REGION, BEDROCK_CLIENT_CONFIG
+
+_bedrock_runtime_clients: Dict[str, object] = {}
+_clients_lock = threading.Lock()
+
+
+def get_bedrock_runtime_client(region_name: str = AWS_REGION):
+    """
+    리전별로 하나만 생성되는 프로세스 공용 bedrock-runtime 클라이언트 반환
+    (boto3 클라이언트는 스레드 안전하므로 세션/스레드 간 공유 가능)
+
+    Args:
+        region_name (str): AWS 리전 이름
+    """
+    with _clients_lock:
+        if region_name not in _bedrock_runtime_clients:
+            client_config = Config(
+                region_name=region_name,
+                max_pool_connections=BEDROCK_CLIENT_CONFIG['max_pool_connections'],
+                tcp_keepalive=BEDROCK_CLIENT_CONFIG['tcp_keepalive'],
+                connect_timeout=BEDROCK_CLIENT_CONFIG['connect_timeout'],
+                read_timeout=BEDROCK_CLIENT_CONFIG['read_timeout'],
+                retries={
+                    'mode': BEDROCK_CLIENT_CONFIG['retry_mode'],
+                    'max_attempts': BEDROCK_CLIENT_CONFIG['max_attempts']
+                }
+            )
+            # 기본 세션은 스레드 안전하지 않으므로 전용 세션에서 생성
+            session = boto3.session.Session()
+            _bedrock_runtime_clients[region_name] = session.client('bedrock-runtime', config=client_config)
+        return _bedrock_runtime_clients[region_name]
@@ -1,14 +1,26 @@
 # bedrock_embeddings.py
 
-import boto3
 import json
-from typing import List
+import random
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, List, Optional
 from langchain.embeddings.base import Embeddings
 
 import time
 
+from config import EMBEDDING_CONFIG
+from utils.aws_clients import get_bedrock_runtime_client
+from utils.deadline import check_deadline, ensure_retry_fits
+from utils.embedding_cache import EmbeddingCache, get_embedding_cache, make_cache_key, normalize_text
+from utils.embedding_profile import get_embedding_profile
+from utils.rate_limiter import PRIORITY_AUGMENTATION, PRIORITY_INTERACTIVE, bedrock_call
+
+# 임베딩 캐시 미지정 시 프로세스 공용 캐시 사용을 나타내는 표시값
+_DEFAULT_CACHE = object()
+
 class BedrockEmbeddings(Embeddings):
-    def __init__(self, model_id: str, region_name: str, client=None):
+    def __init__(self, model_id: str, region_name: str, client=None, profile: Optional[dict] = None,
+                 cache: Optional[EmbeddingCache] = _DEFAULT_CACHE):
         """
         Bedrock 임베딩 생성을 위한 Embeddings 클래스
 
@@ -16,29 +28,60 @@ class BedrockEmbeddings(Embeddings):
             model_id (str): Bedrock 임베딩 모델 ID
             region_name (str): AWS 리전 이름
             client: 기존 Bedrock 클라이언트 (선택사항)
+            profile (dict): 임베딩 프로필 {'dimension', 'normalize'} (미지정 시 설정값 사용)
+            cache (EmbeddingCache): 임베딩 캐시 (미지정 시 공용 디스크 캐시, None이면 캐시 미사용)
         """
         self.model_id = model_id
-        self.client = client or boto3.client('bedrock-runtime', region_name=region_name)
+        self.client = client or get_bedrock_runtime_client(region_name)
+        profile = profile or get_embedding_profile()
+        self.dimension = profile['dimension']
+        self.normalize = profile['normalize']
+        self.cache = get_embedding_cache() if cache is _DEFAULT_CACHE else cache
         self.max_retries = 3
         self.base_delay = 1
+        self.max_workers = EMBEDDING_CONFIG['max_workers']
+        self.progress_batch_size = EMBEDDING_CONFIG['progress_batch_size']
 
     def embed_query(self, text: str) -> List[float]:
         """단일 텍스트에 대한 임베딩 생성"""
         if not text.strip():
             return []
-        
+
+        cache_key = None
+        if self.cache is not None:
+            cache_key = make_cache_key(self.model_id, self.dimension, text, self.normalize)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        return self._embed_and_store(text, cache_key, PRIORITY_INTERACTIVE)
+
+    def _embed_and_store(self, text: str, cache_key: Optional[str], priority: int) -> List[float]:
+        """캐시 미스 텍스트의 임베딩을 생성하여 캐시에 저장"""
+        embedding = self._invoke_embedding(normalize_text(text), priority)
+
+        if embedding and cache_key is not None:
+            self.cache.put(cache_key, embedding)
+        return embedding
+
+    def _invoke_embedding(self, text: str, priority: int = PRIORITY_INTERACTIVE) -> List[float]:
+        """Bedrock 임베딩 모델 호출 (공용 제한기 및 재시도 포함)"""
         for attempt in range(self.max_retries):
+            check_deadline("임베딩 모델 호출")
             try:
                 request_body = {
-                    "inputText": text.strip()
+                    "inputText": text,
+                    "dimensions": self.dimension,
+                    "normalize": self.normalize
                 }
 
-                response = self.client.invoke_model(
-                    modelId=self.model_id,
-                    contentType="application/json",
-                    accept="application/json",
-                    body=json.dumps(request_body)
-                )
+                with bedrock_call(self.model_id, priority):
+                    response = self.client.invoke_model(
+                        modelId=self.model_id,
+                        contentType="application/json",
+                        accept="application/json",
+                        body=json.dumps(request_body)
+                    )
 
                 response_body = json.loads(response.get('body').read())
 
@@ -57,8 +100,61 @@ class BedrockEmbeddings(Embeddings):
                     print(f"Response: {e.response}")
                 if attempt == self.max_retries - 1:
                     raise
-                time.sleep(self.base_delay * (2 ** attempt))  # 지수 백오프
+                wait_time = random.uniform(0, self.base_delay * (2 ** attempt))
+                # 요청 마감 시간 안에 끝날 수 없는 재시도는 건너뜀
+                ensure_retry_fits(wait_time, "임베딩 모델 호출")
+                time.sleep(wait_time)  # 지터 적용 지수 백오프
+
+    def embed_documents(self, texts: List[str],
+                        progress_callback: Optional[Callable[[int, int], None]] = None) -> List[List[float]]:
+        """
+        다수 문서에 대한 임베딩 생성 (캐시 적중 항목은 재사용, 나머지는 병렬 생성)
+
+        Args:
+            texts (List[str]): 임베딩할 텍스트 목록
+            progress_callback: 진행 상황 콜백 (완료 건수, 전체 건수) - progress_batch_size 단위로 호출
+
+        Returns:
+            List[List[float]]: 입력 순서와 동일한 순서의 임베딩 목록
+        """
+        total = len(texts)
+        embeddings: List[Optional[List[float]]] = [None] * total
+        pending = []
+
+        for idx, text in enumerate(texts):
+            if not text.strip():
+                embeddings[idx] = []
+                continue
+
+            cache_key = None
+            if self.cache is not None:
+                cache_key = make_cache_key(self.model_id, self.dimension, text, self.normalize)
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    embeddings[idx] = cached
+                    continue
+            pending.append((idx, cache_key))
+
+        done = total - len(pending)
+        if progress_callback and done:
+            progress_callback(done, total)
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pending))) as executor:
+                futures = {
+                    executor.submit(self._embed_and_store, texts[idx], cache_key, PRIORITY_AUGMENTATION): idx
+                    for idx, cache_key in pending
+                }
+                for future in as_completed(futures):
+                    embeddings[futures[future]] = future.result()
+                    done += 1
+                    if progress_callback and (done % self.progress_batch_size == 0 or done == total):
+                        progress_callback(done, total)
+
+        return embeddings
 
-    def embed_documents(self, texts: List[str]) -> List[List[float]]:
-        """다수 문서에 대한 임베딩 생성"""
-        return [self.embed_query(t) for t in texts]
+    def get_cache_stats(self) -> dict:
+        """임베딩 캐시 적중/실패 통계 반환"""
+        if self.cache is None:
+            return {}
+        return self.cache.stats()
@@ -0,0 +1,107 @@
+# conversation_context.py
+
+from typing import Dict, List
+
+from utils.token_counter import estimate_message_tokens
+
+
+class ContextBudgetExceeded(ValueError):
+    """대화 기록을 모두 정리해도 토큰 예산을 넘는 경우"""
+
+
+class ConversationContext:
+    def __init__(self, max_tokens: int, preserved_messages: int = 2):
+        """
+        메시지별 토큰 수를 증분 관리하는 대화 컨텍스트
+
+        Args:
+            max_tokens (int): 요청 전체(대화 기록 + 새 메시지)의 최대 토큰 수
+            preserved_messages (int): 정리 대상에서 제외할 앞쪽 메시지 수 (시스템 지시사항 user/assistant 쌍)
+        """
+        self.max_tokens = max_tokens
+        self.preserved_messages = preserved_messages
+        self.messages: List[Dict] = []
+        self._token_counts: List[int] = []
+        self.total_tokens = 0
+        self.trimmed_messages = 0
+
+    def __len__(self) -> int:
+        return len(self.messages)
+
+    def append(self, message: Dict) -> None:
+        """메시지 추가 (토큰 수는 추가 시 한 번만 계산)"""
+        tokens = estimate_message_tokens(message)
+        self.messages.append(message)
+        self._token_counts.append(tokens)
+        self.total_tokens += tokens
+
+    def clear(self) -> None:
+        """대화 기록 전체 삭제"""
+        self.messages = []
+        self._token_counts = []
+        self.total_tokens = 0
+
+    def enforce_budget(self, reserved_tokens: int = 0, max_tokens: int = None) -> int:
+        """
+        대화 기록 + 예약 토큰이 예산 안에 들도록 오래된 대화 쌍부터 정리
+
+        Args:
+            reserved_tokens (int): 이번 요청에 추가될 메시지의 토큰 수
+            max_tokens (int): 이번 정리에만 적용할 예산 (미지정 시 max_tokens)
+
+        Returns:
+            int: 삭제된 메시지 수
+        """
+        budget = self.max_tokens if max_tokens is None else max_tokens
+        overflow = self.total_tokens + reserved_tokens - budget
+        if overflow <= 0:
+            return 0
+
+        # user/assistant 쌍 단위로 삭제할 범위를 한 번에 계산한 뒤 일괄 삭제
+        start = self.preserved_messages
+        end = start
+        removed_tokens = 0
+        while overflow > removed_tokens and end + 2 <= len(self.messages):
+            removed_tokens += self._token_counts[end] + self._token_counts[end + 1]
+            end += 2
+
+        if end > start:
+            del self.messages[start:end]
+            del self._token_counts[start:end]
+            self.total_tokens -= removed_tokens
+            self.trimmed_messages += end - start
+
+        if self.total_tokens + reserved_tokens > budget:
+            raise ContextBudgetExceeded(
+                f"대화 컨텍스트가 토큰 예산을 초과합니다: {self.total_tokens + reserved_tokens} > {budget}"
+            )
+        return end - start
+
+    def retain_recent(self, count: int) -> int:
+        """
+        최근 count개 메시지만 남기고 나머지 삭제
+
+        Args:
+            count (int): 유지할 메시지 수
+
+        Returns:
+            int: 삭제된 메시지 수
+        """
+        excess = len(self.messages) - max(0, count)
+        if excess <= 0:
+            return 0
+
+        self.total_tokens -= sum(self._token_counts[:excess])
+        del self.messages[:excess]
+        del self._token_counts[:excess]
+        self.trimmed_messages += excess
+        return excess
+
+    def get_metrics(self) -> Dict[str, int]:
+        """현재 컨텍스트 크기 지표 반환"""
+        return {
+            "context_tokens": self.total_tokens,
+            "max_context_tokens": self.max_tokens,
+            "messages": len(self.messages),
+            "trimmed_messages": self.trimmed_messages
+        }
@@ -0,0 +1,120 @@
+# deadline.py
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from config import WORKFLOW_CONFIG
+
+
+class DeadlineExceeded(TimeoutError):
+    """요청 마감 시간 안에 처리할 수 없는 경우"""
+
+
+class RequestDeadline:
+    def __init__(self, deadline: Optional[float]):
+        """
+        요청 단위 마감 시간 (에포크 초, None이면 제한 없음)
+        외부 호출은 남은 시간을 타임아웃으로 사용하고, 마감 전에 끝날 수 없는 재시도는 건너뜁니다.
+
+        Args:
+            deadline (float): 마감 시각 (time.time() 기준)
+        """
+        self.deadline = deadline
+        # 하위 호출에서 예외를 처리하더라도 마감 초과 여부를 노드 단위로 알 수 있도록 기록
+        self.exceeded = False
+
+    def remaining(self) -> Optional[float]:
+        """남은 시간 (초, 제한 없으면 None)"""
+        if self.deadline is None:
+            return None
+        return self.deadline - time.time()
+
+    def check(self, operation: str = "") -> None:
+        """마감 시간이 지났으면 DeadlineExceeded 발생"""
+        remaining = self.remaining()
+        if remaining is not None and remaining <= 0:
+            self._raise(f"{operation} 시작 전 요청 마감 시간이 지났습니다." if operation
+                        else "요청 마감 시간이 지났습니다.")
+
+    def ensure_retry_fits(self, wait_seconds: float, operation: str = "") -> None:
+        """대기 후 재시도할 시간이 남아 있지 않으면 DeadlineExceeded 발생"""
+        remaining = self.remaining()
+        if remaining is not None and remaining < wait_seconds + WORKFLOW_CONFIG['min_call_seconds']:
+            self._raise(f"{operation} 재시도 대기({wait_seconds:.1f}초)가 남은 시간({max(remaining, 0):.1f}초)을 넘어 "
+                        f"재시도를 건너뜁니다.")
+
+    def timeout(self, default: float) -> float:
+        """외부 호출에 사용할 타임아웃 (기본값과 남은 시간 중 작은 값)"""
+        remaining = self.remaining()
+        if remaining is None:
+            return default
+        if remaining <= 0:
+            self._raise("요청 마감 시간이 지났습니다.")
+        return min(default, remaining)
+
+    def _raise(self, message: str) -> None:
+        self.exceeded = True
+        raise DeadlineExceeded(message)
+
+
+_current_deadline: ContextVar[Optional[RequestDeadline]] = ContextVar('request_deadline', default=None)
+
+
+def make_deadline(timeout_seconds: Optional[float] = None) -> Optional[float]:
+    """지금부터 timeout_seconds 뒤의 마감 시각 (0 이하이면 제한 없음)"""
+    timeout_seconds = WORKFLOW_CONFIG['request_timeout'] if timeout_seconds is None else timeout_seconds
+    if timeout_seconds <= 0:
+        return None
+    return time.time() + timeout_seconds
+
+
+@contextmanager
+def deadline_scope(deadline: Optional[float]) -> Iterator[RequestDeadline]:
+    """현재 컨텍스트(스레드/코루틴)에 요청 마감 시간 적용"""
+    scope = RequestDeadline(deadline)
+    token = _current_deadline.set(scope)
+    try:
+        yield scope
+    finally:
+        _current_deadline.reset(token)
+
+
+def current_deadline() -> Optional[RequestDeadline]:
+    """현재 컨텍스트의 요청 마감 시간 (없으면 None)"""
+    return _current_deadline.get()
+
+
+def remaining_time() -> Optional[float]:
+    """현재 요청의 남은 시간 (초, 제한 없으면 None)"""
+    scope = _current_deadline.get()
+    return scope.remaining() if scope is not None else None
+
+
+def check_deadline(operation: str = "") -> None:
+    """현재 요청의 마감 시간이 지났으면 DeadlineExceeded 발생"""
+    scope = _current_deadline.get()
+    if scope is not None:
+        scope.check(operation)
+
+
+def raise_deadline_exceeded(message: str) -> None:
+    """현재 요청의 마감 시간 초과로 DeadlineExceeded 발생 (노드 단위 초과 여부도 기록)"""
+    scope = _current_deadline.get()
+    if scope is not None:
+        scope._raise(message)
+    raise DeadlineExceeded(message)
+
+
+def ensure_retry_fits(wait_seconds: float, operation: str = "") -> None:
+    """현재 요청의 남은 시간 안에 재시도할 수 없으면 DeadlineExceeded 발생"""
+    scope = _current_deadline.get()
+    if scope is not None:
+        scope.ensure_retry_fits(wait_seconds, operation)
+
+
+def timeout_for(default: float) -> float:
+    """현재 요청의 남은 시간을 반영한 외부 호출 타임아웃"""
+    scope = _current_deadline.get()
+    return scope.timeout(default) if scope is not None else default
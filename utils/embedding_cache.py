@@ -0,0 +1,164 @@
+# embedding_cache.py
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from abc import ABC, abstractmethod
+from array import array
+from typing import Dict, List, Optional
+
+from config import EMBEDDING_CACHE_CONFIG
+
+
+def normalize_text(text: str) -> str:
+    """임베딩 캐시 키 생성을 위한 텍스트 정규화 (유니코드 NFC + 공백 정리)"""
+    return " ".join(unicodedata.normalize('NFC', text).split())
+
+
+def make_cache_key(model_id: str, dimension: int, text: str, normalize: bool = True) -> str:
+    """(model_id, dimension, 정규화 여부, 정규화 텍스트 해시) 기반 캐시 키 생성"""
+    text_hash = hashlib.sha256(normalize_text(text).encode('utf-8')).hexdigest()
+    return f"{model_id}:{dimension}:{'norm' if normalize else 'raw'}:{text_hash}"
+
+
+class EmbeddingCache(ABC):
+    """임베딩 캐시 인터페이스"""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[List[float]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def put(self, key: str, embedding: List[float]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def stats(self) -> Dict[str, float]:
+        raise NotImplementedError
+
+
+class SQLiteEmbeddingCache(EmbeddingCache):
+    def __init__(self, path: str, max_entries: int = 100000):
+        """
+        SQLite 기반 디스크 임베딩 캐시 (크기 제한 LRU)
+
+        Args:
+            path (str): 캐시 파일 경로
+            max_entries (int): 최대 저장 항목 수 (초과 시 가장 오래 사용되지 않은 항목부터 삭제)
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                cache_key TEXT PRIMARY KEY,
+                vector BLOB NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON embeddings (last_access)")
+        self._conn.commit()
+        self._size = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def get(self, key: str) -> Optional[List[float]]:
+        """캐시 조회 (조회 시 접근 시간 갱신)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT vector FROM embeddings WHERE cache_key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE embeddings SET last_access = ? WHERE cache_key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+            self.hits += 1
+
+        vector = array('d')
+        vector.frombytes(row[0])
+        return vector.tolist()
+
+    def put(self, key: str, embedding: List[float]) -> None:
+        """캐시 저장 후 최대 크기 초과 시 LRU 삭제"""
+        if not embedding:
+            return
+
+        blob = array('d', embedding).tobytes()
+        with self._lock:
+            exists = self._conn.execute(
+                "SELECT 1 FROM embeddings WHERE cache_key = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO embeddings (cache_key, vector, last_access) VALUES (?, ?, ?)",
+                (key, blob, time.time())
+            )
+            if not exists:
+                self._size += 1
+
+            overflow = self._size - self.max_entries
+            if overflow > 0:
+                self._conn.execute("""
+                    DELETE FROM embeddings WHERE cache_key IN (
+                        SELECT cache_key FROM embeddings ORDER BY last_access ASC LIMIT ?
+                    )
+                """, (overflow,))
+                self._size -= overflow
+                self.evictions += overflow
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """캐시 전체 삭제"""
+        with self._lock:
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.commit()
+            self._size = 0
+
+    def stats(self) -> Dict[str, float]:
+        """캐시 적중/실패 통계 반환"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "evictions": self.evictions,
+            "size": self._size,
+            "max_entries": self.max_entries
+        }
+
+
+_shared_caches: Dict[str, EmbeddingCache] = {}
+_shared_caches_lock = threading.Lock()
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """설정에 따른 프로세스 공용 임베딩 캐시 반환 (비활성화 시 None)"""
+    if not EMBEDDING_CACHE_CONFIG['enabled']:
+        return None
+
+    path = EMBEDDING_CACHE_CONFIG['path']
+    with _shared_caches_lock:
+        if path not in _shared_caches:
+            _shared_caches[path] = SQLiteEmbeddingCache(
+                path=path,
+                max_entries=EMBEDDING_CACHE_CONFIG['max_entries']
+            )
+        return _shared_caches[path]
@@ -0,0 +1,49 @@
+# embedding_profile.py
+
+import copy
+from typing import Dict, Optional
+
+from config import EMBEDDING_PROFILE
+
+# Titan Text Embeddings v2가 지원하는 출력 차원
+SUPPORTED_DIMENSIONS = (256, 512, 1024)
+
+
+def get_embedding_profile() -> Dict:
+    """설정된 임베딩 프로필(차원, 정규화 여부) 반환"""
+    dimension = EMBEDDING_PROFILE['dimension']
+    if dimension not in SUPPORTED_DIMENSIONS:
+        raise ValueError(f"지원하지 않는 임베딩 차원입니다: {dimension} (지원: {SUPPORTED_DIMENSIONS})")
+    return dict(EMBEDDING_PROFILE)
+
+
+def apply_embedding_profile(mapping: Dict, profile: Optional[Dict] = None) -> Dict:
+    """
+    인덱스 매핑의 모든 knn_vector 필드 차원을 임베딩 프로필에 맞게 변경한 사본을 반환합니다.
+
+    Args:
+        mapping: 인덱스 매핑 설정
+        profile: 임베딩 프로필 (미지정 시 설정값 사용)
+    """
+    profile = profile or get_embedding_profile()
+    mapping = copy.deepcopy(mapping)
+
+    def _apply(node):
+        if isinstance(node, dict):
+            if node.get('type') == 'knn_vector':
+                node['dimension'] = profile['dimension']
+            for value in node.values():
+                _apply(value)
+        elif isinstance(node, list):
+            for value in node:
+                _apply(value)
+
+    _apply(mapping)
+    return mapping
+
+
+def get_mapping_dimension(mapping: Dict) -> Optional[int]:
+    """인덱스 매핑에서 최상위 embedding 필드의 차원 반환 (없으면 None)"""
+    properties = mapping.get('mappings', mapping).get('properties', {})
+    embedding = properties.get('embedding', {})
+    return embedding.get('dimension')
@@ -0,0 +1,102 @@
+# hybrid_pipeline.py
+
+from typing import Dict, List
+
+
+# 인덱스별 시맨틱 검색 가중치 (클라이언트 정규화 경로의 기본값과 동일)
+SEMANTIC_WEIGHTS = {
+    'database_schema': 0.4,
+    'sample_queries': 0.6,
+    'user_feedback_queries': 0.7
+}
+
+
+def hybrid_pipeline_name(semantic_weight: float) -> str:
+    """시맨틱 가중치별 검색 파이프라인 이름"""
+    return f"text2sql-hybrid-{int(round(semantic_weight * 100))}"
+
+
+def hybrid_pipeline_body(semantic_weight: float) -> Dict:
+    """
+    lexical/kNN 점수를 클러스터에서 min-max 정규화 후 가중 평균하는 검색 파이프라인 정의
+    hybrid 쿼리의 하위 쿼리 순서는 [lexical, semantic]이어야 합니다.
+    """
+    return {
+        "description": f"Text-to-SQL hybrid search (semantic weight {semantic_weight})",
+        "phase_results_processors": [
+            {
+                "normalization-processor": {
+                    "normalization": {"technique": "min_max"},
+                    "combination": {
+                        "technique": "arithmetic_mean",
+                        "parameters": {"weights": [round(1 - semantic_weight, 4), semantic_weight]}
+                    }
+                }
+            }
+        ]
+    }
+
+
+def hybrid_query_body(lexical_body: Dict, semantic_body: Dict, size: int) -> Dict:
+    """lexical/kNN 검색 본문을 하나의 hybrid 쿼리로 결합 (응답 필드는 lexical 본문 기준)"""
+    body = {
+        "size": size,
+        "query": {
+            "hybrid": {
+                "queries": [lexical_body["query"], semantic_body["query"]]
+            }
+        }
+    }
+    if "_source" in lexical_body:
+        body["_source"] = lexical_body["_source"]
+    return body
+
+
+def _inner_hits_names(query) -> List[str]:
+    """쿼리 안의 nested inner_hits 이름 목록 (이름이 없으면 OpenSearch와 같이 nested path를 사용)"""
+    names = []
+    if isinstance(query, dict):
+        nested = query.get("nested")
+        if isinstance(nested, dict) and "inner_hits" in nested:
+            names.append(nested["inner_hits"].get("name", nested["path"]))
+        for value in query.values():
+            names.extend(_inner_hits_names(value))
+    elif isinstance(query, list):
+        for value in query:
+            names.extend(_inner_hits_names(value))
+    return names
+
+
+def validate_hybrid_query(body: Dict) -> None:
+    """hybrid 쿼리의 inner_hits 이름 중복 확인 (중복 시 클러스터가 요청 전체를 거부)"""
+    names = _inner_hits_names(body["query"])
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"hybrid 쿼리의 inner_hits 이름이 중복됩니다: {', '.join(duplicates)}")
+
+
+def finalize_hybrid_tables(tables: List[Dict]) -> List[Dict]:
+    """
+    hybrid 검색 테이블 결과를 클라이언트 정규화 경로와 같은 형식으로 변환
+    테이블 점수는 파이프라인이 결합한 점수를 그대로 쓰고, 관련 컬럼은 테이블 안에서 중복 제거 후 점수순 정렬합니다.
+    """
+    results = []
+    for table in tables:
+        columns = {}
+        for column in table['related_columns']:
+            if column['name'] not in columns or column['score'] > columns[column['name']]['hybrid_score']:
+                columns[column['name']] = {
+                    "name": column['name'],
+                    "type": column['type'],
+                    "description": column['description'],
+                    "hybrid_score": column['score'],
+                    "search_methods": [column['search_method']]
+                }
+        results.append({
+            "table_name": table['table_name'],
+            "description": table['description'],
+            "related_columns": sorted(columns.values(), key=lambda x: x['hybrid_score'], reverse=True),
+            "hybrid_score": table['score'],
+            "search_methods": [table['search_method']]
+        })
+    return results
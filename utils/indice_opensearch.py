@@ -1,20 +1,57 @@
 import boto3
-from opensearchpy import OpenSearch
+from opensearchpy import OpenSearch, helpers
+from opensearchpy.exceptions import RequestError
 import json
-from typing import Dict, List, Optional
+import threading
+from typing import Dict, List, Optional, Tuple
 import streamlit as st
 import time
 from datetime import datetime
 import os
-from config import AWS_REGION, OPENSEARCH_CONFIG, BEDROCK_MODELS
+from config import AWS_REGION, OPENSEARCH_CONFIG, BEDROCK_MODELS, ANSWER_CACHE_CONFIG, RETRIEVAL_CONFIG
 from utils.augmentation import SchemaAugmenter
 from utils.bedrock_embeddings import BedrockEmbeddings
+from utils.embedding_cache import normalize_text
+from utils.embedding_profile import apply_embedding_profile, get_embedding_profile, get_mapping_dimension
+from utils.deadline import ensure_retry_fits, timeout_for
+from utils.hybrid_pipeline import (
+    SEMANTIC_WEIGHTS,
+    finalize_hybrid_tables,
+    hybrid_pipeline_body,
+    hybrid_pipeline_name,
+    hybrid_query_body,
+    validate_hybrid_query
+)
+from utils.retrieval_backend import (
+    LEXICAL_COLUMN_INNER_HITS,
+    SAMPLE_QUERY_SEARCH_FIELDS,
+    SAMPLE_QUERY_TERM_SEARCH_FIELDS,
+    SCHEMA_COLUMN_SEARCH_FIELDS,
+    SCHEMA_TABLE_SEARCH_FIELDS,
+    SEMANTIC_COLUMN_INNER_HITS,
+    TIE_BREAKER,
+    USER_FEEDBACK_SEARCH_FIELDS,
+    create_retrieval_backend
+)
+from utils.schema_catalog import get_schema_catalog
+from utils.search_context import CancelToken, SearchCancelled, SearchContext, SingleFlight
+from utils.search_payload import (
+    PayloadMeter,
+    PayloadStats,
+    SAMPLE_QUERY_FIELDS,
+    SCHEMA_COLUMN_FIELDS,
+    SCHEMA_TABLE_FIELDS,
+    USER_FEEDBACK_QUERY_FIELDS
+)
 from utils.opensearch_indexers import (
     index_schema,
     index_sample_queries,
     index_user_feedback_queries
 )
 
+# 동일 질문에 대한 동시 임베딩 요청을 하나로 합치기 위한 프로세스 공용 single-flight
+_embedding_flight = SingleFlight()
+
 class OpenSearchManager:
     def __init__(self):
         """Initialize OpenSearch manager with required clients"""
@@ -28,21 +65,42 @@ class OpenSearchManager:
             use_ssl=True,
             verify_certs=True
         )
+        # 검색 응답 크기/디코딩 시간 측정
+        self.payload_meter = PayloadMeter(self.client.transport.deserializer)
+        self.client.transport.deserializer = self.payload_meter
+        self.payload_stats = PayloadStats()
+        # 응답 처리에 필요한 _source 필드만 요청 (임베딩 벡터 제외)
+        self.source_filtering = OPENSEARCH_CONFIG['source_filtering']
+        # msearch: 통합 검색을 한 번의 _msearch 요청으로 실행, parallel: 검색별 요청을 스레드로 병렬 실행
+        self.search_mode = OPENSEARCH_CONFIG['search_mode']
+        # client: lexical/kNN 점수를 Python에서 정규화/결합, pipeline: 검색 파이프라인과 hybrid 쿼리로 클러스터에서 결합
+        self.hybrid_search = OPENSEARCH_CONFIG['hybrid_search']
+        self._hybrid_pipelines_ready = False
+        self._hybrid_pipelines_lock = threading.Lock()
+        # 검색 실행 백엔드 (opensearch: 클러스터, local: 프로세스 내 벡터/BM25 엔진)
+        self.retrieval_backend = create_retrieval_backend(self)
         self.max_retries = 3
         self.base_delay = 2  # 초기 대기 시간 (초)
         self.k = 8
 
+        self.embedding_profile = get_embedding_profile()
         self.embedder = BedrockEmbeddings(
             model_id=BEDROCK_MODELS['titan_embedding'],
-            region_name=AWS_REGION
+            region_name=AWS_REGION,
+            profile=self.embedding_profile
         )
+        self._schema_version = None
+        self._schema_generation = None
+        self._schema_version_checked_at = 0.0
+        # 스키마 세대별 전체 테이블 카탈로그 (프로세스 공용)
+        self.schema_catalog = get_schema_catalog()
 
     def _load_mapping_file(self, filename: str) -> Dict:
         """Load mapping configuration from JSON file"""
         try:
             mapping_path = os.path.join('utils', 'opensearch_mappings', filename)
             with open(mapping_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+                return apply_embedding_profile(json.load(f))
         except Exception as e:
             st.error(f"매핑 파일 로드 중 오류 발생: {str(e)}")
             return {}
@@ -62,12 +120,98 @@ class OpenSearchManager:
                     if mapping_config:
                         self.client.indices.create(index=index, body=mapping_config)
                         st.success(f"✅ {index} 인덱스가 생성되었습니다.")
+                else:
+                    index_dimension = self._get_index_dimension(index)
+                    if index_dimension and index_dimension != self.embedding_profile['dimension']:
+                        st.warning(
+                            f"⚠️ {index} 인덱스의 임베딩 차원({index_dimension})이 현재 프로필"
+                            f"({self.embedding_profile['dimension']})과 다릅니다. "
+                            f"migrate_embedding_profile('{index}')로 재인덱싱이 필요합니다."
+                        )
             return True
 
         except Exception as e:
             st.error(f"인덱스 생성 중 오류가 발생했습니다: {str(e)}")
             return False
 
+    def _get_index_dimension(self, index: str) -> Optional[int]:
+        """기존 인덱스 매핑의 임베딩 차원 조회"""
+        mappings = self.client.indices.get_mapping(index=index)
+        for index_mapping in mappings.values():
+            return get_mapping_dimension(index_mapping)
+        return None
+
+    def _check_embedding_vector(self, embedding_vector: Optional[List[float]]) -> None:
+        """검색 벡터의 차원이 임베딩 프로필과 일치하는지 확인"""
+        if embedding_vector is None:
+            raise ValueError("질문 임베딩을 생성하지 못했습니다.")
+        if len(embedding_vector) != self.embedding_profile['dimension']:
+            raise ValueError(
+                f"임베딩 차원 불일치: {len(embedding_vector)} != {self.embedding_profile['dimension']}"
+            )
+
+    def _source_fields(self, fields: List[str]):
+        """검색 요청의 _source 설정 (필터링 비활성화 시 전체 문서)"""
+        return fields if self.source_filtering else True
+
+    def _search(self, index: str, body: Dict, operation: str, search_pipeline: Optional[str] = None) -> Dict:
+        """검색 요청 실행 및 검색 종류별 응답 크기/디코딩 시간 기록"""
+        options = self._request_options()
+        if search_pipeline is not None:
+            options["search_pipeline"] = search_pipeline
+        response = self.client.search(index=index, body=body, **options)
+        self.payload_stats.record(operation, self.payload_meter.pop_last())
+        return response
+
+    def ensure_hybrid_pipelines(self) -> bool:
+        """hybrid 점수 결합용 검색 파이프라인 생성 (지원하지 않는 클러스터면 클라이언트 점수 결합으로 전환)"""
+        with self._hybrid_pipelines_lock:
+            if not self._hybrid_pipelines_ready and self.hybrid_search == 'pipeline':
+                try:
+                    # 스키마 hybrid 쿼리의 inner_hits 이름 중복 확인 (중복되면 클러스터가 400으로 거부)
+                    validate_hybrid_query(hybrid_query_body(
+                        self._lexical_schema_search_body('', 1), self._semantic_schema_search_body([0.0]), 1
+                    ))
+                    for semantic_weight in sorted(set(SEMANTIC_WEIGHTS.values())):
+                        self.client.search_pipeline.put(
+                            id=hybrid_pipeline_name(semantic_weight),
+                            body=hybrid_pipeline_body(semantic_weight)
+                        )
+                    self._hybrid_pipelines_ready = True
+                except Exception as e:
+                    self._disable_hybrid_pipeline(e)
+            return self._hybrid_pipelines_ready
+
+    def _use_hybrid_pipeline(self) -> bool:
+        return self.retrieval_backend.name == 'opensearch' and self.hybrid_search == 'pipeline' \
+            and self.ensure_hybrid_pipelines()
+
+    def _disable_hybrid_pipeline(self, error: Exception) -> None:
+        print(f"검색 파이프라인을 사용할 수 없어 클라이언트 점수 결합으로 전환합니다: {str(error)}")
+        self.hybrid_search = 'client'
+        self._hybrid_pipelines_ready = False
+
+    def _hybrid_search(self, index: str, lexical_body: Dict, semantic_body: Dict, size: int,
+                       semantic_weight: float, operation: str) -> Dict:
+        """lexical/kNN 검색을 hybrid 쿼리 한 번으로 실행 (정규화와 가중 결합은 검색 파이프라인에서 수행)"""
+        return self._search(index, hybrid_query_body(lexical_body, semantic_body, size), operation,
+                            search_pipeline=hybrid_pipeline_name(semantic_weight))
+
+    def _context_embedding(self, query: str, context: Optional[SearchContext]) -> List[float]:
+        """검색 컨텍스트에서 공유하는 질문 임베딩 (차원 확인 포함)"""
+        embedding_vector = context.get_embedding() if context else self._get_query_embedding(query)
+        self._check_embedding_vector(embedding_vector)
+        return embedding_vector
+
+    def get_payload_stats(self) -> Dict[str, Dict[str, float]]:
+        """검색 종류별 평균 응답 크기와 디코딩 시간"""
+        return self.payload_stats.summary()
+
+    @staticmethod
+    def _request_options() -> Dict:
+        """요청 마감 시간을 반영한 검색 요청 옵션 (남은 시간이 없으면 DeadlineExceeded)"""
+        return {"request_timeout": timeout_for(OPENSEARCH_CONFIG['request_timeout'])}
+
     def _get_embedding(self, text: str, max_retries: int = 3) -> Optional[List[float]]:
         """LangChain Embeddings를 사용하여 임베딩 생성"""
         if not text.strip():
@@ -88,17 +232,60 @@ class OpenSearchManager:
 
             attempt += 1
             if attempt < max_retries:
+                # 요청 마감 시간 안에 끝날 수 없는 재시도는 건너뜀
+                ensure_retry_fits(2 ** attempt, "임베딩 생성")
                 st.info(f"임베딩 재시도 중... ({attempt}/{max_retries})")
                 time.sleep(2 ** attempt)  # 지수 백오프
         return None
 
+    def _get_query_embedding(self, text: str) -> Optional[List[float]]:
+        """질문 임베딩 생성 (동일 텍스트에 대한 동시 호출은 single-flight로 합침)"""
+        flight_key = (self.embedder.model_id, normalize_text(text))
+        return _embedding_flight.do(flight_key, lambda: self._get_embedding(text))
+
+    def get_schema_version(self) -> Optional[str]:
+        """현재 인덱싱된 최신 스키마 버전 ID 조회 (짧은 TTL 동안 재사용)"""
+        self._refresh_schema_version()
+        return self._schema_version
+
+    def get_schema_generation(self) -> Optional[Tuple]:
+        """현재 스키마 인덱스 세대 (버전 ID, 실제 인덱스, 문서 수, 마지막 갱신 시각) - 짧은 TTL 동안 재사용"""
+        self._refresh_schema_version()
+        return self._schema_generation
+
+    def _refresh_schema_version(self) -> None:
+        """TTL이 지났으면 검색 백엔드에서 최신 스키마 버전과 인덱스 세대를 한 번에 조회"""
+        now = time.monotonic()
+        if self._schema_version_checked_at and now - self._schema_version_checked_at < ANSWER_CACHE_CONFIG['schema_version_ttl']:
+            return
+
+        try:
+            self._schema_version, self._schema_generation = self.retrieval_backend.schema_version()
+        except Exception as e:
+            print(f"스키마 버전 조회 중 오류 발생: {str(e)}")
+            self._schema_version = None
+            self._schema_generation = None
+
+        self._schema_version_checked_at = now
+
+    def _invalidate_schema_version(self) -> None:
+        """스키마 변경 시 캐시된 버전 정보와 테이블 카탈로그 폐기"""
+        self._schema_version = None
+        self._schema_generation = None
+        self._schema_version_checked_at = 0.0
+        if self.schema_catalog is not None:
+            self.schema_catalog.invalidate()
+
     def index_schema(self, schema_data: Dict, version_id: str = None) -> bool:
         """Index schema information using the schema indexer"""
         if not self.create_indices():
             return False
+        self._invalidate_schema_version()
             
         # 스키마 정보 인덱싱
         schema_result = index_schema(self.client, self.embedder, schema_data, version_id)
+        # 인덱싱 중 다른 질문이 적재한 일부 카탈로그도 폐기
+        self._invalidate_schema_version()
         if not schema_result:
             return False
             
@@ -130,6 +317,7 @@ class OpenSearchManager:
 
     def clear_indices(self) -> bool:
         """Clear all indices"""
+        self._invalidate_schema_version()
         try:
             indices = ['database_schema', 'sample_queries']
             for index in indices:
@@ -141,62 +329,239 @@ class OpenSearchManager:
             st.error(f"인덱스 초기화 중 오류가 발생했습니다: {str(e)}")
             return False
 
-    def integrated_search(self, query: str, top_k: int = 10) -> Dict[str, List[Dict]]:
-        """Perform integrated search across all indices"""
+    def migrate_embedding_profile(self, index: str, batch_size: int = 100) -> bool:
+        """
+        기존 인덱스를 현재 임베딩 프로필로 재임베딩하여 새 인덱스로 재인덱싱합니다.
+        새 인덱스 생성 -> 문서 재임베딩 및 적재 -> 기존 인덱스 삭제 -> 별칭 전환 순으로 진행됩니다.
+
+        Args:
+            index: 대상 인덱스 이름 또는 별칭
+            batch_size: 한 번에 재임베딩할 문서 수
+        """
+        try:
+            if not self.client.indices.exists(index=index):
+                st.warning(f"{index} 인덱스가 존재하지 않습니다.")
+                return False
+
+            # 별칭이면 실제 인덱스 이름으로 변환
+            source_index, source_config = next(iter(self.client.indices.get(index=index).items()))
+            dimension = self.embedding_profile['dimension']
+            target_index = f"{index}_{dimension}d_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+
+            # 기존 분석기/동의어 설정을 유지한 채 knn_vector 차원만 변경
+            index_settings = source_config['settings']['index']
+            target_body = apply_embedding_profile({
+                "settings": {
+                    "number_of_shards": index_settings.get('number_of_shards'),
+                    "number_of_replicas": index_settings.get('number_of_replicas'),
+                    "index": {"knn": index_settings.get('knn', True)},
+                    "analysis": index_settings.get('analysis', {})
+                },
+                "mappings": source_config['mappings']
+            }, self.embedding_profile)
+            self.client.indices.create(index=target_index, body=target_body)
+            st.info(f"새 인덱스 생성 완료: {target_index}")
+
+            def _reembed(documents: List[Dict]) -> List[Dict]:
+                texts = []
+                for document in documents:
+                    source = document['_source']
+                    texts.append(source.get('search_text') or source.get('natural_language', ''))
+                    for column in source.get('columns', []):
+                        texts.append(
+                            column.get('search_text')
+                            or f"{column['name']} {column.get('description', {}).get('korean', '')}"
+                        )
+
+                embeddings = self.embedder.embed_documents(texts)
+                position = 0
+                actions = []
+                for document in documents:
+                    source = document['_source']
+                    source['embedding'] = embeddings[position]
+                    position += 1
+                    for column in source.get('columns', []):
+                        column['embedding'] = embeddings[position]
+                        position += 1
+                    actions.append({"_index": target_index, "_id": document['_id'], "_source": source})
+                return actions
+
+            migrated = 0
+            batch = []
+            for document in helpers.scan(self.client, index=source_index, query={"query": {"match_all": {}}}):
+                batch.append(document)
+                if len(batch) >= batch_size:
+                    helpers.bulk(self.client, _reembed(batch))
+                    migrated += len(batch)
+                    batch = []
+            if batch:
+                helpers.bulk(self.client, _reembed(batch))
+                migrated += len(batch)
+
+            self.client.indices.refresh(index=target_index)
+
+            # 기존 인덱스 삭제 후 원래 이름을 새 인덱스의 별칭으로 지정
+            self.client.indices.delete(index=source_index)
+            self.client.indices.put_alias(index=target_index, name=index)
+            if index == 'database_schema':
+                self._invalidate_schema_version()
+            st.success(f"✅ {index} 인덱스 재임베딩 완료 ({migrated}건, {dimension}차원)")
+            return True
+
+        except Exception as e:
+            st.error(f"임베딩 프로필 마이그레이션 중 오류가 발생했습니다: {str(e)}")
+            return False
+
+    def export_local_index(self, directory: Optional[str] = None) -> bool:
+        """
+        현재 인덱스를 로컬 검색 백엔드(RETRIEVAL_CONFIG['backend'] = 'local') 형식으로 내보냅니다.
+
+        Args:
+            directory: 저장 디렉터리 (미지정 시 RETRIEVAL_CONFIG['local_path'])
+        """
+        from utils.local_retrieval import export_local_index
+
+        directory = directory or RETRIEVAL_CONFIG['local_path']
         try:
-            from concurrent.futures import ThreadPoolExecutor, as_completed
-
-            with ThreadPoolExecutor(max_workers=3) as executor:
-                # 각 검색 작업을 병렬로 실행
-                futures = {
-                    executor.submit(self._search_schema, query, top_k): 'database_schema',
-                    executor.submit(self._search_queries, query, top_k): 'sample_queries',
-                    executor.submit(self._search_user_feedback_queries, query, top_k): 'user_feedback_queries'
-                }
+            counts = export_local_index(self.client, directory, self.embedding_profile['dimension'])
+            summary = ", ".join(f"{index} {count}건" for index, count in counts.items())
+            st.success(f"✅ 로컬 검색 인덱스 내보내기 완료 ({directory}: {summary})")
+            return True
+        except Exception as e:
+            st.error(f"로컬 검색 인덱스 내보내기 중 오류가 발생했습니다: {str(e)}")
+            return False
+
+    def integrated_search(self, query: str, top_k: int = 10,
+                          cancel_token: Optional[CancelToken] = None) -> Dict[str, List[Dict]]:
+        """Perform integrated search across all indices (cancel_token 취소 시 즉시 빈 결과 반환)"""
+        try:
+            from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+            from contextvars import copy_context
+
+            # 요청 단위 컨텍스트: 질문 임베딩을 한 번만 계산하여 세 검색에서 공유
+            context = SearchContext(query, self._get_query_embedding, cancel_token=cancel_token)
+
+            # 취소 신호를 Future로 받아 검색 결과와 함께 대기
+            cancelled = Future()
+            if cancel_token is not None:
+                cancel_token.add_callback(lambda: cancelled.done() or cancelled.set_result(True))
+
+            # 검색 파이프라인 사용 시에는 인덱스별 hybrid 검색 3개를 병렬로 실행
+            # (_msearch/검색 파이프라인은 OpenSearch 백엔드에서만 사용)
+            msearch = self.retrieval_backend.name == 'opensearch' and self.search_mode == 'msearch' \
+                and not self._use_hybrid_pipeline()
+            executor = ThreadPoolExecutor(max_workers=1 if msearch else 3)
+            try:
+                # 요청 마감 시간 등 현재 컨텍스트를 검색 스레드에도 전달
+                if msearch:
+                    # lexical/kNN 검색 6개를 한 번의 _msearch 요청으로 실행 (취소 대기를 위해 별도 스레드)
+                    futures = {
+                        executor.submit(copy_context().run, self._multi_search, query, top_k,
+                                        context=context): 'msearch'
+                    }
+                else:
+                    # 각 검색 작업을 병렬로 실행
+                    futures = {
+                        executor.submit(copy_context().run, self._search_schema, query, top_k,
+                                        context=context): 'database_schema',
+                        executor.submit(copy_context().run, self._search_queries, query, top_k,
+                                        context=context): 'sample_queries',
+                        executor.submit(copy_context().run, self._search_user_feedback_queries, query, top_k,
+                                        context=context): 'user_feedback_queries'
+                    }
 
                 results = {}
-                for future in as_completed(futures):
-                    search_type = futures[future]
-                    try:
-                        results[search_type] = future.result()
-                    except Exception as e:
-                        print(f"{search_type} 검색 중 오류 발생: {str(e)}")
-                        results[search_type] = []
+                pending = set(futures)
+                while pending:
+                    done, pending = wait(pending | {cancelled}, return_when=FIRST_COMPLETED)
+                    if cancelled in done:
+                        raise SearchCancelled()
+                    pending.discard(cancelled)
+                    for future in done:
+                        search_type = futures[future]
+                        try:
+                            if msearch:
+                                results.update(future.result())
+                            else:
+                                results[search_type] = future.result()
+                        except Exception as e:
+                            print(f"{search_type} 검색 중 오류 발생: {str(e)}")
+                            if not msearch:
+                                results[search_type] = []
+            finally:
+                # 취소된 경우 실행 중인 검색은 기다리지 않고 대기 중인 작업만 취소
+                executor.shutdown(wait=False, cancel_futures=True)
 
             return results
 
+        except SearchCancelled:
+            print(f"통합 검색이 취소되었습니다: {query}")
+            return {}
         except Exception as e:
             st.error(f"통합 검색 중 오류가 발생했습니다: {str(e)}")
             return {}
 
+    def _multi_search(self, query: str, top_k: int = 10,
+                      context: Optional[SearchContext] = None) -> Dict[str, List[Dict]]:
+        """
+        세 인덱스의 lexical/kNN 검색 본문을 미리 만들어 한 번의 _msearch 요청으로 실행하고,
+        응답을 인덱스별로 나누어 기존 결과 처리 함수로 전달
+
+        Returns:
+            Dict: integrated_search와 같은 형식의 인덱스별 검색 결과
+        """
+        embedding_vector = self._context_embedding(query, context)
+
+        searches = [
+            ('database_schema', self._lexical_schema_search_body(query, top_k)),
+            ('database_schema', self._semantic_schema_search_body(embedding_vector)),
+            ('sample_queries', self._lexical_query_search_body(query, top_k)),
+            ('sample_queries', self._semantic_query_search_body(embedding_vector)),
+            ('user_feedback_queries', self._lexical_user_feedback_query_search_body(query, top_k)),
+            ('user_feedback_queries', self._semantic_user_feedback_query_search_body(embedding_vector))
+        ]
+        body = []
+        for index, search_body in searches:
+            body.extend([{"index": index}, search_body])
+
+        response = self.client.msearch(body=body, **self._request_options())
+        self.payload_stats.record('msearch', self.payload_meter.pop_last())
+
+        # 요청 순서대로 (lexical, semantic) 응답 쌍으로 분리
+        responses = response['responses']
+        return {
+            'database_schema': self._search_schema(query, top_k, context=context, responses=tuple(responses[0:2])),
+            'sample_queries': self._search_queries(query, top_k, context=context, responses=tuple(responses[2:4])),
+            'user_feedback_queries': self._search_user_feedback_queries(query, top_k, context=context,
+                                                                        responses=tuple(responses[4:6]))
+        }
+
+    @staticmethod
+    def _msearch_item(item: Dict) -> Dict:
+        """_msearch 개별 응답 (개별 검색 오류는 단일 검색과 같이 예외로 전달)"""
+        if 'error' in item:
+            error = item['error']
+            raise RuntimeError(error.get('reason', error) if isinstance(error, dict) else error)
+        return item
+
     def _lexical_schema_search(self, query: str, top_k: int = 5):
         """Lexical search for schema information"""
+        return self.retrieval_backend.lexical_schema_search(query, top_k)
+
+    def _lexical_schema_search_body(self, query: str, top_k: int = 5) -> Dict:
+        """Lexical search for schema information (request body)"""
         search_body = {
             "size": top_k,
+            "_source": self._source_fields(SCHEMA_TABLE_FIELDS),
             "query": {
                 "bool": {
                     "should": [
                         {
                             "multi_match": {
                                 "query": query,
-                                "fields": [
-                                    "table_info.name^4",
-                                    "table_info.description.korean^3",
-                                    "table_info.description.english^2",
-                                    "table_info.business_context.korean^3",
-                                    "table_info.business_context.english^2",
-                                    "table_info.technical_context.korean^2",
-                                    "table_info.technical_context.english^2",
-                                    "table_info.synonyms.table_name.korean^2",
-                                    "table_info.synonyms.table_name.english^2",
-                                    "table_info.synonyms.business_terms.korean^2",
-                                    "table_info.synonyms.business_terms.english^2",
-                                    "table_info.related_terms.korean^1.5",
-                                    "table_info.related_terms.english^1.5",
-                                    "search_text"
-                                ],
+                                "fields": SCHEMA_TABLE_SEARCH_FIELDS,
                                 "type": "best_fields",
-                                "tie_breaker": 0.3
+                                "tie_breaker": TIE_BREAKER
                             }
                         },
                         {
@@ -208,28 +573,18 @@ class OpenSearchManager:
                                             {
                                                 "multi_match": {
                                                     "query": query,
-                                                    "fields": [
-                                                        "columns.name^4",
-                                                        "columns.description.korean^3",
-                                                        "columns.description.english^2",
-                                                        "columns.business_context.korean^3",
-                                                        "columns.business_context.english^2",
-                                                        "columns.technical_context.korean^2",
-                                                        "columns.technical_context.english^2",
-                                                        "columns.synonyms.column_name.korean^2",
-                                                        "columns.synonyms.column_name.english^2",
-                                                        "columns.synonyms.value_meanings.values.value^2",
-                                                        "columns.synonyms.value_meanings.values.korean^2",
-                                                        "columns.synonyms.value_meanings.values.english^1.5"
-                                                    ],
+                                                    "fields": SCHEMA_COLUMN_SEARCH_FIELDS,
                                                     "type": "best_fields",
-                                                    "tie_breaker": 0.3
+                                                    "tie_breaker": TIE_BREAKER
                                                 }
                                             }
                                         ]
                                     }
                                 },
-                                "inner_hits": {}
+                                "inner_hits": {
+                                    "name": LEXICAL_COLUMN_INNER_HITS,
+                                    "_source": self._source_fields(SCHEMA_COLUMN_FIELDS)
+                                }
                             }
                         }
                     ]
@@ -250,15 +605,20 @@ class OpenSearchManager:
                 "post_tags": ["</mark>"]
             }
         }
+        return search_body
 
-        response = self.client.search(index='database_schema', body=search_body)
-        return response
-
-    def _semantic_schema_search(self, query: str):
+    def _semantic_schema_search(self, query: str, embedding_vector: Optional[List[float]] = None):
         """Semantic search for schema information"""
-        embedding_vector = self._get_embedding(text=query)
+        if embedding_vector is None:
+            embedding_vector = self._get_embedding(text=query)
+        self._check_embedding_vector(embedding_vector)
+        return self.retrieval_backend.semantic_schema_search(embedding_vector, self.k)
+
+    def _semantic_schema_search_body(self, embedding_vector: List[float]) -> Dict:
+        """Semantic search for schema information (request body)"""
         search_body = {
             "size": self.k,
+            "_source": self._source_fields(SCHEMA_TABLE_FIELDS),
             "query": {
                 "bool": {
                     "should": [
@@ -282,7 +642,9 @@ class OpenSearchManager:
                                     }
                                 },
                                 "inner_hits": {
-                                    "size": self.k
+                                    "name": SEMANTIC_COLUMN_INNER_HITS,
+                                    "size": self.k,
+                                    "_source": self._source_fields(SCHEMA_COLUMN_FIELDS)
                                 }
                             }
                         }
@@ -290,37 +652,26 @@ class OpenSearchManager:
                 }
             }
         }
-
-        results = self.client.search(
-            index="database_schema",
-            body=search_body
-        )
-
-        return results
+        return search_body
 
     def _lexical_query_search(self, query: str, top_k: int = 5):
         """Lexical search for sample queries"""
+        return self.retrieval_backend.lexical_query_search(query, top_k)
+
+    def _lexical_query_search_body(self, query: str, top_k: int = 5) -> Dict:
+        """Lexical search for sample queries (request body)"""
         search_body = {
             "size": top_k,
+            "_source": self._source_fields(SAMPLE_QUERY_FIELDS),
             "query": {
                 "bool": {
                     "should": [
                         {
                             "multi_match": {
                                 "query": query,
-                                "fields": [
-                                    "description.korean^3",
-                                    "description.english^2",
-                                    "business_purpose.korean^3",
-                                    "business_purpose.english^2",
-                                    "technical_details.korean^2",
-                                    "technical_details.english^2",
-                                    "natural_language_variations.korean^2",
-                                    "natural_language_variations.english^2",
-                                    "search_text"
-                                ],
+                                "fields": SAMPLE_QUERY_SEARCH_FIELDS,
                                 "type": "best_fields",
-                                "tie_breaker": 0.3
+                                "tie_breaker": TIE_BREAKER
                             }
                         },
                         {
@@ -332,12 +683,7 @@ class OpenSearchManager:
                                             {
                                                 "multi_match": {
                                                     "query": query,
-                                                    "fields": [
-                                                        "keyword_variations.terms.base_term.korean^2",
-                                                        "keyword_variations.terms.base_term.english^2",
-                                                        "keyword_variations.terms.variations.korean^1.5",
-                                                        "keyword_variations.terms.variations.english^1.5"
-                                                    ]
+                                                    "fields": SAMPLE_QUERY_TERM_SEARCH_FIELDS
                                                 }
                                             }
                                         ]
@@ -361,15 +707,20 @@ class OpenSearchManager:
                 "post_tags": ["</mark>"]
             }
         }
+        return search_body
 
-        response = self.client.search(index='sample_queries', body=search_body)
-        return response
-
-    def _semantic_query_search(self, query: str):
+    def _semantic_query_search(self, query: str, embedding_vector: Optional[List[float]] = None):
         """Semantic search for sample queries"""
-        embedding_vector = self._get_embedding(text=query)
+        if embedding_vector is None:
+            embedding_vector = self._get_embedding(text=query)
+        self._check_embedding_vector(embedding_vector)
+        return self.retrieval_backend.semantic_query_search(embedding_vector, self.k)
+
+    def _semantic_query_search_body(self, embedding_vector: List[float]) -> Dict:
+        """Semantic search for sample queries (request body)"""
         search_body = {
             "size": self.k,
+            "_source": self._source_fields(SAMPLE_QUERY_FIELDS),
             "query": {
                 "knn": {
                     "embedding": {
@@ -379,13 +730,7 @@ class OpenSearchManager:
                 }
             }
         }
-
-        response = self.client.search(
-            index="sample_queries",
-            body=search_body
-        )
-
-        return response
+        return search_body
 
     def _process_schema_result(self, response: Dict, search_method: str) -> List[Dict]:
         """Process schema search results"""
@@ -406,9 +751,13 @@ class OpenSearchManager:
                     "search_method": search_method
                 }
 
-                # 컬럼 정보 처리
-                hit_columns = hit['inner_hits']['columns']['hits']['hits']
-                if not hit_columns:
+                # 컬럼 정보 처리 (hybrid 검색은 lexical/semantic inner_hits를 모두 반환하므로 합쳐서 처리)
+                inner_hits = hit.get('inner_hits')
+                hit_columns = [
+                    column for columns in (inner_hits or {}).values() for column in columns['hits']['hits']
+                ]
+                # inner_hits를 반환하지 않는 hybrid 응답은 컬럼 없이 테이블만 사용
+                if inner_hits is not None and not hit_columns:
                     continue
 
                 for column in hit_columns:
@@ -459,19 +808,15 @@ class OpenSearchManager:
         )
         return response['count']
 
+    def _get_table_catalog(self) -> List:
+        """전체 테이블 카탈로그 (스키마 세대가 같으면 캐시 사용)"""
+        if self.schema_catalog is None:
+            return self._search_all_tables()
+        return self.schema_catalog.get_or_load(self.get_schema_generation(), self._search_all_tables)
+
     def _search_all_tables(self) -> List:
         """Search all tables"""
-        total_table_count = self._count_all_tables()
-        search_body = {
-            "size": total_table_count,
-            "query": {
-                "match_all": {}
-            }
-        }
-        response = self.client.search(
-            index="database_schema",
-            body=search_body
-        )
+        response = self.retrieval_backend.all_tables()
 
         result = []
         if response['hits']['hits']:
@@ -506,22 +851,40 @@ class OpenSearchManager:
 
         return result
 
-    def _search_schema(self, query: str, top_k: int = 10, semantic_weight: float = 0.4) -> Dict:
-        """Search schema information"""
+    def _search_schema(self, query: str, top_k: int = 10,
+                       semantic_weight: float = SEMANTIC_WEIGHTS['database_schema'],
+                       context: Optional[SearchContext] = None,
+                       responses: Optional[Tuple[Dict, Dict]] = None) -> Dict:
+        """Search schema information (responses: _msearch로 받은 lexical/semantic 응답)"""
         search_schema_result = {}
         try:
             # 전체 테이블 서치
-            search_schema_result['tables'] = self._search_all_tables()
+            search_schema_result['tables'] = self._get_table_catalog()
+
+            if responses is None and self._use_hybrid_pipeline():
+                try:
+                    response = self._hybrid_search(
+                        'database_schema',
+                        self._lexical_schema_search_body(query, top_k),
+                        self._semantic_schema_search_body(self._context_embedding(query, context)),
+                        top_k, semantic_weight, 'hybrid_schema_search'
+                    )
+                    search_schema_result['related_tables'] = finalize_hybrid_tables(
+                        self._process_schema_result(response, search_method='hybrid_search')
+                    )
+                    return search_schema_result
+                except RequestError as e:
+                    # 클러스터가 hybrid 쿼리를 지원하지 않으면 클라이언트 점수 결합으로 진행
+                    self._disable_hybrid_pipeline(e)
 
             # lexical search와 semantic search를 순차적으로 실행
-            lexical_results = self._process_schema_result(
-                self._lexical_schema_search(query, top_k),
-                search_method='lexical_search'
-            )
-            semantic_results = self._process_schema_result(
-                self._semantic_schema_search(query),
-                search_method='semantic_search'
-            )
+            if responses is not None:
+                lexical_response, semantic_response = map(self._msearch_item, responses)
+            else:
+                lexical_response = self._lexical_schema_search(query, top_k)
+                semantic_response = self._semantic_schema_search(query, context.get_embedding() if context else None)
+            lexical_results = self._process_schema_result(lexical_response, search_method='lexical_search')
+            semantic_results = self._process_schema_result(semantic_response, search_method='semantic_search')
 
             # 결과가 없는 경우 빈 리스트 처리
             lexical_results = lexical_results or []
@@ -610,13 +973,38 @@ class OpenSearchManager:
             st.error(f"스키마 검색 중 오류가 발생했습니다: {str(e)}")
             return {'table_name': '', 'description': '', 'columns': [], 'related_columns': []}
 
-    def _search_queries(self, query: str, top_k: int = 10, semantic_weight: float = 0.6) -> List[Dict]:
-        """Search sample queries"""
+    def _search_queries(self, query: str, top_k: int = 10,
+                        semantic_weight: float = SEMANTIC_WEIGHTS['sample_queries'],
+                        context: Optional[SearchContext] = None,
+                        responses: Optional[Tuple[Dict, Dict]] = None) -> List[Dict]:
+        """Search sample queries (responses: _msearch로 받은 lexical/semantic 응답)"""
         try:
-            lexical_result = self._process_query_results(self._lexical_query_search(query, top_k),
-                                                       search_method='lexical_search')
-            semantic_result = self._process_query_results(self._semantic_query_search(query),
-                                                        search_method='semantic_search')
+            if responses is None and self._use_hybrid_pipeline():
+                try:
+                    response = self._hybrid_search(
+                        'sample_queries',
+                        self._lexical_query_search_body(query, top_k),
+                        self._semantic_query_search_body(self._context_embedding(query, context)),
+                        top_k, semantic_weight, 'hybrid_query_search'
+                    )
+                    return [
+                        {
+                            "query": result['query'],
+                            "description": result['description'],
+                            "hybrid_score": result['score']
+                        }
+                        for result in self._process_query_results(response, search_method='hybrid_search')
+                    ]
+                except RequestError as e:
+                    self._disable_hybrid_pipeline(e)
+
+            if responses is not None:
+                lexical_response, semantic_response = map(self._msearch_item, responses)
+            else:
+                lexical_response = self._lexical_query_search(query, top_k)
+                semantic_response = self._semantic_query_search(query, context.get_embedding() if context else None)
+            lexical_result = self._process_query_results(lexical_response, search_method='lexical_search')
+            semantic_result = self._process_query_results(semantic_response, search_method='semantic_search')
 
             def _normalize_score_in_array(search_result, weight):
                 if not search_result:
@@ -669,12 +1057,42 @@ class OpenSearchManager:
             st.error(f"쿼리 검색 중 오류가 발생했습니다: {str(e)}")
             return []
 
-    def _search_user_feedback_queries(self, query: str, top_k: int = 10, semantic_weight: float = 0.7) -> List[Dict]:
-        """Search user feedback queries"""
+    def _search_user_feedback_queries(self, query: str, top_k: int = 10,
+                                      semantic_weight: float = SEMANTIC_WEIGHTS['user_feedback_queries'],
+                                      context: Optional[SearchContext] = None,
+                                      responses: Optional[Tuple[Dict, Dict]] = None) -> List[Dict]:
+        """Search user feedback queries (responses: _msearch로 받은 lexical/semantic 응답)"""
         try:
-            lexical_result = self._process_user_feedback_query_results(self._lexical_user_feedback_query_search(query, top_k),
+            if responses is None and self._use_hybrid_pipeline():
+                try:
+                    response = self._hybrid_search(
+                        'user_feedback_queries',
+                        self._lexical_user_feedback_query_search_body(query, top_k),
+                        self._semantic_user_feedback_query_search_body(self._context_embedding(query, context)),
+                        top_k, semantic_weight, 'hybrid_user_feedback_query_search'
+                    )
+                    return [
+                        {
+                            "natural_language": result['natural_language'],
+                            "sql": result['sql'],
+                            "hybrid_score": result['score'],
+                            "search_methods": [result['search_method']]
+                        }
+                        for result in self._process_user_feedback_query_results(response, search_method='hybrid_search')
+                    ]
+                except RequestError as e:
+                    self._disable_hybrid_pipeline(e)
+
+            if responses is not None:
+                lexical_response, semantic_response = map(self._msearch_item, responses)
+            else:
+                lexical_response = self._lexical_user_feedback_query_search(query, top_k)
+                semantic_response = self._semantic_user_feedback_query_search(
+                    query, context.get_embedding() if context else None
+                )
+            lexical_result = self._process_user_feedback_query_results(lexical_response,
                                                                      search_method='lexical_search')
-            semantic_result = self._process_user_feedback_query_results(self._semantic_user_feedback_query_search(query),
+            semantic_result = self._process_user_feedback_query_results(semantic_response,
                                                                       search_method='semantic_search')
 
             def _normalize_score_in_array(search_result, weight):
@@ -724,35 +1142,42 @@ class OpenSearchManager:
 
     def _lexical_user_feedback_query_search(self, query: str, top_k: int = 5):
         """Lexical search for user feedback queries"""
+        return self.retrieval_backend.lexical_user_feedback_query_search(query, top_k)
+
+    def _lexical_user_feedback_query_search_body(self, query: str, top_k: int = 5) -> Dict:
+        """Lexical search for user feedback queries (request body)"""
         search_body = {
             "size": top_k,
+            "_source": self._source_fields(USER_FEEDBACK_QUERY_FIELDS),
             "query": {
                 "bool": {
                     "should": [
                         {
                             "multi_match": {
                                 "query": query,
-                                "fields": [
-                                    "natural_language^3",
-                                    "sql^2"
-                                ],
+                                "fields": USER_FEEDBACK_SEARCH_FIELDS,
                                 "type": "best_fields",
-                                "tie_breaker": 0.3
+                                "tie_breaker": TIE_BREAKER
                             }
                         }
                     ]
                 }
             }
         }
+        return search_body
 
-        response = self.client.search(index='user_feedback_queries', body=search_body)
-        return response
-
-    def _semantic_user_feedback_query_search(self, query: str):
+    def _semantic_user_feedback_query_search(self, query: str, embedding_vector: Optional[List[float]] = None):
         """Semantic search for user feedback queries"""
-        embedding_vector = self._get_embedding(text=query)
+        if embedding_vector is None:
+            embedding_vector = self._get_embedding(text=query)
+        self._check_embedding_vector(embedding_vector)
+        return self.retrieval_backend.semantic_user_feedback_query_search(embedding_vector, self.k)
+
+    def _semantic_user_feedback_query_search_body(self, embedding_vector: List[float]) -> Dict:
+        """Semantic search for user feedback queries (request body)"""
         search_body = {
             "size": self.k,
+            "_source": self._source_fields(USER_FEEDBACK_QUERY_FIELDS),
             "query": {
                 "knn": {
                     "embedding": {
@@ -762,13 +1187,7 @@ class OpenSearchManager:
                 }
             }
         }
-
-        response = self.client.search(
-            index="user_feedback_queries",
-            body=search_body
-        )
-
-        return response
+        return search_body
 
     def _process_user_feedback_query_results(self, response: Dict, search_method: str) -> List[Dict]:
         """Process user feedback query results"""
@@ -0,0 +1,364 @@
+# llm_cache.py
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from config import LLM_CACHE_CONFIG
+from utils.rate_limiter import PRIORITY_INTERACTIVE, bedrock_call
+
+PROMPTS_DIR = Path(__file__).parent.parent / 'prompts'
+
+
+def make_llm_cache_key(model_id: str, body: Dict) -> str:
+    """(model_id, 정규화된 요청 본문 해시) 기반 캐시 키 생성"""
+    canonical_body = json.dumps(body, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    body_hash = hashlib.sha256(canonical_body.encode('utf-8')).hexdigest()
+    return f"{model_id}:{body_hash}"
+
+
+def is_cacheable_request(body: Dict) -> bool:
+    """temperature 0 요청만 결정적 응답으로 보고 캐시"""
+    return body.get('temperature', 1) == 0
+
+
+def get_prompts_signature(prompts_dir: Path = PROMPTS_DIR) -> Tuple:
+    """프롬프트 YAML 파일의 (경로, 수정 시각, 크기) 목록 - 빠른 변경 감지용"""
+    return tuple(
+        (str(path), path.stat().st_mtime_ns, path.stat().st_size)
+        for path in sorted(prompts_dir.rglob('*.yaml'))
+    )
+
+
+def get_prompts_fingerprint(prompts_dir: Path = PROMPTS_DIR) -> str:
+    """프롬프트 YAML 파일 내용 전체의 해시"""
+    digest = hashlib.sha256()
+    for path in sorted(prompts_dir.rglob('*.yaml')):
+        digest.update(str(path.relative_to(prompts_dir)).encode('utf-8'))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+class LLMCache(ABC):
+    """LLM 응답 캐시 저장소 인터페이스"""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def put(self, key: str, value: str, expires_at: Optional[float]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_fingerprint(self) -> Optional[str]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def set_fingerprint(self, fingerprint: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def size(self) -> int:
+        raise NotImplementedError
+
+
+class MemoryLLMCache(LLMCache):
+    def __init__(self, max_entries: int = 5000):
+        """
+        메모리 기반 LLM 응답 캐시 (크기 제한 LRU)
+
+        Args:
+            max_entries (int): 최대 저장 항목 수
+        """
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._fingerprint = None
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: str, expires_at: Optional[float]) -> None:
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_fingerprint(self) -> Optional[str]:
+        return self._fingerprint
+
+    def set_fingerprint(self, fingerprint: str) -> None:
+        self._fingerprint = fingerprint
+
+    def size(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteLLMCache(LLMCache):
+    def __init__(self, path: str, max_entries: int = 5000):
+        """
+        SQLite 기반 디스크 LLM 응답 캐시 (크기 제한 LRU)
+
+        Args:
+            path (str): 캐시 파일 경로
+            max_entries (int): 최대 저장 항목 수 (초과 시 가장 오래 사용되지 않은 항목부터 삭제)
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                cache_key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires_at REAL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._conn.commit()
+        self._size = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM responses WHERE cache_key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            value, expires_at = row
+            if expires_at is not None and expires_at < now:
+                self._conn.execute("DELETE FROM responses WHERE cache_key = ?", (key,))
+                self._conn.commit()
+                self._size -= 1
+                return None
+
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE cache_key = ?", (now, key))
+            self._conn.commit()
+            return value
+
+    def put(self, key: str, value: str, expires_at: Optional[float]) -> None:
+        with self._lock:
+            exists = self._conn.execute(
+                "SELECT 1 FROM responses WHERE cache_key = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (cache_key, value, expires_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, value, expires_at, time.time())
+            )
+            if not exists:
+                self._size += 1
+
+            overflow = self._size - self.max_entries
+            if overflow > 0:
+                self._conn.execute("""
+                    DELETE FROM responses WHERE cache_key IN (
+                        SELECT cache_key FROM responses ORDER BY last_access ASC LIMIT ?
+                    )
+                """, (overflow,))
+                self._size -= overflow
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self._size = 0
+
+    def get_fingerprint(self) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE name = 'prompts_fingerprint'").fetchone()
+        return row[0] if row else None
+
+    def set_fingerprint(self, fingerprint: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (name, value) VALUES ('prompts_fingerprint', ?)", (fingerprint,)
+            )
+            self._conn.commit()
+
+    def size(self) -> int:
+        return self._size
+
+
+class LLMResponseCache:
+    def __init__(self, backend: LLMCache, ttl_seconds: float = 0, prompt_check_interval: float = 5,
+                 prompts_dir: Path = PROMPTS_DIR):
+        """
+        temperature 0 Bedrock 호출의 응답 캐시
+        prompts/ 아래 YAML 파일이 변경되면 캐시 전체를 무효화합니다.
+
+        Args:
+            backend (LLMCache): 캐시 저장소
+            ttl_seconds (float): 항목 유효 시간 (0 이하이면 만료 없음)
+            prompt_check_interval (float): 프롬프트 파일 변경 확인 주기 (초)
+            prompts_dir (Path): 프롬프트 디렉토리
+        """
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.prompt_check_interval = prompt_check_interval
+        self.prompts_dir = prompts_dir
+        self._lock = threading.Lock()
+        self._call_stats: Dict[str, Dict[str, int]] = {}
+        self._prompts_signature = None
+        self._last_prompt_check = 0.0
+        self._check_prompts(force=True)
+
+    def _check_prompts(self, force: bool = False) -> None:
+        """프롬프트 파일 변경 여부를 확인하고 변경 시 캐시 무효화"""
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._last_prompt_check < self.prompt_check_interval:
+                return
+            self._last_prompt_check = now
+
+            signature = get_prompts_signature(self.prompts_dir)
+            if signature == self._prompts_signature:
+                return
+            self._prompts_signature = signature
+
+        fingerprint = get_prompts_fingerprint(self.prompts_dir)
+        if self.backend.get_fingerprint() != fingerprint:
+            self.backend.clear()
+            self.backend.set_fingerprint(fingerprint)
+
+    def _record(self, call_type: str, hit: bool) -> None:
+        with self._lock:
+            stats = self._call_stats.setdefault(call_type, {"hits": 0, "misses": 0})
+            stats["hits" if hit else "misses"] += 1
+
+    def get(self, model_id: str, body: Dict, call_type: str) -> Optional[Dict]:
+        """캐시된 응답 본문 조회"""
+        self._check_prompts()
+        value = self.backend.get(make_llm_cache_key(model_id, body))
+        self._record(call_type, value is not None)
+        return json.loads(value) if value is not None else None
+
+    def put(self, model_id: str, body: Dict, response_body: Dict) -> None:
+        """응답 본문 저장"""
+        expires_at = time.time() + self.ttl_seconds if self.ttl_seconds > 0 else None
+        self.backend.put(
+            make_llm_cache_key(model_id, body),
+            json.dumps(response_body, ensure_ascii=False),
+            expires_at
+        )
+
+    def invalidate(self) -> None:
+        """캐시 전체 무효화"""
+        self.backend.clear()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """호출 유형별 적중/실패 통계 반환"""
+        with self._lock:
+            return {
+                call_type: {
+                    **stats,
+                    "hit_rate": stats["hits"] / (stats["hits"] + stats["misses"])
+                    if stats["hits"] + stats["misses"] else 0.0
+                }
+                for call_type, stats in self._call_stats.items()
+            }
+
+
+_shared_llm_cache: Optional[LLMResponseCache] = None
+_shared_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """설정에 따른 프로세스 공용 LLM 응답 캐시 반환 (비활성화 시 None)"""
+    global _shared_llm_cache
+
+    if not LLM_CACHE_CONFIG['enabled']:
+        return None
+
+    with _shared_llm_cache_lock:
+        if _shared_llm_cache is None:
+            if LLM_CACHE_CONFIG['backend'] == 'memory':
+                backend = MemoryLLMCache(max_entries=LLM_CACHE_CONFIG['max_entries'])
+            else:
+                backend = SQLiteLLMCache(
+                    path=LLM_CACHE_CONFIG['path'],
+                    max_entries=LLM_CACHE_CONFIG['max_entries']
+                )
+            _shared_llm_cache = LLMResponseCache(
+                backend=backend,
+                ttl_seconds=LLM_CACHE_CONFIG['ttl_seconds'],
+                prompt_check_interval=LLM_CACHE_CONFIG['prompt_check_interval']
+            )
+        return _shared_llm_cache
+
+
+def has_content(response_body: Dict) -> bool:
+    """텍스트 응답이 포함된 응답 본문인지 확인"""
+    content = response_body.get('content') or [{}]
+    return bool(content[0].get('text', '').strip())
+
+
+def invoke_model_cached(client, model_id: str, body: Dict, call_type: str,
+                        priority: int = PRIORITY_INTERACTIVE) -> Dict:
+    """
+    응답 캐시를 거쳐 Bedrock 모델 호출 (캐시 미스 시 공용 제한기 경유)
+
+    Args:
+        client: bedrock-runtime 클라이언트
+        model_id (str): 호출할 모델 ID
+        body (Dict): 요청 본문
+        call_type (str): 적중률 집계용 호출 유형
+        priority (int): 호출 우선순위
+
+    Returns:
+        Dict: 파싱된 응답 본문
+    """
+    cache = get_llm_cache() if is_cacheable_request(body) else None
+    if cache is not None:
+        cached = cache.get(model_id, body, call_type)
+        if cached is not None:
+            return cached
+
+    with bedrock_call(model_id, priority):
+        response = client.invoke_model(
+            modelId=model_id,
+            contentType="application/json",
+            accept="application/json",
+            body=json.dumps(body)
+        )
+    response_body = json.loads(response.get('body').read())
+
+    if cache is not None and has_content(response_body):
+        cache.put(model_id, body, response_body)
+    return response_body
@@ -1,13 +1,16 @@
 import redshift_connector
 from typing import Dict, Optional, Tuple
 import streamlit as st
-import boto3
 import json
 import time
 import yaml
 from pathlib import Path
 from botocore.exceptions import ClientError
-from config import REDSHIFT_CONFIG, AWS_REGION, BEDROCK_MODELS
+from config import REDSHIFT_CONFIG, AWS_REGION, BEDROCK_MODELS, WORKFLOW_CONFIG
+from utils.aws_clients import get_bedrock_runtime_client
+from utils.deadline import timeout_for
+from utils.llm_cache import invoke_model_cached
+from utils.rate_limiter import PRIORITY_AUGMENTATION
 from langchain_aws import BedrockLLM
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
@@ -18,7 +21,7 @@ class RedshiftManager:
         self.config = REDSHIFT_CONFIG
         self.llm = BedrockLLM(
             model_id=BEDROCK_MODELS['cross_claude'],
-            client=boto3.client('bedrock-runtime', region_name=AWS_REGION),
+            client=get_bedrock_runtime_client(AWS_REGION),
             streaming=False,
             model_kwargs={
                 "anthropic_version": "bedrock-2023-05-31",
@@ -66,11 +69,11 @@ class RedshiftManager:
         """Call Bedrock API with retry mechanism"""
         for attempt in range(max_retries):
             try:
-                response = self.llm.client.invoke_model(
-                    modelId=BEDROCK_MODELS['cross_claude'],
-                    contentType="application/json",
-                    accept="application/json",
-                    body=json.dumps({
+                # 응답 캐시 및 공용 제한기 경유 (스키마 업로드 시 호출되므로 낮은 우선순위)
+                response_body = invoke_model_cached(
+                    self.llm.client,
+                    BEDROCK_MODELS['cross_claude'],
+                    {
                         "anthropic_version": "bedrock-2023-05-31",
                         "max_tokens": 20000,
                         "messages": [
@@ -82,10 +85,10 @@ class RedshiftManager:
                         "temperature": 0.0,
                         "top_k": 250,
                         "top_p": 1.0
-                    })
+                    },
+                    call_type='ddl_generation',
+                    priority=PRIORITY_AUGMENTATION
                 )
-
-                response_body = json.loads(response.get('body').read())
                 if 'content' in response_body:
                     return True, response_body['content'][0]['text'].strip()
                 return False, "No content in response"
@@ -244,10 +247,15 @@ class RedshiftManager:
     def execute_query(self, query: str) -> Optional[list]:
         """Execute query and return results"""
         try:
+            # 요청 마감 시간이 지났으면 연결하지 않음
+            statement_timeout = timeout_for(WORKFLOW_CONFIG['sql_statement_timeout'])
+
             conn = redshift_connector.connect(**self.config)
             cursor = conn.cursor()
 
             cursor.execute("SET search_path TO general_system")
+            # 남은 시간을 쿼리 타임아웃으로 적용 (밀리초)
+            cursor.execute(f"SET statement_timeout TO {max(1, int(statement_timeout * 1000))}")
 
             cursor.execute(query)
             results = cursor.fetchall()
@@ -0,0 +1,386 @@
+# local_retrieval.py
+
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from utils.retrieval_backend import (
+    LEXICAL_COLUMN_INNER_HITS,
+    SAMPLE_QUERY_SEARCH_FIELDS,
+    SAMPLE_QUERY_TERM_SEARCH_FIELDS,
+    SCHEMA_COLUMN_SEARCH_FIELDS,
+    SCHEMA_TABLE_SEARCH_FIELDS,
+    SEMANTIC_COLUMN_INNER_HITS,
+    TIE_BREAKER,
+    USER_FEEDBACK_SEARCH_FIELDS,
+    RetrievalBackend
+)
+
+# 로컬 엔진으로 내보내는 인덱스
+LOCAL_INDICES = ('database_schema', 'sample_queries', 'user_feedback_queries')
+MANIFEST_FILE = 'manifest.json'
+# lexical 스키마 검색의 inner_hits 기본 크기 (OpenSearch 기본값)
+LEXICAL_INNER_HITS_SIZE = 3
+
+_TOKEN_PATTERN = re.compile(r'[0-9a-z_]+|[가-힣]+')
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    BM25 색인/검색용 토큰 분리
+    소문자 영숫자 토큰과 한글 어절을 사용하고, 형태소 분석(nori) 대신 한글 어절의 2글자 단위 토큰을 추가해
+    조사가 붙은 어절도 부분 일치하도록 합니다.
+    """
+    tokens = []
+    for token in _TOKEN_PATTERN.findall(text.lower()):
+        tokens.append(token)
+        if len(token) > 2 and '가' <= token[0] <= '힣':
+            tokens.extend(token[i:i + 2] for i in range(len(token) - 1))
+    return tokens
+
+
+def _values_at(source, path: List[str]) -> List:
+    """점 경로의 값 목록 (경로 중간의 목록은 모든 항목을 따라감)"""
+    values = [source]
+    for key in path:
+        next_values = []
+        for value in values:
+            for item in (value if isinstance(value, list) else [value]):
+                if isinstance(item, dict) and item.get(key) is not None:
+                    next_values.append(item[key])
+        values = next_values
+
+    flattened = []
+    for value in values:
+        flattened.extend(value if isinstance(value, list) else [value])
+    return flattened
+
+
+def _field_text(source: Dict, path: List[str]) -> str:
+    return ' '.join(str(value) for value in _values_at(source, path) if not isinstance(value, dict))
+
+
+def _parse_field(field: str, prefix: str = '') -> Tuple[List[str], float]:
+    """"name^boost" 형식의 필드를 (nested 경로를 제외한 점 경로, 가중치)로 변환"""
+    name, _, boost = field.partition('^')
+    if prefix and name.startswith(prefix + '.'):
+        name = name[len(prefix) + 1:]
+    return name.split('.'), float(boost) if boost else 1.0
+
+
+class BM25Field:
+    def __init__(self, texts: List[str], k1: float = 1.2, b: float = 0.75):
+        """
+        필드 하나에 대한 BM25 역색인 (Lucene 기본값 k1=1.2, b=0.75)
+
+        Args:
+            texts (List[str]): 문서별 필드 텍스트
+        """
+        self.k1 = k1
+        self.b = b
+        self.size = len(texts)
+        self.lengths = np.zeros(self.size, dtype=np.float32)
+        self.postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+        postings = defaultdict(list)
+        for doc, text in enumerate(texts):
+            counts = Counter(tokenize(text))
+            self.lengths[doc] = sum(counts.values())
+            for term, frequency in counts.items():
+                postings[term].append((doc, frequency))
+        for term, entries in postings.items():
+            docs, frequencies = zip(*entries)
+            self.postings[term] = (np.array(docs, dtype=np.int64), np.array(frequencies, dtype=np.float32))
+        self.avg_length = float(self.lengths.mean()) if self.size else 0.0
+
+    def score(self, terms: Iterable[str]) -> np.ndarray:
+        """검색어 토큰에 대한 문서별 BM25 점수 (질의 토큰 점수 합)"""
+        scores = np.zeros(self.size, dtype=np.float32)
+        for term in terms:
+            if term not in self.postings:
+                continue
+            docs, frequencies = self.postings[term]
+            idf = math.log(1 + (self.size - len(docs) + 0.5) / (len(docs) + 0.5))
+            norm = self.k1 * (1 - self.b + self.b * self.lengths[docs] / (self.avg_length or 1.0))
+            scores[docs] += idf * frequencies * (self.k1 + 1) / (frequencies + norm)
+        return scores
+
+
+class MultiMatchIndex:
+    def __init__(self, documents: List[Dict], fields: List[str], tie_breaker: float = 0.0, prefix: str = ''):
+        """
+        multi_match(best_fields) 근사: 필드별 BM25 × 가중치 중 최고 점수 + tie_breaker × 나머지 필드 점수 합
+
+        Args:
+            documents (List[Dict]): 문서 (nested 검색이면 하위 문서)
+            fields (List[str]): "name^boost" 형식의 검색 필드
+            tie_breaker (float): 최고 점수 외 필드 반영 비율
+            prefix (str): nested 경로 (필드 이름에서 제외)
+        """
+        self.size = len(documents)
+        self.tie_breaker = tie_breaker
+        self.fields = []
+        for field in fields:
+            path, boost = _parse_field(field, prefix)
+            self.fields.append((BM25Field([_field_text(document, path) for document in documents]), boost))
+
+    def score(self, query: str) -> np.ndarray:
+        terms = tokenize(query)
+        if not self.size or not self.fields or not terms:
+            return np.zeros(self.size, dtype=np.float32)
+        field_scores = np.stack([field.score(terms) * boost for field, boost in self.fields])
+        best = field_scores.max(axis=0)
+        return best + self.tie_breaker * (field_scores.sum(axis=0) - best)
+
+
+def _flatten_nested(documents: List[Dict], path: str) -> Tuple[List[Dict], np.ndarray]:
+    """nested 경로의 하위 문서 목록과 하위 문서별 상위 문서 번호"""
+    children, parents = [], []
+    for doc, document in enumerate(documents):
+        for child in _values_at(document, path.split('.')):
+            if isinstance(child, dict):
+                children.append(child)
+                parents.append(doc)
+    return children, np.array(parents, dtype=np.int64)
+
+
+def _nested_avg(child_scores: np.ndarray, parents: np.ndarray, parent_count: int) -> np.ndarray:
+    """일치한 하위 문서 점수의 상위 문서별 평균 (nested 쿼리 score_mode avg)"""
+    matched = child_scores > 0
+    sums = np.zeros(parent_count, dtype=np.float32)
+    counts = np.zeros(parent_count, dtype=np.float32)
+    np.add.at(sums, parents[matched], child_scores[matched])
+    np.add.at(counts, parents[matched], 1)
+    return np.divide(sums, counts, out=np.zeros_like(sums), where=counts > 0)
+
+
+def _top(scores: np.ndarray, size: int) -> np.ndarray:
+    """점수가 0보다 큰 상위 size개 번호 (점수 내림차순)"""
+    candidates = np.nonzero(scores > 0)[0]
+    if size <= 0:
+        return candidates[:0]
+    if len(candidates) > size:
+        candidates = candidates[np.argpartition(-scores[candidates], size - 1)[:size]]
+    return candidates[np.argsort(-scores[candidates], kind='stable')]
+
+
+class _VectorIndex:
+    def __init__(self, path: str):
+        """
+        brute-force kNN 인덱스 (OpenSearch knn_vector 기본 l2 공간과 같은 점수 1 / (1 + 거리²))
+        벡터 행렬은 메모리 매핑으로 열고, 거리 계산용 제곱 노름만 미리 계산합니다.
+        """
+        self.vectors = np.load(path, mmap_mode='r')
+        self.norms = np.einsum('ij,ij->i', self.vectors, self.vectors) if len(self.vectors) else np.zeros(0)
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    def knn(self, embedding_vector: List[float], k: int) -> np.ndarray:
+        """상위 k개 벡터만 점수를 갖는 점수 배열 (나머지는 0)"""
+        scores = np.zeros(len(self), dtype=np.float32)
+        if not len(self):
+            return scores
+        query = np.asarray(embedding_vector, dtype=np.float32)
+        distances = np.maximum(self.norms - 2 * (self.vectors @ query) + query @ query, 0)
+        similarities = 1 / (1 + distances)
+        nearest = _top(similarities, k)
+        scores[nearest] = similarities[nearest]
+        return scores
+
+
+class _LocalIndex:
+    def __init__(self, directory: str, name: str):
+        """내보낸 인덱스 하나 (문서, 문서 벡터)"""
+        with open(os.path.join(directory, f"{name}.json"), 'r', encoding='utf-8') as f:
+            self.documents: List[Dict] = json.load(f)
+        self.sources = [document['_source'] for document in self.documents]
+        self.vectors = _VectorIndex(os.path.join(directory, f"{name}.npy"))
+
+    def response(self, scores: np.ndarray, size: int, inner_hits=None) -> Dict:
+        """점수 상위 문서를 OpenSearch 검색 응답 형식으로 변환"""
+        hits = []
+        for doc in _top(scores, size):
+            hit = {"_id": self.documents[doc]['_id'], "_score": float(scores[doc]), "_source": self.sources[doc]}
+            if inner_hits is not None:
+                hit["inner_hits"] = inner_hits(doc)
+            hits.append(hit)
+        return {"hits": {"total": {"value": len(hits)}, "hits": hits}}
+
+
+class LocalRetrievalBackend(RetrievalBackend):
+    """
+    프로세스 내 벡터/BM25 검색 백엔드
+    export_local_index로 내보낸 인덱스를 메모리에 올려 OpenSearch 왕복 없이 검색합니다.
+    (kNN은 brute-force, 한국어 분석은 2글자 단위 토큰으로 근사)
+    """
+    name = 'local'
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def _load(self) -> None:
+        """최초 검색 시 인덱스 로드 (파일이 없으면 FileNotFoundError)"""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            manifest_path = os.path.join(self.directory, MANIFEST_FILE)
+            if not os.path.exists(manifest_path):
+                raise FileNotFoundError(
+                    f"로컬 검색 인덱스가 없습니다: {manifest_path} "
+                    f"(OpenSearchManager.export_local_index로 먼저 내보내야 합니다)"
+                )
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                self.manifest = json.load(f)
+
+            schema = _LocalIndex(self.directory, 'database_schema')
+            self.schema = schema
+            self.schema_tables = MultiMatchIndex(schema.sources, SCHEMA_TABLE_SEARCH_FIELDS, TIE_BREAKER)
+            self.columns, self.column_parents = _flatten_nested(schema.sources, 'columns')
+            self.schema_columns = MultiMatchIndex(self.columns, SCHEMA_COLUMN_SEARCH_FIELDS, TIE_BREAKER, 'columns')
+            self.column_vectors = _VectorIndex(os.path.join(self.directory, 'database_schema_columns.npy'))
+            if len(self.column_vectors) != len(self.columns):
+                raise ValueError(
+                    f"컬럼 벡터 수({len(self.column_vectors)})와 컬럼 수({len(self.columns)})가 다릅니다. "
+                    f"로컬 검색 인덱스를 다시 내보내야 합니다."
+                )
+
+            queries = _LocalIndex(self.directory, 'sample_queries')
+            self.queries = queries
+            self.query_text = MultiMatchIndex(queries.sources, SAMPLE_QUERY_SEARCH_FIELDS, TIE_BREAKER)
+            terms, self.term_parents = _flatten_nested(queries.sources, 'keyword_variations.terms')
+            self.query_terms = MultiMatchIndex(terms, SAMPLE_QUERY_TERM_SEARCH_FIELDS,
+                                               prefix='keyword_variations.terms')
+
+            feedback = _LocalIndex(self.directory, 'user_feedback_queries')
+            self.feedback = feedback
+            self.feedback_text = MultiMatchIndex(feedback.sources, USER_FEEDBACK_SEARCH_FIELDS, TIE_BREAKER)
+            self._loaded = True
+
+    def _column_inner_hits(self, column_scores: np.ndarray, size: int, name: str):
+        """테이블별 일치 컬럼 inner_hits 생성 함수"""
+        columns_by_table = defaultdict(list)
+        for column in np.nonzero(column_scores > 0)[0]:
+            columns_by_table[self.column_parents[column]].append(column)
+
+        def inner_hits(doc: int) -> Dict:
+            matched = sorted(columns_by_table.get(doc, []), key=lambda column: -column_scores[column])[:size]
+            return {name: {"hits": {"hits": [
+                {"_score": float(column_scores[column]), "_source": self.columns[column]} for column in matched
+            ]}}}
+        return inner_hits
+
+    def lexical_schema_search(self, query: str, top_k: int) -> Dict:
+        self._load()
+        column_scores = self.schema_columns.score(query)
+        scores = self.schema_tables.score(query) + _nested_avg(column_scores, self.column_parents,
+                                                               len(self.schema.sources))
+        return self.schema.response(scores, top_k, self._column_inner_hits(column_scores, LEXICAL_INNER_HITS_SIZE,
+                                                                           LEXICAL_COLUMN_INNER_HITS))
+
+    def semantic_schema_search(self, embedding_vector: List[float], k: int) -> Dict:
+        self._load()
+        column_scores = self.column_vectors.knn(embedding_vector, k)
+        scores = self.schema.vectors.knn(embedding_vector, k) + _nested_avg(column_scores, self.column_parents,
+                                                                              len(self.schema.sources))
+        return self.schema.response(scores, k, self._column_inner_hits(column_scores, k, SEMANTIC_COLUMN_INNER_HITS))
+
+    def lexical_query_search(self, query: str, top_k: int) -> Dict:
+        self._load()
+        scores = self.query_text.score(query) + _nested_avg(self.query_terms.score(query), self.term_parents,
+                                                            len(self.queries.sources))
+        return self.queries.response(scores, top_k)
+
+    def semantic_query_search(self, embedding_vector: List[float], k: int) -> Dict:
+        self._load()
+        return self.queries.response(self.queries.vectors.knn(embedding_vector, k), k)
+
+    def lexical_user_feedback_query_search(self, query: str, top_k: int) -> Dict:
+        self._load()
+        return self.feedback.response(self.feedback_text.score(query), top_k)
+
+    def semantic_user_feedback_query_search(self, embedding_vector: List[float], k: int) -> Dict:
+        self._load()
+        return self.feedback.response(self.feedback.vectors.knn(embedding_vector, k), k)
+
+    def all_tables(self) -> Dict:
+        self._load()
+        hits = [{"_id": document['_id'], "_score": 1.0, "_source": document['_source']}
+                for document in self.schema.documents]
+        return {"hits": {"total": {"value": len(hits)}, "hits": hits}}
+
+    def schema_version(self) -> Tuple[Optional[str], Optional[Tuple]]:
+        self._load()
+        if not self.schema.sources:
+            return None, None
+        version_id = max((source.get('version_id') or '' for source in self.schema.sources), default='') or None
+        return version_id, (
+            version_id,
+            'local:' + os.path.abspath(self.directory),
+            len(self.schema.sources),
+            self.manifest.get('exported_at')
+        )
+
+
+def export_local_index(client, directory: str, dimension: int, indices: Iterable[str] = LOCAL_INDICES) -> Dict[str, int]:
+    """
+    OpenSearch 인덱스 문서를 로컬 검색 엔진 형식으로 내보냄
+    문서는 {index}.json (임베딩 제외), 벡터는 float32 행렬 {index}.npy로 저장하고
+    스키마 컬럼 벡터는 문서/컬럼 순서대로 database_schema_columns.npy에 저장합니다.
+
+    Args:
+        client: OpenSearch 클라이언트
+        directory (str): 저장 디렉터리
+        dimension (int): 임베딩 차원 (임베딩이 없는 문서는 0 벡터로 저장)
+        indices: 내보낼 인덱스
+
+    Returns:
+        Dict[str, int]: 인덱스별 내보낸 문서 수
+    """
+    from opensearchpy import helpers
+
+    os.makedirs(directory, exist_ok=True)
+    # 이전 매니페스트를 먼저 제거해 내보내는 도중의 파일이 로드되지 않도록 함
+    manifest_path = os.path.join(directory, MANIFEST_FILE)
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+
+    def _vector(embedding) -> List[float]:
+        return embedding if embedding and len(embedding) == dimension else [0.0] * dimension
+
+    counts = {}
+    for index in indices:
+        documents, vectors, column_vectors = [], [], []
+        if client.indices.exists(index=index):
+            for hit in helpers.scan(client, index=index, query={"query": {"match_all": {}}}):
+                source = hit['_source']
+                vectors.append(_vector(source.pop('embedding', None)))
+                if index == 'database_schema':
+                    for column in source.get('columns', []):
+                        column_vectors.append(_vector(column.pop('embedding', None)))
+                documents.append({"_id": hit['_id'], "_source": source})
+
+        with open(os.path.join(directory, f"{index}.json"), 'w', encoding='utf-8') as f:
+            json.dump(documents, f, ensure_ascii=False)
+        np.save(os.path.join(directory, f"{index}.npy"),
+                np.asarray(vectors, dtype=np.float32).reshape(len(vectors), dimension))
+        if index == 'database_schema':
+            np.save(os.path.join(directory, 'database_schema_columns.npy'),
+                    np.asarray(column_vectors, dtype=np.float32).reshape(len(column_vectors), dimension))
+        counts[index] = len(documents)
+
+    # 매니페스트는 마지막에 기록 (중간에 실패한 내보내기는 로드되지 않음)
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump({"dimension": dimension, "exported_at": time.time(), "documents": counts}, f)
+    return counts
@@ -0,0 +1,121 @@
+# model_router.py
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+
+from config import MODEL_ROUTING_CONFIG
+from utils.monitoring import current_monitor
+
+
+class ModelRouter:
+    def __init__(self, config: Optional[Dict] = None):
+        """
+        호출 유형별 모델 등급 라우터
+        빠른 등급 모델의 응답이 파싱/검증에 실패하면 상위 등급 모델로 자동 재호출합니다.
+
+        Args:
+            config (Dict): MODEL_ROUTING_CONFIG 형식의 설정
+        """
+        config = config or MODEL_ROUTING_CONFIG
+        self.enabled = config['enabled']
+        self.tiers = config['tiers']
+        self.escalation = config['escalation']
+        self.call_types = config['call_types']
+        self.default_tier = config['default_tier']
+        self._lock = threading.Lock()
+        self._tier_stats: Dict[str, Dict[str, float]] = {}
+
+    def tier_for(self, call_type: str) -> str:
+        """호출 유형에 해당하는 모델 등급 (라우팅 비활성화 시 기본 등급)"""
+        if not self.enabled:
+            return self.default_tier
+        return self.call_types.get(call_type, self.default_tier)
+
+    def model_for(self, call_type: str) -> str:
+        """호출 유형에 해당하는 모델 ID"""
+        return self.tiers[self.tier_for(call_type)]
+
+    def invoke(self, call_type: str, call: Callable[[str], Any],
+               validate: Optional[Callable[[Any], bool]] = None,
+               escalate_on: Tuple[Type[Exception], ...] = (ValueError,), performance_monitor=None) -> Any:
+        """
+        등급별 모델로 호출하고 결과가 유효하지 않으면 상위 등급으로 재호출
+
+        Args:
+            call_type (str): 호출 유형 (MODEL_ROUTING_CONFIG['call_types'] 키)
+            call: 모델 ID를 받아 파싱된 결과를 반환하는 함수
+            validate: 결과 유효성 검사 함수 (False이면 재호출)
+            escalate_on: 재호출 대상 예외 (파싱 오류 등, 그 외 예외는 그대로 전달)
+            performance_monitor: 등급별 지연 시간/재호출 지표를 기록할 PerformanceMonitor
+                (미지정 시 현재 실행 중인 워크플로우의 모니터, 공용 라우터이므로 호출마다 결정)
+
+        Returns:
+            Any: 마지막으로 호출한 등급의 결과 (최상위 등급은 검증 실패 시에도 반환)
+        """
+        if performance_monitor is None:
+            performance_monitor = current_monitor()
+        tier = self.tier_for(call_type)
+        while True:
+            next_tier = self.escalation.get(tier) if self.enabled else None
+            started_at = time.monotonic()
+            try:
+                result = call(self.tiers[tier])
+                error = None
+            except escalate_on as e:
+                result, error = None, e
+            latency = time.monotonic() - started_at
+
+            accepted = error is None and (validate is None or validate(result))
+            escalated = not accepted and next_tier is not None
+            self._record(call_type, tier, latency, escalated, performance_monitor)
+
+            if not escalated:
+                if error is not None:
+                    raise error
+                return result
+            # 상위 모델 재호출 여부는 ModelEscalation 지표와 등급별 통계로 기록
+            tier = next_tier
+
+    def _record(self, call_type: str, tier: str, latency: float, escalated: bool, performance_monitor=None) -> None:
+        """등급별 호출 통계 누적 및 PerformanceMonitor 지표 전달"""
+        with self._lock:
+            stats = self._tier_stats.setdefault(tier, {"calls": 0, "escalations": 0, "total_latency": 0.0})
+            stats["calls"] += 1
+            stats["escalations"] += int(escalated)
+            stats["total_latency"] += latency
+
+        if performance_monitor is not None:
+            dimensions = {"ModelTier": tier, "CallType": call_type}
+            performance_monitor.record_metrics([
+                ("ModelLatency", latency, 'Seconds'),
+                ("ModelEscalation", int(escalated), 'Count')
+            ], dimensions=dimensions)
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """등급별 호출 수, 평균 지연 시간, 재호출 비율"""
+        with self._lock:
+            return {
+                tier: {
+                    "model_id": self.tiers.get(tier),
+                    "calls": stats["calls"],
+                    "avg_latency": stats["total_latency"] / stats["calls"] if stats["calls"] else 0.0,
+                    "escalations": stats["escalations"],
+                    "escalation_rate": stats["escalations"] / stats["calls"] if stats["calls"] else 0.0
+                }
+                for tier, stats in self._tier_stats.items()
+            }
+
+
+_shared_model_router: Optional[ModelRouter] = None
+_shared_model_router_lock = threading.Lock()
+
+
+def get_model_router() -> ModelRouter:
+    """프로세스 공용 모델 라우터 반환"""
+    global _shared_model_router
+
+    with _shared_model_router_lock:
+        if _shared_model_router is None:
+            _shared_model_router = ModelRouter()
+        return _shared_model_router
@@ -1,21 +1,36 @@
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 import streamlit as st
+import threading
 import time
 import json
+from uuid import uuid4
 import boto3
 from config import AWS_REGION
 
+# 세션 동안 유지되는 모니터에 보관할 최근 개별 지표 수 (LLM 호출마다 기록되므로 상한 필요)
+MAX_CUSTOM_METRICS = 1000
+
 class PerformanceMonitor:
-    def __init__(self):
-        """성능 모니터링 초기화"""
+    def __init__(self, publish: bool = True):
+        """
+        성능 모니터링 초기화
+
+        Args:
+            publish (bool): CloudWatch 지표 전송 여부 (False이면 실행 시간만 기록, 일괄 실행의 질문별 모니터 등)
+        """
         self.metrics = []
-        self.cloudwatch = boto3.client('cloudwatch', region_name=AWS_REGION)
+        self.custom_metrics = deque(maxlen=MAX_CUSTOM_METRICS)  # record_metric으로 기록한 최근 개별 지표
+        self.cloudwatch = boto3.client('cloudwatch', region_name=AWS_REGION) if publish else None
         self.last_operation = None  # 마지막 작업 정보 저장용
 
     def start_operation(self, operation_name: str) -> str:
         """작업 시작 시간 기록"""
-        operation_id = f"{operation_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        # 같은 이름의 작업이 동시에 실행되어도 구분되도록 고유 접미사 추가
+        operation_id = f"{operation_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid4().hex}"
         metric = {
             "operation_id": operation_id,
             "operation_name": operation_name,
@@ -39,6 +54,8 @@ class PerformanceMonitor:
                     "result": result
                 })
                 self.last_operation = metric  # 마지막 작업 정보 업데이트
+                if self.cloudwatch is None:
+                    return
 
                 # CloudWatch에 지표 전송
                 try:
@@ -61,6 +78,56 @@ class PerformanceMonitor:
                 except Exception as e:
                     st.warning(f"CloudWatch 지표 전송 실패: {str(e)}")
 
+    def record_metric(self, metric_name: str, value: float, unit: str = 'Seconds',
+                      dimensions: Optional[Dict[str, str]] = None) -> None:
+        """작업 단위가 아닌 개별 지표 기록 및 전송 (모델 등급별 지연 시간 등)"""
+        self.record_metrics([(metric_name, value, unit)], dimensions)
+
+    def record_metrics(self, metrics: List[Tuple[str, float, str]],
+                       dimensions: Optional[Dict[str, str]] = None) -> None:
+        """
+        같은 차원의 개별 지표 여러 개를 기록하고 CloudWatch에는 한 번의 요청으로 백그라운드 전송
+
+        Args:
+            metrics (List[Tuple]): (지표 이름, 값, 단위) 목록
+            dimensions (Dict): 지표 차원
+        """
+        timestamp = datetime.now()
+        for metric_name, value, unit in metrics:
+            self.custom_metrics.append({
+                "metric_name": metric_name,
+                "value": value,
+                "unit": unit,
+                "dimensions": dimensions or {},
+                "timestamp": timestamp
+            })
+
+        metric_data = [
+            {
+                'MetricName': metric_name,
+                'Value': value,
+                'Unit': unit,
+                'Dimensions': [
+                    {'Name': name, 'Value': dimension_value}
+                    for name, dimension_value in (dimensions or {}).items()
+                ]
+            }
+            for metric_name, value, unit in metrics
+        ]
+
+        if self.cloudwatch is None:
+            return
+
+        def _put_metric_data():
+            try:
+                self.cloudwatch.put_metric_data(Namespace='TextToSQL', MetricData=metric_data)
+            except Exception as e:
+                # 백그라운드 스레드에는 Streamlit 실행 컨텍스트가 없으므로 화면 대신 로그로 출력
+                print(f"CloudWatch 지표 전송 실패: {str(e)}")
+
+        # LLM 호출마다 기록되므로 호출 경로가 지연되지 않도록 백그라운드에서 전송
+        threading.Thread(target=_put_metric_data, daemon=True).start()
+
     def get_last_duration(self) -> float:
         """가장 최근 작업의 실행 시간 반환"""
         if self.last_operation and "duration" in self.last_operation:
@@ -110,4 +177,23 @@ class PerformanceMonitor:
     def clear_metrics(self) -> None:
         """메트릭 데이터 초기화"""
         self.metrics = []
+        self.custom_metrics = deque(maxlen=MAX_CUSTOM_METRICS)
         self.last_operation = None
+
+
+_current_monitor: ContextVar[Optional[PerformanceMonitor]] = ContextVar('performance_monitor', default=None)
+
+
+@contextmanager
+def monitor_scope(monitor: PerformanceMonitor) -> Iterator[PerformanceMonitor]:
+    """현재 컨텍스트(스레드/코루틴)에서 실행 중인 워크플로우의 PerformanceMonitor 지정"""
+    token = _current_monitor.set(monitor)
+    try:
+        yield monitor
+    finally:
+        _current_monitor.reset(token)
+
+
+def current_monitor() -> Optional[PerformanceMonitor]:
+    """현재 컨텍스트의 PerformanceMonitor (워크플로우 노드 밖이면 None)"""
+    return _current_monitor.get()
@@ -7,11 +7,28 @@ def index_schema(client, embedder, schema_data: Dict, version_id: str = None) ->
     try:
         st.info("🔄 스키마 정보 인덱싱 중...")
         current_time = datetime.now().isoformat()
+        tables = schema_data['database_schema']['tables']
 
-        for table in schema_data['database_schema']['tables']:
-            # 테이블 정보에 대한 임베딩 생성
-            table_text = f"{table['table_name']} {table.get('description', '')}"
-            table_embedding = embedder.embed_query(table_text)
+        # 스키마 전체의 테이블/컬럼 텍스트를 모아 한 번에 임베딩 생성
+        texts = []
+        for table in tables:
+            texts.append(f"{table['table_name']} {table.get('description', '')}")
+            for column in table.get('columns', []):
+                texts.append(f"{column['name']} {column.get('description', '')}")
+
+        progress_bar = st.progress(0.0, text="임베딩 생성 중...")
+
+        def _on_progress(done: int, total: int):
+            progress_bar.progress(done / total, text=f"임베딩 생성 중... ({done}/{total})")
+
+        embeddings = embedder.embed_documents(texts, progress_callback=_on_progress)
+        position = 0
+
+        for table in tables:
+            # 테이블 정보 임베딩
+            table_text = texts[position]
+            table_embedding = embeddings[position]
+            position += 1
 
             # 테이블 정보 증강
             augmented_info = table.get('augmented_table_info', {})
@@ -78,8 +95,9 @@ def index_schema(client, embedder, schema_data: Dict, version_id: str = None) ->
             # 컬럼 정보 처리
             for column in table.get('columns', []):
                 augmented_column = column.get('augmented_column_info', {})
-                column_text = f"{column['name']} {column.get('description', '')}"
-                column_embedding = embedder.embed_query(column_text)
+                column_text = texts[position]
+                column_embedding = embeddings[position]
+                position += 1
 
                 column_doc = {
                     "name": column['name'],
@@ -167,6 +185,7 @@ def index_schema(client, embedder, schema_data: Dict, version_id: str = None) ->
                             "english": augmented_column.get('constraints', {}).get('description', {}).get('english', '')
                         }
                     },
+                    "search_text": column_text,
                     "embedding": column_embedding
                 }
                 document["columns"].append(column_doc)
@@ -4,6 +4,7 @@ from botocore.exceptions import ClientError
 import time
 from opensearchpy import OpenSearch, RequestsHttpConnection
 from config import REDSHIFT_CONFIG, AWS_REGION, OPENSEARCH_CONFIG
+from utils.embedding_profile import apply_embedding_profile
 import streamlit as st
 import json
 import os
@@ -62,7 +63,7 @@ class PackageManager:
         try:
             mapping_path = os.path.join('utils', 'opensearch_mappings', filename)
             with open(mapping_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+                return apply_embedding_profile(json.load(f))
         except Exception as e:
             st.error(f"매핑 파일 로드 중 오류 발생: {str(e)}")
             return {}
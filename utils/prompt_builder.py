@@ -0,0 +1,188 @@
+# prompt_builder.py
+
+from typing import Dict, List, Optional, Tuple
+
+from config import PROMPT_BUDGET_CONFIG
+from prompts import format_prompt
+from utils.token_counter import estimate_tokens
+
+
+class _PromptItem:
+    def __init__(self, score: float, variants: List[str]):
+        """
+        프롬프트 섹션의 항목 하나 (variants[0]이 원본, 뒤로 갈수록 압축된 표현)
+
+        Args:
+            score (float): hybrid_score 기반 관련도
+            variants (List[str]): 압축 단계별 직렬화 텍스트
+        """
+        self.score = score
+        self.variants = variants
+        self.tokens = [estimate_tokens(variant) for variant in variants]
+        self.level = 0
+        self.dropped = False
+
+    @property
+    def text(self) -> str:
+        return self.variants[self.level]
+
+    @property
+    def token_count(self) -> int:
+        # 목록 구분자(", ") 포함
+        return 0 if self.dropped else self.tokens[self.level] + 1
+
+
+class SQLPromptBuilder:
+    def __init__(self, max_prompt_tokens: Optional[int] = None, min_related_tables: Optional[int] = None,
+                 min_sample_queries: Optional[int] = None):
+        """
+        토큰 예산 안에서 SQL 생성 프롬프트를 구성하는 빌더
+        hybrid_score가 낮은 테이블/컬럼/예시부터 압축하거나 제외하여 예산에 맞춥니다.
+
+        Args:
+            max_prompt_tokens (int): 프롬프트 최대 토큰 수
+            min_related_tables (int): 항상 유지할 관련 테이블 수
+            min_sample_queries (int): 항상 유지할 샘플 쿼리 수
+        """
+        self.max_prompt_tokens = max_prompt_tokens or PROMPT_BUDGET_CONFIG['max_prompt_tokens']
+        self.min_related_tables = PROMPT_BUDGET_CONFIG['min_related_tables'] if min_related_tables is None else min_related_tables
+        self.min_sample_queries = PROMPT_BUDGET_CONFIG['min_sample_queries'] if min_sample_queries is None else min_sample_queries
+
+    @staticmethod
+    def _compress_table(table: Dict, keep_columns: set) -> Dict:
+        """관련 컬럼만 상세 정보를 유지하고 나머지 컬럼은 이름과 타입만 남김"""
+        return {
+            **table,
+            "columns": [
+                column if column.get('name') in keep_columns
+                else {"name": column.get('name'), "type": column.get('type')}
+                for column in table.get('columns', [])
+            ]
+        }
+
+    def _build_sections(self, database_schema: Dict) -> Dict[str, List[_PromptItem]]:
+        """섹션별 항목을 관련도 순으로 정렬하여 생성"""
+        schema = database_schema.get('database_schema', {}) or {}
+        related_tables = sorted(schema.get('related_tables', []) or [],
+                                key=lambda table: table.get('hybrid_score', 0), reverse=True)
+        table_scores = {table.get('table_name'): table.get('hybrid_score', 0) for table in related_tables}
+        related_columns = {
+            table.get('table_name'): {column.get('name') for column in table.get('related_columns', [])}
+            for table in related_tables
+        }
+
+        tables = sorted(schema.get('tables', []) or [],
+                        key=lambda table: table_scores.get(table.get('table_name'), 0), reverse=True)
+        sample_queries = sorted(database_schema.get('sample_queries', []) or [],
+                                key=lambda query: query.get('hybrid_score', 0), reverse=True)
+
+        return {
+            "tables": [
+                _PromptItem(table_scores.get(table.get('table_name'), 0), [
+                    str(table),
+                    str(self._compress_table(table, related_columns.get(table.get('table_name'), set()))),
+                    str(self._compress_table(table, set()))
+                ])
+                for table in tables
+            ],
+            "related_tables": [
+                _PromptItem(table.get('hybrid_score', 0), [str(table)]) for table in related_tables
+            ],
+            "sample_queries": [
+                _PromptItem(query.get('hybrid_score', 0), [str(query)]) for query in sample_queries
+            ]
+        }
+
+    def _reduction_steps(self, sections: Dict[str, List[_PromptItem]]):
+        """예산 초과 시 적용할 축소 단계 (관련도가 낮은 항목부터)"""
+        tables = list(reversed(sections["tables"]))
+        unrelated_tables = [item for item in tables if item.score <= 0]
+        relevant_tables = [item for item in tables if item.score > 0]
+        sample_queries = list(reversed(sections["sample_queries"]))
+        related_tables = list(reversed(sections["related_tables"]))
+
+        # 1. 검색되지 않은 테이블의 컬럼 상세 정보 압축
+        for item in unrelated_tables:
+            yield "tables", item, "compress", 2
+        # 2. 점수가 낮은 샘플 쿼리 제외
+        for item in sample_queries[:max(0, len(sample_queries) - self.min_sample_queries)]:
+            yield "sample_queries", item, "drop", None
+        # 3. 검색되지 않은 테이블 제외
+        for item in unrelated_tables:
+            yield "tables", item, "drop", None
+        # 4. 관련 테이블에서 관련 컬럼 외 상세 정보 압축
+        for item in relevant_tables:
+            yield "tables", item, "compress", 1
+        # 5. 점수가 낮은 관련 테이블 정보 제외
+        for item in related_tables[:max(0, len(related_tables) - self.min_related_tables)]:
+            yield "related_tables", item, "drop", None
+        # 6. 관련 테이블의 컬럼 상세 정보 전체 압축
+        for item in relevant_tables:
+            yield "tables", item, "compress", 2
+
+    @staticmethod
+    def _render(items: List[_PromptItem]) -> str:
+        return "[" + ", ".join(item.text for item in items if not item.dropped) + "]"
+
+    def build(self, template: str, question: str, database_schema: Dict) -> Tuple[str, Dict]:
+        """
+        토큰 예산에 맞춘 SQL 생성 프롬프트 구성
+
+        Args:
+            template (str): SQL 생성 프롬프트 템플릿
+            question (str): 사용자 질문
+            database_schema (Dict): integrated_search 결과
+
+        Returns:
+            Tuple[str, Dict]: (프롬프트, 섹션별 토큰 수 보고서)
+        """
+        sections = self._build_sections(database_schema)
+        fixed_tokens = estimate_tokens(format_prompt(
+            template, question=question, tables="[]", related_tables="[]", sample_queries="[]"
+        ))
+
+        def _section_tokens() -> Dict[str, int]:
+            return {name: sum(item.token_count for item in items) for name, items in sections.items()}
+
+        original_tokens = _section_tokens()
+        total_tokens = fixed_tokens + sum(original_tokens.values())
+        compressed = {name: 0 for name in sections}
+
+        if total_tokens > self.max_prompt_tokens:
+            for section, item, action, level in self._reduction_steps(sections):
+                if total_tokens <= self.max_prompt_tokens:
+                    break
+                before = item.token_count
+                if action == "drop":
+                    item.dropped = True
+                elif not item.dropped and item.level < level:
+                    if item.level == 0:
+                        compressed[section] += 1
+                    item.level = level
+                total_tokens += item.token_count - before
+
+        prompt = format_prompt(
+            template,
+            question=question,
+            tables=self._render(sections["tables"]),
+            related_tables=self._render(sections["related_tables"]),
+            sample_queries=self._render(sections["sample_queries"])
+        )
+
+        section_tokens = _section_tokens()
+        report = {
+            "budget": self.max_prompt_tokens,
+            "total": fixed_tokens + sum(section_tokens.values()),
+            "within_budget": total_tokens <= self.max_prompt_tokens,
+            "sections": {"fixed": fixed_tokens, **section_tokens},
+            "original_sections": {"fixed": fixed_tokens, **original_tokens},
+            "items": {
+                name: {
+                    "total": len(items),
+                    "kept": sum(1 for item in items if not item.dropped),
+                    "compressed": compressed[name]
+                }
+                for name, items in sections.items()
+            }
+        }
+        return prompt, report
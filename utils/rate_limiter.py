@@ -0,0 +1,268 @@
+# rate_limiter.py
+
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+import boto3
+from botocore.exceptions import ClientError
+
+from config import AWS_REGION, BEDROCK_RATE_LIMIT_CONFIG
+from utils.deadline import raise_deadline_exceeded, remaining_time
+
+
+class RateLimiter:
+    def __init__(self, requests_per_second: float, burst: int = 1):
+        """
+        토큰 버킷 방식의 초당 요청 수 제한기 (스레드 안전)
+
+        Args:
+            requests_per_second (float): 초당 허용 요청 수 (0 이하이면 제한 없음)
+            burst (int): 순간적으로 허용되는 최대 요청 수
+        """
+        self.rate = requests_per_second
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated_at
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated_at = now
+
+    def acquire(self) -> float:
+        """
+        토큰 하나를 획득할 때까지 대기
+
+        Returns:
+            float: 대기한 시간 (초)
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        started_at = time.monotonic()
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return now - started_at
+                wait_time = (1 - self._tokens) / self.rate
+            time.sleep(wait_time)
+
+
+# Bedrock 호출 우선순위 (값이 작을수록 먼저 처리)
+PRIORITY_INTERACTIVE = 0
+PRIORITY_AUGMENTATION = 1
+
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: 'interactive',
+    PRIORITY_AUGMENTATION: 'augmentation'
+}
+
+
+class AdaptiveRateLimiter(RateLimiter):
+    def __init__(self, name: str, initial_rate: float, min_rate: float, max_rate: float,
+                 increase_step: float, decrease_factor: float, burst: int = 1):
+        """
+        우선순위 대기열과 AIMD(가산 증가/승산 감소) 방식의 적응형 토큰 버킷 제한기
+
+        Args:
+            name (str): 제한기 이름 (모델 ID)
+            initial_rate (float): 초기 초당 요청 수
+            min_rate (float): 최소 초당 요청 수
+            max_rate (float): 최대 초당 요청 수
+            increase_step (float): 성공 시 증가시킬 초당 요청 수
+            decrease_factor (float): 스로틀링 발생 시 곱할 감소 비율
+            burst (int): 순간적으로 허용되는 최대 요청 수
+        """
+        super().__init__(requests_per_second=initial_rate, burst=burst)
+        self.name = name
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self._cond = threading.Condition(self._lock)
+        self._waiters = []
+        self._sequence = itertools.count()
+        self._wait_stats = {}
+        self._throttle_count = 0
+
+    def acquire(self, priority: int = PRIORITY_INTERACTIVE, timeout: Optional[float] = None) -> float:
+        """
+        우선순위에 따라 토큰 하나를 획득할 때까지 대기
+
+        Args:
+            priority (int): 호출 우선순위 (PRIORITY_INTERACTIVE가 가장 높음)
+            timeout (float): 최대 대기 시간 (초과 시 TimeoutError)
+
+        Returns:
+            float: 대기열에서 기다린 시간 (초)
+        """
+        started_at = time.monotonic()
+        entry = (priority, next(self._sequence))
+
+        with self._cond:
+            heapq.heappush(self._waiters, entry)
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    is_head = self._waiters[0] == entry
+                    if is_head and self._tokens >= 1:
+                        heapq.heappop(self._waiters)
+                        self._tokens -= 1
+                        break
+
+                    wait_time = (1 - self._tokens) / self.rate if is_head else None
+                    if timeout is not None:
+                        remaining = timeout - (now - started_at)
+                        if remaining <= 0:
+                            self._waiters.remove(entry)
+                            heapq.heapify(self._waiters)
+                            raise TimeoutError(f"{self.name} 호출 대기 시간 초과 ({timeout:.1f}초)")
+                        wait_time = remaining if wait_time is None else min(wait_time, remaining)
+                    self._cond.wait(wait_time)
+            finally:
+                self._cond.notify_all()
+
+            waited = time.monotonic() - started_at
+            stats = self._wait_stats.setdefault(priority, {"count": 0, "total_wait": 0.0, "max_wait": 0.0})
+            stats["count"] += 1
+            stats["total_wait"] += waited
+            stats["max_wait"] = max(stats["max_wait"], waited)
+
+        _publish_limiter_metrics_if_due()
+        return waited
+
+    def on_success(self) -> None:
+        """호출 성공 시 허용 속도를 가산 증가"""
+        with self._cond:
+            self.rate = min(self.max_rate, self.rate + self.increase_step)
+
+    def on_throttle(self) -> None:
+        """스로틀링 발생 시 허용 속도를 승산 감소하고 남은 토큰을 비움"""
+        with self._cond:
+            self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+            self._tokens = min(self._tokens, 0.0)
+            self._throttle_count += 1
+
+    def get_metrics(self) -> Dict:
+        """현재 속도, 스로틀링 횟수, 우선순위별 대기 시간 지표 반환"""
+        with self._cond:
+            return {
+                "name": self.name,
+                "rate": self.rate,
+                "throttle_count": self._throttle_count,
+                "queue_length": len(self._waiters),
+                "queue_wait": {
+                    PRIORITY_NAMES.get(priority, str(priority)): {
+                        **stats,
+                        "avg_wait": stats["total_wait"] / stats["count"] if stats["count"] else 0.0
+                    }
+                    for priority, stats in self._wait_stats.items()
+                }
+            }
+
+
+_bedrock_limiters: Dict[str, AdaptiveRateLimiter] = {}
+_bedrock_limiters_lock = threading.Lock()
+_last_metrics_publish = time.monotonic()
+
+
+def get_bedrock_limiter(model_id: str) -> AdaptiveRateLimiter:
+    """모델 ID별 프로세스 공용 Bedrock 제한기 반환"""
+    with _bedrock_limiters_lock:
+        if model_id not in _bedrock_limiters:
+            limit_config = {
+                **BEDROCK_RATE_LIMIT_CONFIG['default'],
+                **BEDROCK_RATE_LIMIT_CONFIG['models'].get(model_id, {})
+            }
+            _bedrock_limiters[model_id] = AdaptiveRateLimiter(name=model_id, **limit_config)
+        return _bedrock_limiters[model_id]
+
+
+def get_bedrock_limiter_metrics() -> List[Dict]:
+    """모든 Bedrock 제한기의 지표 반환"""
+    with _bedrock_limiters_lock:
+        limiters = list(_bedrock_limiters.values())
+    return [limiter.get_metrics() for limiter in limiters]
+
+
+def is_throttling_error(error: Exception) -> bool:
+    """Bedrock 스로틀링 오류 여부 확인"""
+    if isinstance(error, ClientError):
+        return error.response.get('Error', {}).get('Code') in ('ThrottlingException', 'TooManyRequestsException')
+    return "ThrottlingException" in str(error)
+
+
+@contextmanager
+def bedrock_call(model_id: str, priority: int = PRIORITY_INTERACTIVE):
+    """
+    Bedrock 호출을 공용 제한기로 감싸는 컨텍스트 매니저
+    호출 결과에 따라 제한기의 허용 속도를 조정합니다.
+
+    Args:
+        model_id (str): 호출할 Bedrock 모델 ID
+        priority (int): 호출 우선순위
+    """
+    limiter = get_bedrock_limiter(model_id)
+    try:
+        # 대기열에서는 요청 마감 시간까지만 대기
+        limiter.acquire(priority, timeout=remaining_time())
+    except TimeoutError:
+        raise_deadline_exceeded(f"요청 마감 시간 안에 {model_id} 호출 순서가 돌아오지 않았습니다.")
+    try:
+        yield limiter
+    except Exception as e:
+        if is_throttling_error(e):
+            limiter.on_throttle()
+        raise
+    else:
+        limiter.on_success()
+
+
+def _publish_limiter_metrics_if_due() -> None:
+    """주기적으로 제한기 대기 시간 지표를 CloudWatch에 전송"""
+    global _last_metrics_publish
+
+    interval = BEDROCK_RATE_LIMIT_CONFIG['metrics_publish_interval']
+    with _bedrock_limiters_lock:
+        now = time.monotonic()
+        if interval <= 0 or now - _last_metrics_publish < interval:
+            return
+        _last_metrics_publish = now
+
+    metric_data = []
+    for metrics in get_bedrock_limiter_metrics():
+        for priority_name, stats in metrics["queue_wait"].items():
+            metric_data.append({
+                'MetricName': 'BedrockQueueWait',
+                'Value': stats["avg_wait"],
+                'Unit': 'Seconds',
+                'Dimensions': [
+                    {'Name': 'ModelId', 'Value': metrics["name"]},
+                    {'Name': 'Priority', 'Value': priority_name}
+                ]
+            })
+        metric_data.append({
+            'MetricName': 'BedrockAllowedRate',
+            'Value': metrics["rate"],
+            'Unit': 'Count/Second',
+            'Dimensions': [{'Name': 'ModelId', 'Value': metrics["name"]}]
+        })
+
+    def _put_metric_data():
+        try:
+            cloudwatch = boto3.client('cloudwatch', region_name=AWS_REGION)
+            cloudwatch.put_metric_data(Namespace='TextToSQL', MetricData=metric_data)
+        except Exception as e:
+            print(f"Bedrock 제한기 지표 전송 실패: {str(e)}")
+
+    # 호출 경로가 지연되지 않도록 백그라운드에서 전송
+    threading.Thread(target=_put_metric_data, daemon=True).start()
@@ -0,0 +1,50 @@
+# result_store.py
+
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from uuid import uuid4
+
+from config import WORKFLOW_CONFIG
+
+
+class ResultStore:
+    def __init__(self, max_entries: Optional[int] = None):
+        """
+        SQL 실행 결과 행 저장소 (워크플로우 상태에는 참조 ID만 보관)
+        노드 간 상태 전달과 스트림 이벤트에서 결과 행 목록을 복사하지 않도록 합니다.
+        완료된 요청의 결과는 pop으로 꺼내며, 오류로 꺼내지 못한 결과는 오래된 순으로 제거됩니다.
+
+        Args:
+            max_entries (int): 최대 보관 결과 수 (미지정 시 WORKFLOW_CONFIG['result_store_max_entries'])
+        """
+        self.max_entries = max_entries or WORKFLOW_CONFIG['result_store_max_entries']
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, rows: List[Dict]) -> str:
+        """결과 행 저장 후 참조 ID 반환"""
+        ref = str(uuid4())
+        with self._lock:
+            self._entries[ref] = rows
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return ref
+
+    def get(self, ref: Optional[str]) -> List[Dict]:
+        """참조 ID의 결과 행 (없으면 빈 목록)"""
+        if ref is None:
+            return []
+        with self._lock:
+            return self._entries.get(ref, [])
+
+    def pop(self, ref: Optional[str]) -> List[Dict]:
+        """참조 ID의 결과 행을 꺼내고 저장소에서 제거"""
+        if ref is None:
+            return []
+        with self._lock:
+            return self._entries.pop(ref, [])
+
+    def size(self) -> int:
+        with self._lock:
+            return len(self._entries)
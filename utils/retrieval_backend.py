@@ -0,0 +1,189 @@
+# retrieval_backend.py
+
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+
+from config import RETRIEVAL_CONFIG
+from utils.search_payload import TABLE_CATALOG_FIELDS
+
+
+# lexical 검색 필드와 가중치 (OpenSearch 검색 본문과 로컬 BM25 엔진 공용)
+SCHEMA_TABLE_SEARCH_FIELDS = [
+    "table_info.name^4",
+    "table_info.description.korean^3",
+    "table_info.description.english^2",
+    "table_info.business_context.korean^3",
+    "table_info.business_context.english^2",
+    "table_info.technical_context.korean^2",
+    "table_info.technical_context.english^2",
+    "table_info.synonyms.table_name.korean^2",
+    "table_info.synonyms.table_name.english^2",
+    "table_info.synonyms.business_terms.korean^2",
+    "table_info.synonyms.business_terms.english^2",
+    "table_info.related_terms.korean^1.5",
+    "table_info.related_terms.english^1.5",
+    "search_text"
+]
+SCHEMA_COLUMN_SEARCH_FIELDS = [
+    "columns.name^4",
+    "columns.description.korean^3",
+    "columns.description.english^2",
+    "columns.business_context.korean^3",
+    "columns.business_context.english^2",
+    "columns.technical_context.korean^2",
+    "columns.technical_context.english^2",
+    "columns.synonyms.column_name.korean^2",
+    "columns.synonyms.column_name.english^2",
+    "columns.synonyms.value_meanings.values.value^2",
+    "columns.synonyms.value_meanings.values.korean^2",
+    "columns.synonyms.value_meanings.values.english^1.5"
+]
+SAMPLE_QUERY_SEARCH_FIELDS = [
+    "description.korean^3",
+    "description.english^2",
+    "business_purpose.korean^3",
+    "business_purpose.english^2",
+    "technical_details.korean^2",
+    "technical_details.english^2",
+    "natural_language_variations.korean^2",
+    "natural_language_variations.english^2",
+    "search_text"
+]
+SAMPLE_QUERY_TERM_SEARCH_FIELDS = [
+    "keyword_variations.terms.base_term.korean^2",
+    "keyword_variations.terms.base_term.english^2",
+    "keyword_variations.terms.variations.korean^1.5",
+    "keyword_variations.terms.variations.english^1.5"
+]
+USER_FEEDBACK_SEARCH_FIELDS = [
+    "natural_language^3",
+    "sql^2"
+]
+# best_fields 점수 계산 시 최고 점수 외 필드 반영 비율
+TIE_BREAKER = 0.3
+# 스키마 검색의 컬럼 inner_hits 이름 (hybrid 쿼리에 두 nested 쿼리가 함께 들어가므로 서로 달라야 함)
+LEXICAL_COLUMN_INNER_HITS = "lexical_columns"
+SEMANTIC_COLUMN_INNER_HITS = "semantic_columns"
+
+
+class RetrievalBackend(ABC):
+    """
+    검색 백엔드 인터페이스
+    모든 검색은 OpenSearch 검색 응답과 같은 형식({"hits": {"hits": [...]}})을 반환하므로
+    OpenSearchManager의 결과 처리/점수 결합 코드는 백엔드와 관계없이 동일하게 동작합니다.
+    """
+    name = ''
+
+    @abstractmethod
+    def lexical_schema_search(self, query: str, top_k: int) -> Dict:
+        raise NotImplementedError
+
+    @abstractmethod
+    def semantic_schema_search(self, embedding_vector: List[float], k: int) -> Dict:
+        raise NotImplementedError
+
+    @abstractmethod
+    def lexical_query_search(self, query: str, top_k: int) -> Dict:
+        raise NotImplementedError
+
+    @abstractmethod
+    def semantic_query_search(self, embedding_vector: List[float], k: int) -> Dict:
+        raise NotImplementedError
+
+    @abstractmethod
+    def lexical_user_feedback_query_search(self, query: str, top_k: int) -> Dict:
+        raise NotImplementedError
+
+    @abstractmethod
+    def semantic_user_feedback_query_search(self, embedding_vector: List[float], k: int) -> Dict:
+        raise NotImplementedError
+
+    @abstractmethod
+    def all_tables(self) -> Dict:
+        """전체 테이블 문서 (카탈로그 구성용)"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def schema_version(self) -> Tuple[Optional[str], Optional[Tuple]]:
+        """최신 스키마 버전 ID와 인덱스 세대"""
+        raise NotImplementedError
+
+
+class OpenSearchBackend(RetrievalBackend):
+    """OpenSearch 클러스터 검색 백엔드 (검색 본문은 OpenSearchManager에서 구성)"""
+    name = 'opensearch'
+
+    def __init__(self, manager):
+        self.manager = manager
+
+    def lexical_schema_search(self, query: str, top_k: int) -> Dict:
+        return self.manager._search('database_schema', self.manager._lexical_schema_search_body(query, top_k),
+                                    'lexical_schema_search')
+
+    def semantic_schema_search(self, embedding_vector: List[float], k: int) -> Dict:
+        return self.manager._search("database_schema", self.manager._semantic_schema_search_body(embedding_vector),
+                                    'semantic_schema_search')
+
+    def lexical_query_search(self, query: str, top_k: int) -> Dict:
+        return self.manager._search('sample_queries', self.manager._lexical_query_search_body(query, top_k),
+                                    'lexical_query_search')
+
+    def semantic_query_search(self, embedding_vector: List[float], k: int) -> Dict:
+        return self.manager._search("sample_queries", self.manager._semantic_query_search_body(embedding_vector),
+                                    'semantic_query_search')
+
+    def lexical_user_feedback_query_search(self, query: str, top_k: int) -> Dict:
+        return self.manager._search('user_feedback_queries',
+                                    self.manager._lexical_user_feedback_query_search_body(query, top_k),
+                                    'lexical_user_feedback_query_search')
+
+    def semantic_user_feedback_query_search(self, embedding_vector: List[float], k: int) -> Dict:
+        return self.manager._search("user_feedback_queries",
+                                    self.manager._semantic_user_feedback_query_search_body(embedding_vector),
+                                    'semantic_user_feedback_query_search')
+
+    def all_tables(self) -> Dict:
+        total_table_count = self.manager._count_all_tables()
+        search_body = {
+            "size": total_table_count,
+            "_source": self.manager._source_fields(TABLE_CATALOG_FIELDS),
+            "query": {
+                "match_all": {}
+            }
+        }
+        return self.manager._search("database_schema", search_body, 'search_all_tables')
+
+    def schema_version(self) -> Tuple[Optional[str], Optional[Tuple]]:
+        response = self.manager.client.search(
+            index='database_schema',
+            body={
+                "size": 1,
+                "_source": ["version_id"],
+                "query": {"match_all": {}},
+                "sort": [{"version_id": {"order": "desc"}}],
+                # 같은 버전으로 재인덱싱하거나 인덱스를 교체한 경우도 구분하기 위한 세대 정보
+                "track_total_hits": True,
+                "aggs": {"last_updated": {"max": {"field": "updated_at"}}}
+            }
+        )
+        hits = response['hits']['hits']
+        if not hits:
+            return None, None
+        version_id = hits[0]['_source'].get('version_id')
+        return version_id, (
+            version_id,
+            hits[0]['_index'],
+            response['hits']['total']['value'],
+            response.get('aggregations', {}).get('last_updated', {}).get('value')
+        )
+
+
+def create_retrieval_backend(manager) -> RetrievalBackend:
+    """설정(RETRIEVAL_CONFIG['backend'])에 따른 검색 백엔드 생성"""
+    backend = RETRIEVAL_CONFIG['backend']
+    if backend == 'opensearch':
+        return OpenSearchBackend(manager)
+    if backend == 'local':
+        from utils.local_retrieval import LocalRetrievalBackend
+        return LocalRetrievalBackend(RETRIEVAL_CONFIG['local_path'])
+    raise ValueError(f"지원하지 않는 검색 백엔드입니다: {backend}")
@@ -0,0 +1,78 @@
+# schema_catalog.py
+
+import threading
+from typing import Callable, Dict, Hashable, List, Optional
+
+from config import OPENSEARCH_CONFIG
+from utils.search_context import SingleFlight
+
+
+class SchemaCatalogCache:
+    def __init__(self):
+        """
+        전체 테이블 카탈로그 캐시 (스키마 인덱스 세대별)
+        세대(버전 ID, 실제 인덱스, 문서 수, 마지막 갱신 시각)가 같으면 OpenSearch에서 다시 읽지 않고,
+        세대가 바뀌거나 invalidate가 호출되면 다음 조회 때 다시 적재합니다.
+        """
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        self._generation: Optional[Hashable] = None
+        self._tables: Optional[List[Dict]] = None
+        self._epoch = 0  # 적재 중 무효화된 결과를 저장하지 않기 위한 카운터
+
+    def get_or_load(self, generation: Optional[Hashable], loader: Callable[[], List[Dict]]) -> List[Dict]:
+        """
+        세대에 해당하는 카탈로그 반환 (없으면 loader로 적재, 동시 적재는 하나로 합침)
+
+        Args:
+            generation: 스키마 인덱스 세대 (None이면 캐시하지 않고 매번 적재)
+            loader: 전체 테이블 목록을 읽어오는 함수
+        """
+        if generation is None:
+            return loader()
+
+        with self._lock:
+            if self._tables is not None and self._generation == generation:
+                self.hits += 1
+                return list(self._tables)
+            self.misses += 1
+            epoch = self._epoch
+
+        tables = self._flight.do(generation, loader)
+        with self._lock:
+            if epoch == self._epoch:
+                self._generation, self._tables = generation, tables
+        return list(tables)
+
+    def invalidate(self) -> None:
+        """스키마 재인덱싱/인덱스 삭제 시 캐시 폐기"""
+        with self._lock:
+            self._epoch += 1
+            self._generation, self._tables = None, None
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "tables": len(self._tables) if self._tables is not None else 0
+            }
+
+
+_shared_schema_catalog: Optional[SchemaCatalogCache] = None
+_shared_schema_catalog_lock = threading.Lock()
+
+
+def get_schema_catalog() -> Optional[SchemaCatalogCache]:
+    """설정에 따른 프로세스 공용 카탈로그 캐시 반환 (비활성화 시 None)"""
+    global _shared_schema_catalog
+
+    if not OPENSEARCH_CONFIG['schema_catalog_cache']:
+        return None
+
+    with _shared_schema_catalog_lock:
+        if _shared_schema_catalog is None:
+            _shared_schema_catalog = SchemaCatalogCache()
+        return _shared_schema_catalog
@@ -0,0 +1,108 @@
+# search_context.py
+
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+
+class SingleFlight:
+    """동일한 키에 대한 동시 호출을 하나의 실행으로 합치는 헬퍼"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Hashable, Future] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        키별로 한 번만 fn을 실행하고, 실행 중 들어온 호출은 같은 결과를 기다립니다.
+
+        Args:
+            key: 호출 식별 키
+            fn: 실제 실행할 함수
+        """
+        with self._lock:
+            future = self._in_flight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._in_flight[key] = future
+
+        if not is_leader:
+            return future.result()
+
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+        return future.result()
+
+
+class SearchCancelled(Exception):
+    """취소 토큰에 의해 중단된 검색"""
+
+
+class CancelToken:
+    """요청 단위 취소 신호 - 취소 시 등록된 콜백을 한 번씩 호출"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._callbacks: List[Callable[[], None]] = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def cancel(self) -> None:
+        """취소 상태로 전환하고 대기 중인 콜백 호출"""
+        with self._lock:
+            if self._cancelled:
+                return
+            self._cancelled = True
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def add_callback(self, callback: Callable[[], None]) -> None:
+        """취소 시 호출할 콜백 등록 (이미 취소된 경우 즉시 호출)"""
+        with self._lock:
+            if not self._cancelled:
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def raise_if_cancelled(self) -> None:
+        if self._cancelled:
+            raise SearchCancelled()
+
+
+class SearchContext:
+    def __init__(self, query: str, embed_fn: Callable[[str], Optional[List[float]]],
+                 cancel_token: Optional[CancelToken] = None):
+        """
+        요청 단위 검색 컨텍스트 - 질문 임베딩을 한 번만 계산하여 모든 시맨틱 검색에서 공유
+
+        Args:
+            query (str): 사용자 질문
+            embed_fn: 텍스트 임베딩 함수
+            cancel_token (CancelToken): 검색 취소 신호 (취소 후에는 임베딩을 계산하지 않음)
+        """
+        self.query = query
+        self._embed_fn = embed_fn
+        self.cancel_token = cancel_token
+        self._lock = threading.Lock()
+        self._computed = False
+        self._embedding = None
+
+    def get_embedding(self) -> Optional[List[float]]:
+        """질문 임베딩 반환 (최초 호출 시에만 계산)"""
+        with self._lock:
+            if not self._computed:
+                if self.cancel_token is not None:
+                    self.cancel_token.raise_if_cancelled()
+                self._embedding = self._embed_fn(self.query)
+                self._computed = True
+            return self._embedding
@@ -0,0 +1,120 @@
+# search_payload.py
+
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+
+# 응답 처리 함수별로 사용하는 _source 필드 (그 외 필드와 임베딩 벡터는 응답에서 제외)
+SCHEMA_TABLE_FIELDS = ["table_info.name", "table_info.description.korean"]
+SCHEMA_COLUMN_FIELDS = [
+    "columns.name",
+    "columns.type",
+    "columns.description.korean",
+    "columns.examples",
+    "columns.valid_values"
+]
+TABLE_CATALOG_FIELDS = SCHEMA_TABLE_FIELDS + SCHEMA_COLUMN_FIELDS
+SAMPLE_QUERY_FIELDS = ["query", "description.korean"]
+USER_FEEDBACK_QUERY_FIELDS = ["natural_language", "sql"]
+
+
+class PayloadMeter:
+    """OpenSearch 응답 본문 크기와 JSON 디코딩 시간 측정 (transport deserializer 래퍼)"""
+
+    def __init__(self, deserializer):
+        self._deserializer = deserializer
+        self._local = threading.local()
+
+    def loads(self, s, mimetype: Optional[str] = None) -> Any:
+        started_at = time.perf_counter()
+        data = self._deserializer.loads(s, mimetype)
+        self._local.last = {
+            "bytes": len(s.encode('utf-8')) if isinstance(s, str) else len(s),
+            "decode_seconds": time.perf_counter() - started_at
+        }
+        return data
+
+    def pop_last(self) -> Optional[Dict[str, float]]:
+        """현재 스레드에서 마지막으로 디코딩한 응답의 측정값 (한 번만 반환)"""
+        last = getattr(self._local, 'last', None)
+        self._local.last = None
+        return last
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._deserializer, name)
+
+
+class PayloadStats:
+    """검색 종류별 응답 크기/디코딩 시간 누적"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def record(self, operation: str, measurement: Optional[Dict[str, float]]) -> None:
+        if measurement is None:
+            return
+        with self._lock:
+            stats = self._stats.setdefault(operation, {"requests": 0, "bytes": 0, "decode_seconds": 0.0})
+            stats["requests"] += 1
+            stats["bytes"] += measurement["bytes"]
+            stats["decode_seconds"] += measurement["decode_seconds"]
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """검색 종류별 요청 수, 평균 응답 크기(바이트), 평균 디코딩 시간(초)"""
+        with self._lock:
+            return {
+                operation: {
+                    "requests": stats["requests"],
+                    "avg_bytes": stats["bytes"] / stats["requests"],
+                    "avg_decode_seconds": stats["decode_seconds"] / stats["requests"]
+                }
+                for operation, stats in self._stats.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats = {}
+
+
+def compare_source_filtering(opensearch_manager, queries: List[str], top_k: int = 5) -> Dict[str, Any]:
+    """
+    _source 필터링 전후의 검색 응답 크기와 디코딩 시간 비교
+
+    Args:
+        opensearch_manager: OpenSearchManager
+        queries (List[str]): 측정에 사용할 질문 목록
+        top_k (int): 검색 결과 수
+
+    Returns:
+        Dict: {"before": 필터링 없이 측정한 검색 종류별 통계, "after": 필터링 적용 통계}
+    """
+    source_filtering = opensearch_manager.source_filtering
+    results = {}
+    try:
+        for label, enabled in (("before", False), ("after", True)):
+            opensearch_manager.source_filtering = enabled
+            opensearch_manager.payload_stats.reset()
+            for query in queries:
+                embedding = opensearch_manager._get_query_embedding(query)
+                searches = [
+                    lambda: opensearch_manager._lexical_schema_search(query, top_k),
+                    lambda: opensearch_manager._semantic_schema_search(query, embedding),
+                    lambda: opensearch_manager._lexical_query_search(query, top_k),
+                    lambda: opensearch_manager._semantic_query_search(query, embedding),
+                    lambda: opensearch_manager._lexical_user_feedback_query_search(query, top_k),
+                    lambda: opensearch_manager._semantic_user_feedback_query_search(query, embedding)
+                ]
+                for search in searches:
+                    try:
+                        search()
+                    except Exception as e:
+                        # 인덱스가 없는 검색(사용자 피드백 등)은 측정에서 제외
+                        print(f"응답 크기 측정 중 검색 오류 발생: {str(e)}")
+            opensearch_manager._search_all_tables()
+            results[label] = opensearch_manager.payload_stats.summary()
+    finally:
+        opensearch_manager.source_filtering = source_filtering
+        opensearch_manager.payload_stats.reset()
+    return results
@@ -0,0 +1,135 @@
+# streaming_json.py
+
+import json
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+class IncrementalJSONParser:
+    def __init__(self, watch_fields: Iterable[str] = ('sql',)):
+        """
+        스트리밍 응답에서 최상위 JSON 객체를 점진적으로 파싱하는 파서
+        지정한 최상위 필드(문자열/객체/배열)가 완성되는 즉시 값을 반환하고, 객체가 닫히면 완료로 표시합니다.
+
+        Args:
+            watch_fields: 완성 즉시 추출할 최상위 필드 이름 목록
+        """
+        self.watch_fields = set(watch_fields)
+        self.fields: Dict[str, Any] = {}
+        self.complete = False
+        self._text = []
+        self._length = 0
+        self._start = None
+        self._end = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = None
+        self._string_chars: List[str] = []
+        self._expect_key = False
+        self._last_key = None
+        self._value_start = None
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """
+        텍스트 조각을 입력하고 이번 조각에서 새로 완성된 감시 필드 목록을 반환
+
+        Args:
+            chunk (str): 스트리밍으로 수신한 텍스트 조각
+
+        Returns:
+            List[Tuple[str, Any]]: (필드 이름, 값) 목록
+        """
+        completed = []
+        if self.complete:
+            return completed
+
+        self._text.append(chunk)
+        for offset, char in enumerate(chunk):
+            position = self._length + offset
+
+            if self._in_string:
+                self._string_chars.append(char)
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    field = self._on_string_end()
+                    if field:
+                        completed.append(field)
+                continue
+
+            if self._start is None:
+                # 객체 시작 전의 텍스트는 무시
+                if char == '{':
+                    self._start = position
+                    self._depth = 1
+                    self._expect_key = True
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_chars = ['"']
+            elif char in '{[':
+                if self._depth == 1 and not self._expect_key:
+                    # 최상위 필드의 객체/배열 값 시작 위치 기록
+                    self._value_start = position
+                self._depth += 1
+            elif char in '}]':
+                self._depth -= 1
+                if self._depth == 0:
+                    self._end = position + 1
+                    self.complete = True
+                    break
+                if self._depth == 1 and self._value_start is not None:
+                    field = self._on_container_end(position + 1)
+                    if field:
+                        completed.append(field)
+            elif self._depth == 1:
+                if char == ':':
+                    self._expect_key = False
+                elif char == ',':
+                    self._expect_key = True
+
+        self._length += len(chunk)
+        return completed
+
+    def _on_string_end(self) -> Optional[Tuple[str, Any]]:
+        """최상위 문자열 종료 시 키 또는 감시 필드 값 처리"""
+        if self._depth != 1:
+            return None
+
+        raw = "".join(self._string_chars)
+        if self._expect_key:
+            self._last_key = json.loads(raw, strict=False)
+            return None
+
+        if self._last_key in self.watch_fields and self._last_key not in self.fields:
+            value = json.loads(raw, strict=False)
+            self.fields[self._last_key] = value
+            return self._last_key, value
+        return None
+
+    def _on_container_end(self, end: int) -> Optional[Tuple[str, Any]]:
+        """최상위 객체/배열 값 종료 시 감시 필드 값 처리"""
+        start, self._value_start = self._value_start, None
+        if self._last_key not in self.watch_fields or self._last_key in self.fields:
+            return None
+
+        # 값의 시작/끝 위치는 지금까지 수신한 전체 텍스트 기준
+        value = json.loads(self.text[start:end], strict=False)
+        self.fields[self._last_key] = value
+        return self._last_key, value
+
+    @property
+    def text(self) -> str:
+        """지금까지 수신한 전체 텍스트"""
+        return "".join(self._text)
+
+    @property
+    def json_text(self) -> Optional[str]:
+        """완성된 JSON 객체 텍스트 (미완성 시 None)"""
+        if not self.complete:
+            return None
+        return self.text[self._start:self._end]
@@ -0,0 +1,73 @@
+# token_counter.py
+
+import math
+import re
+from typing import Any, Dict, List
+
+# Claude BPE 토크나이저의 분절 방식을 근사하는 사전 분절 패턴
+_PRETOKEN_PATTERN = re.compile(
+    r"[A-Za-z]+"                 # 영문 단어
+    r"|[0-9]+"                   # 숫자
+    r"|[가-힣]+"         # 한글 음절
+    r"|[ㄱ-ㆎ]+"         # 한글 자모
+    r"|[぀-ヿ一-鿿]"  # 일본어/한자 (문자당 1토큰)
+    r"|\n+"                      # 줄바꿈
+    r"|[ \t]+"                   # 공백
+    r"|[^\sA-Za-z0-9]"           # 기호 (JSON 괄호, 따옴표 등)
+)
+
+# 분절 종류별 평균 문자 수/토큰
+ENGLISH_CHARS_PER_TOKEN = 4.5
+DIGITS_PER_TOKEN = 3.0
+HANGUL_CHARS_PER_TOKEN = 1.2
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Claude 토크나이저 근사로 텍스트의 토큰 수 추정
+    영문/숫자/한글/기호를 분절한 뒤 분절 종류별 평균 길이로 계산합니다.
+    (영문 단어 앞 공백은 단어 토큰에 포함되고, 연속 공백/줄바꿈은 1토큰으로 계산)
+
+    Args:
+        text (str): 토큰 수를 계산할 텍스트
+
+    Returns:
+        int: 추정 토큰 수
+    """
+    if not text:
+        return 0
+
+    tokens = 0
+    for match in _PRETOKEN_PATTERN.finditer(text):
+        piece = match.group()
+        first = piece[0]
+        if first == ' ' or first == '\t':
+            # 단일 공백은 다음 단어에 붙어 하나의 토큰이 됨
+            if len(piece) > 1:
+                tokens += 1
+        elif first.isascii() and first.isalpha():
+            tokens += math.ceil(len(piece) / ENGLISH_CHARS_PER_TOKEN)
+        elif first.isdigit():
+            tokens += math.ceil(len(piece) / DIGITS_PER_TOKEN)
+        elif '가' <= first <= '힣':
+            tokens += math.ceil(len(piece) / HANGUL_CHARS_PER_TOKEN)
+        elif 'ㄱ' <= first <= 'ㆎ':
+            tokens += len(piece)
+        else:
+            # 줄바꿈 묶음과 기호는 각각 1토큰
+            tokens += 1
+    return tokens
+
+
+def estimate_message_tokens(message: Dict[str, Any]) -> int:
+    """Bedrock 메시지({'role', 'content'}) 하나의 토큰 수 추정"""
+    content = message.get('content', '')
+    if isinstance(content, list):
+        content = "".join(block.get('text', '') for block in content if isinstance(block, dict))
+    # 역할 구분 등 메시지 단위 오버헤드
+    return estimate_tokens(str(content)) + 4
+
+
+def estimate_messages_tokens(messages: List[Dict[str, Any]]) -> int:
+    """메시지 목록 전체의 토큰 수 추정"""
+    return sum(estimate_message_tokens(message) for message in messages)
@@ -0,0 +1,114 @@
+# workflow_benchmark.py
+
+import json
+import re
+import time
+from typing import Any, Dict, List, Optional
+
+
+def load_benchmark_questions(path: str = 'sample-data/multi_schema_info.json') -> List[Dict[str, str]]:
+    """
+    샘플 스키마 파일의 sample_queries를 벤치마크 질문 목록으로 로드
+
+    Args:
+        path (str): 스키마 정보 JSON 파일 경로
+
+    Returns:
+        List[Dict]: [{"question": 설명, "reference_sql": 정답 SQL}, ...]
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        schema = json.load(f).get('database_schema', {})
+
+    return [
+        {"question": query['description'], "reference_sql": query.get('sql', '')}
+        for query in schema.get('sample_queries', [])
+        if query.get('description')
+    ]
+
+
+def _normalize_sql(sql: str) -> str:
+    """비교용 SQL 정규화 (주석/공백/대소문자/끝 세미콜론 제거)"""
+    sql = re.sub(r'--[^\n]*', ' ', sql or '')
+    sql = re.sub(r'/\*.*?\*/', ' ', sql, flags=re.DOTALL)
+    return re.sub(r'\s+', ' ', sql).strip().rstrip(';').strip().lower()
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(percent / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def summarize_latencies(latencies: List[float]) -> Dict[str, float]:
+    """지연 시간 목록의 평균/p50/p95/최대값"""
+    return {
+        "avg_latency": sum(latencies) / len(latencies) if latencies else 0.0,
+        "p50_latency": _percentile(latencies, 50),
+        "p95_latency": _percentile(latencies, 95),
+        "max_latency": max(latencies) if latencies else 0.0
+    }
+
+
+def benchmark_topologies(flows: Dict[str, Any], questions: Optional[List[Dict[str, str]]] = None,
+                         use_answer_cache: bool = False) -> Dict[str, Any]:
+    """
+    워크플로우 구성별(sequential/fused) 동일 질문 세트 실행 결과 비교
+
+    Args:
+        flows (Dict): {구성 이름: TextToSQLFlow} (예: {"sequential": flow_a, "fused": flow_b})
+        questions (List[Dict]): load_benchmark_questions 형식의 질문 목록 (미지정 시 샘플 질문)
+        use_answer_cache (bool): 시맨틱 답변 캐시 사용 여부 (기본값은 LLM 호출 비교를 위해 비활성화)
+
+    Returns:
+        Dict: {"summary": 구성별 지연 시간/성공률/SQL 일치율, "questions": 질문별 결과}
+    """
+    questions = questions if questions is not None else load_benchmark_questions()
+    per_question = []
+    latencies = {name: [] for name in flows}
+    successes = {name: 0 for name in flows}
+    matches = {name: 0 for name in flows}
+
+    for item in questions:
+        row = {"question": item["question"], "reference_sql": item.get("reference_sql", ""), "results": {}}
+        for name, flow in flows.items():
+            answer_cache = flow.answer_cache
+            if not use_answer_cache:
+                flow.answer_cache = None
+            try:
+                started_at = time.monotonic()
+                result = flow.execute(item["question"])
+                elapsed = time.monotonic() - started_at
+            finally:
+                flow.answer_cache = answer_cache
+
+            sql = result.get("sql", "")
+            sql_match = bool(sql) and _normalize_sql(sql) == _normalize_sql(item.get("reference_sql", ""))
+            latencies[name].append(elapsed)
+            successes[name] += int(bool(result.get("success")))
+            matches[name] += int(sql_match)
+
+            metadata = result.get("metadata", {})
+            row["results"][name] = {
+                "latency": elapsed,
+                "success": bool(result.get("success")),
+                "sql": sql,
+                "sql_match": sql_match,
+                "feedback": result.get("feedback"),
+                "prompt_tokens": metadata.get("prompt_tokens", {}).get("total"),
+                "node_execution_times": metadata.get("performance_metrics", {}).get("node_execution_times", {})
+            }
+        per_question.append(row)
+
+    total = len(questions)
+    summary = {
+        name: {
+            "questions": total,
+            **summarize_latencies(latencies[name]),
+            "success_rate": successes[name] / total if total else 0.0,
+            "sql_match_rate": matches[name] / total if total else 0.0
+        }
+        for name in flows
+    }
+    return {"summary": summary, "questions": per_question}